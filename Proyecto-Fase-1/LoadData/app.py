@@ -17,5 +17,22 @@ if __name__ == "__main__":
     
     tsv_path = r"C:\Users\PC\Desktop\bases2p1"
     
-    loader = IMDBDataLoader(db_config, tsv_path)
+    # Backend de escritura de db_sinks.py: 'mysql' (LOAD DATA / executemany, Database/schema.sql)
+    # o 'postgresql' (COPY, Database/schema_postgresql.sql; db_config sin 'charset')
+    backend = 'mysql'
+    
+    # 'load_data' requiere SET GLOBAL local_infile = 1 en el servidor;
+    # si no esta habilitado se usa 'executemany'
+    bulk_mode = 'load_data'
+    
+    # Los TSV se leen por chunks: filas por chunk y memoria maxima del DataFrame de cada chunk
+    chunk_size = 500000
+    max_chunk_mb = 512
+    
+    # Filas por batch ajustadas para que cada LOAD DATA / executemany tarde ~1 s
+    adaptive_batches = True
+    
+    loader = IMDBDataLoader(db_config, tsv_path, backend=backend, bulk_mode=bulk_mode,
+                            chunk_size=chunk_size, max_chunk_mb=max_chunk_mb,
+                            adaptive_batches=adaptive_batches)
     loader.load_all_data()
\ No newline at end of file
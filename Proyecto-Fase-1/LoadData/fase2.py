@@ -0,0 +1,12 @@
+import os
+import sys
+
+# La carga de la Fase 1 reutiliza modulos de Proyecto-Fase-2/LoadData (IdBitmap,
+# synthetic_imdb...): importar este modulo agrega esa carpeta al path
+LOADDATA_FASE2 = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Proyecto-Fase-2', 'LoadData'
+))
+
+if LOADDATA_FASE2 not in sys.path:
+    # Al final: imdb_loader y app de la Fase 1 tienen prioridad sobre los de la Fase 2
+    sys.path.append(LOADDATA_FASE2)
@@ -1,95 +1,79 @@
 import pandas as pd
-import mysql.connector
-from mysql.connector import Error
 import hashlib
 import os
 from datetime import datetime
+import fase2  # agrega Proyecto-Fase-2/LoadData al path
+from batch_sizer import BatchSizer
+from db_sinks import create_sink
+from streaming import IdBitmap
 
 class IMDBDataLoader:
-    def __init__(self, db_config, tsv_path):
+    def __init__(self, db_config, tsv_path, backend='mysql', bulk_mode='load_data', chunk_size=500000, max_chunk_mb=512,
+                 adaptive_batches=False):
         self.db_config = db_config
         self.tsv_path = tsv_path
-        self.connection = None
+        
+        # El parseo y la transformacion son los mismos para todos los backends; el sink
+        # (db_sinks.py de la Fase 2) escribe con su carga masiva: LOAD DATA en MySQL,
+        # COPY en PostgreSQL
+        self.backend = backend
+        # adaptive_batches: filas por batch ajustadas a la duracion de cada batch (batch_sizer.py de la Fase 2)
+        sink_options = {'batch_sizer': BatchSizer() if adaptive_batches else None}
+        if backend == 'mysql':
+            sink_options['bulk_mode'] = bulk_mode
+        self.sink = create_sink(backend, db_config, **sink_options)
+        
+        # Los TSV se leen por chunks de hasta chunk_size filas; el tamaño se ajusta
+        # para que el DataFrame de cada chunk no pase de max_chunk_mb
+        self.chunk_size = chunk_size
+        self.max_chunk_mb = max_chunk_mb
         
         self.profession_ids = {}
         self.genre_ids = {}
         self.titletype_ids = {}
         self.attribute_ids = {}
     
+    @property
+    def connection(self):
+        return self.sink.connection
+    
     def connect_db(self):
-        try:
-            config = self.db_config.copy()
-            config.update({
-                'autocommit': False,
-                'connection_timeout': 3600,
-                'use_unicode': True,
-                'charset': 'utf8mb4',
-                'ssl_disabled': True,
-                'use_pure': True,
-            })
-            
-            self.connection = mysql.connector.connect(**config)
-            
-            cursor = self.connection.cursor()
-            cursor.execute("SET SESSION wait_timeout = 86400")
-            cursor.execute("SET SESSION interactive_timeout = 86400")
-            cursor.execute("SET SESSION autocommit = 0")
-            cursor.execute("SET SESSION foreign_key_checks = 0")
-            cursor.execute("SET SESSION unique_checks = 0")
-            cursor.close()
-            
-        except Error as e:
-            print(f"Error: {e}")
-            raise
+        self.sink.connect()
     
     def keep_alive(self):
-        try:
-            if self.connection and self.connection.is_connected():
-                self.connection.ping(reconnect=True, attempts=1, delay=0)
-            else:
-                self.connect_db()
-        except:
-            self.connect_db()
+        self.sink.keep_alive()
 
     def disconnect_db(self):
-        if self.connection and self.connection.is_connected():
-            try:
-                cursor = self.connection.cursor()
-                cursor.execute("SET SESSION foreign_key_checks = 1")
-                cursor.execute("SET SESSION unique_checks = 1")
-                cursor.close()
-            except:
-                pass
-            self.connection.close()
+        self.sink.disconnect()
     
     def insert_fast(self, query, data, batch_size=200000):
         if not data:
             return
-            
-        for i in range(0, len(data), batch_size):
-            batch = data[i:i + batch_size]
-            
-            try:
-                self.keep_alive()
-                cursor = self.connection.cursor()
-                cursor.executemany(query, batch)
-                self.connection.commit()
-                cursor.close()
-            except Exception as e:
-                try:
-                    self.connection.close()
-                except:
-                    pass
-                self.connect_db()
+        
+        self.sink.write(query, data, batch_size)
+    
+    def read_chunks(self, reader, chunksize):
+        """Chunks de un TextFileReader con el numero de filas ajustado a max_chunk_mb"""
+        max_bytes = self.max_chunk_mb * 1024 * 1024
+        # El primer chunk es chico para estimar los bytes por fila
+        rows = min(chunksize, 10000)
+        total = 0
+        try:
+            while True:
                 try:
-                    cursor = self.connection.cursor()
-                    cursor.executemany(query, batch)
-                    self.connection.commit()
-                    cursor.close()
-                except:
-                    continue
+                    df = reader.get_chunk(rows)
+                except StopIteration:
+                    break
+                total += len(df)
+                if len(df):
+                    row_bytes = df.memory_usage(deep=True).sum() / len(df)
+                    rows = max(1000, min(chunksize, int(max_bytes / row_bytes)))
+                yield df
+        finally:
+            reader.close()
+        print(f"Leido: {total:,} filas")
     
-    def read_tsv_safely(self, file_path, usecols=None):
+    def read_tsv_safely(self, file_path, usecols=None, chunksize=None):
         try:
             if not os.path.exists(file_path):
                 print(f"Archivo no encontrado: {file_path}")
@@ -108,6 +92,9 @@ class IMDBDataLoader:
             
             if usecols:
                 read_params['usecols'] = usecols
+            
+            if chunksize:
+                return self.read_chunks(pd.read_csv(file_path, iterator=True, **read_params), chunksize)
                 
             df = pd.read_csv(file_path, **read_params)
             print(f"Leido: {len(df):,} filas")
@@ -117,6 +104,11 @@ class IMDBDataLoader:
             print(f"Error leyendo {file_path}: {e}")
             return None
     
+    def read_tsv_chunks(self, file_name, usecols=None):
+        """Chunks de un TSV de tsv_path (ninguno si no se puede leer)"""
+        chunks = self.read_tsv_safely(f"{self.tsv_path}/{file_name}", usecols=usecols, chunksize=self.chunk_size)
+        return chunks if chunks is not None else []
+    
     def extract_id(self, imdb_id):
         if not imdb_id or imdb_id == '\\N':
             return None
@@ -153,9 +145,8 @@ class IMDBDataLoader:
         professions = set()
         
         try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/name.basics.tsv", usecols=['primaryProfession'])
-            if df is not None:
-                for profs in df['primaryProfession'].dropna():
+            for df in self.read_tsv_chunks('name.basics.tsv', usecols=['primaryProfession']):
+                for profs in df['primaryProfession'].dropna().unique():
                     if profs != '\\N':
                         for p in profs.split(','):
                             if p.strip():
@@ -164,8 +155,7 @@ class IMDBDataLoader:
             pass
         
         try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/title.principals.tsv", usecols=['category'])
-            if df is not None:
+            for df in self.read_tsv_chunks('title.principals.tsv', usecols=['category']):
                 for cat in df['category'].dropna().unique():
                     if cat != '\\N':
                         professions.add(self.format_text(cat))
@@ -188,16 +178,13 @@ class IMDBDataLoader:
     def load_genres(self):
         """CORREGIDO: IDs secuenciales para evitar colisiones"""
         try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/title.basics.tsv", usecols=['genres'])
-            if df is None:
-                return
-            
             genres = set()
-            for genre_list in df['genres'].dropna():
-                if genre_list != '\\N':
-                    for g in genre_list.split(','):
-                        if g.strip():
-                            genres.add(self.format_text(g.strip()))
+            for df in self.read_tsv_chunks('title.basics.tsv', usecols=['genres']):
+                for genre_list in df['genres'].dropna().unique():
+                    if genre_list != '\\N':
+                        for g in genre_list.split(','):
+                            if g.strip():
+                                genres.add(self.format_text(g.strip()))
             
             # CORREGIDO: IDs secuenciales
             data = []
@@ -217,11 +204,9 @@ class IMDBDataLoader:
     def load_title_types(self):
         """YA CORREGIDO: IDs secuenciales"""
         try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/title.basics.tsv", usecols=['titleType'])
-            if df is None:
-                return
-            
-            types = set(df['titleType'].dropna().unique())
+            types = set()
+            for df in self.read_tsv_chunks('title.basics.tsv', usecols=['titleType']):
+                types.update(df['titleType'].dropna().unique())
             types.discard('\\N')
             types.add('Unknown')
             
@@ -250,27 +235,24 @@ class IMDBDataLoader:
         attributes = set()
         
         try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/title.akas.tsv", usecols=['attributes', 'types'])
-            if df is None:
-                return
+            for df in self.read_tsv_chunks('title.akas.tsv', usecols=['attributes', 'types']):
+                for attr_str in df['attributes'].dropna().unique():
+                    if attr_str != '\\N':
+                        try:
+                            for attr in str(attr_str).replace('\x02', '|').split('|'):
+                                if attr.strip():
+                                    attributes.add(('Title attribute', attr.strip()[:100]))
+                        except:
+                            continue
                 
-            for attr_str in df['attributes'].dropna():
-                if attr_str != '\\N':
-                    try:
-                        for attr in str(attr_str).replace('\x02', '|').split('|'):
-                            if attr.strip():
-                                attributes.add(('Title attribute', attr.strip()[:100]))
-                    except:
-                        continue
-            
-            for type_str in df['types'].dropna():
-                if type_str != '\\N':
-                    try:
-                        for t in str(type_str).replace('\x02', '|').split('|'):
-                            if t.strip() and t.strip() not in ['imdbDisplay', 'original']:
-                                attributes.add(('Title types', t.strip()[:100]))
-                    except:
-                        continue
+                for type_str in df['types'].dropna().unique():
+                    if type_str != '\\N':
+                        try:
+                            for t in str(type_str).replace('\x02', '|').split('|'):
+                                if t.strip() and t.strip() not in ['imdbDisplay', 'original']:
+                                    attributes.add(('Title types', t.strip()[:100]))
+                        except:
+                            continue
             
             # CORREGIDO: IDs secuenciales
             data = []
@@ -288,12 +270,13 @@ class IMDBDataLoader:
             pass
 
     def load_personas(self):
-        personas_data = []
-        existing_ids = set()
+        query = "INSERT IGNORE INTO personas (id_persona, nombre, ahno_nacimiento, ahno_muerte) VALUES (%s, %s, %s, %s)"
+        total = 0
+        existing_ids = IdBitmap()
         
         try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/name.basics.tsv")
-            if df is not None:
+            for df in self.read_tsv_chunks('name.basics.tsv', usecols=['nconst', 'primaryName', 'birthYear', 'deathYear']):
+                personas_data = []
                 for _, row in df.iterrows():
                     person_id = self.extract_id(row.get('nconst'))
                     if person_id:
@@ -302,31 +285,38 @@ class IMDBDataLoader:
                         name = row.get('primaryName', 'Unknown') if pd.notna(row.get('primaryName')) else 'Unknown'
                         
                         personas_data.append((person_id, name, birth, death))
-                        existing_ids.add(person_id)
+                
+                existing_ids.add([person[0] for person in personas_data])
+                self.insert_fast(query, personas_data)
+                total += len(personas_data)
         except:
             pass
         
         try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/title.principals.tsv", usecols=['nconst'])
-            if df is not None:
-                for _, row in df.iterrows():
-                    person_id = self.extract_id(row.get('nconst'))
-                    if person_id and person_id not in existing_ids:
-                        personas_data.append((person_id, 'Unknown', None, None))
-                        existing_ids.add(person_id)
+            for df in self.read_tsv_chunks('title.principals.tsv', usecols=['nconst']):
+                person_ids = [person_id for person_id in map(self.extract_id, df['nconst']) if person_id]
+                personas_data = [(person_id, 'Unknown', None, None) for person_id in existing_ids.add_new(person_ids).tolist()]
+                
+                self.insert_fast(query, personas_data)
+                total += len(personas_data)
         except:
             pass
         
-        self.insert_fast("INSERT IGNORE INTO personas (id_persona, nombre, ahno_nacimiento, ahno_muerte) VALUES (%s, %s, %s, %s)", personas_data)
-        print(f"Personas: {len(personas_data)} registros")
+        print(f"Personas: {total} registros")
 
     def load_produccion(self):
-        produccion_data = []
-        existing_ids = set()
+        query = """INSERT IGNORE INTO produccion 
+                   (id_titulo, id_tipo_titulo, adultos, ahno_inicio, ahno_finalizacion, 
+                    minutos_duracion, votos, promedio_rating) 
+                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"""
+        total = 0
+        existing_ids = IdBitmap()
         
         try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/title.basics.tsv")
-            if df is not None:
+            for df in self.read_tsv_chunks('title.basics.tsv', usecols=[
+                'tconst', 'titleType', 'isAdult', 'startYear', 'endYear', 'runtimeMinutes'
+            ]):
+                produccion_data = []
                 for _, row in df.iterrows():
                     title_id = self.extract_id(row.get('tconst'))
                     if title_id:
@@ -337,226 +327,207 @@ class IMDBDataLoader:
                         is_adult = 1 if row.get('isAdult') == '1' else 0
                         
                         produccion_data.append((title_id, type_id, is_adult, start_date, end_date, runtime, None, None))
-                        existing_ids.add(title_id)
-        except:
-            pass
-        
-        try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/title.akas.tsv", usecols=['titleId'])
-            if df is not None:
-                for _, row in df.iterrows():
-                    title_id = self.extract_id(row.get('titleId'))
-                    if title_id and title_id not in existing_ids:
-                        produccion_data.append((title_id, 0, 0, None, None, None, None, None))
-                        existing_ids.add(title_id)
+                
+                existing_ids.add([produccion[0] for produccion in produccion_data])
+                self.insert_fast(query, produccion_data)
+                total += len(produccion_data)
         except:
             pass
         
-        try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/title.principals.tsv", usecols=['tconst'])
-            if df is not None:
-                for _, row in df.iterrows():
-                    title_id = self.extract_id(row.get('tconst'))
-                    if title_id and title_id not in existing_ids:
-                        produccion_data.append((title_id, 0, 0, None, None, None, None, None))
-                        existing_ids.add(title_id)
-        except:
-            pass
+        for file_name, column in (('title.akas.tsv', 'titleId'), ('title.principals.tsv', 'tconst')):
+            try:
+                for df in self.read_tsv_chunks(file_name, usecols=[column]):
+                    title_ids = [title_id for title_id in map(self.extract_id, df[column]) if title_id]
+                    produccion_data = [(title_id, 0, 0, None, None, None, None, None)
+                                       for title_id in existing_ids.add_new(title_ids).tolist()]
+                    
+                    self.insert_fast(query, produccion_data)
+                    total += len(produccion_data)
+            except:
+                pass
         
-        self.insert_fast("""INSERT IGNORE INTO produccion 
-                           (id_titulo, id_tipo_titulo, adultos, ahno_inicio, ahno_finalizacion, 
-                            minutos_duracion, votos, promedio_rating) 
-                           VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""", produccion_data)
-        print(f"Produccion: {len(produccion_data)} registros")
+        print(f"Produccion: {total} registros")
 
     def load_top_profesiones(self):
         try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/name.basics.tsv", usecols=['nconst', 'primaryProfession'])
-            if df is None:
-                return
-            
-            data = []
-            for _, row in df.iterrows():
-                person_id = self.extract_id(row.get('nconst'))
-                if person_id and pd.notna(row.get('primaryProfession')) and row.get('primaryProfession') != '\\N':
-                    
-                    for ordinal, prof in enumerate(row.get('primaryProfession').split(','), 1):
-                        if prof.strip():
-                            formatted_prof = self.format_text(prof.strip())
-                            prof_id = self.profession_ids.get(formatted_prof)
-                            if prof_id:
-                                data.append((person_id, prof_id, ordinal))
-            
-            self.insert_fast("INSERT IGNORE INTO top_profesiones (id_persona, id_profesion, ordinal) VALUES (%s, %s, %s)", data)
-            print(f"Top profesiones: {len(data)} registros")
+            total = 0
+            for df in self.read_tsv_chunks('name.basics.tsv', usecols=['nconst', 'primaryProfession']):
+                data = []
+                for _, row in df.iterrows():
+                    person_id = self.extract_id(row.get('nconst'))
+                    if person_id and pd.notna(row.get('primaryProfession')) and row.get('primaryProfession') != '\\N':
+                        
+                        for ordinal, prof in enumerate(row.get('primaryProfession').split(','), 1):
+                            if prof.strip():
+                                formatted_prof = self.format_text(prof.strip())
+                                prof_id = self.profession_ids.get(formatted_prof)
+                                if prof_id:
+                                    data.append((person_id, prof_id, ordinal))
+                
+                self.insert_fast("INSERT IGNORE INTO top_profesiones (id_persona, id_profesion, ordinal) VALUES (%s, %s, %s)", data)
+                total += len(data)
+            print(f"Top profesiones: {total} registros")
         except:
             pass
     
     def load_genero_produccion(self):
         try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/title.basics.tsv", usecols=['tconst', 'genres'])
-            if df is None:
-                return
-            
-            data = []
-            for _, row in df.iterrows():
-                title_id = self.extract_id(row.get('tconst'))
-                if title_id and pd.notna(row.get('genres')) and row.get('genres') != '\\N':
-                    
-                    for genre in row.get('genres').split(','):
-                        if genre.strip():
-                            formatted_genre = self.format_text(genre.strip())
-                            genre_id = self.genre_ids.get(formatted_genre)
-                            if genre_id:
-                                data.append((title_id, genre_id))
-            
-            self.insert_fast("INSERT IGNORE INTO genero_produccion (id_produccion, id_genero) VALUES (%s, %s)", data)
-            print(f"Genero produccion: {len(data)} registros")
+            total = 0
+            for df in self.read_tsv_chunks('title.basics.tsv', usecols=['tconst', 'genres']):
+                data = []
+                for _, row in df.iterrows():
+                    title_id = self.extract_id(row.get('tconst'))
+                    if title_id and pd.notna(row.get('genres')) and row.get('genres') != '\\N':
+                        
+                        for genre in row.get('genres').split(','):
+                            if genre.strip():
+                                formatted_genre = self.format_text(genre.strip())
+                                genre_id = self.genre_ids.get(formatted_genre)
+                                if genre_id:
+                                    data.append((title_id, genre_id))
+                
+                self.insert_fast("INSERT IGNORE INTO genero_produccion (id_produccion, id_genero) VALUES (%s, %s)", data)
+                total += len(data)
+            print(f"Genero produccion: {total} registros")
         except:
             pass
     
     def load_nombres_produccion(self):
         try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/title.akas.tsv")
-            if df is None:
-                return
+            total = 0
+            for df in self.read_tsv_chunks('title.akas.tsv'):
+                data = []
+                for _, row in df.iterrows():
+                    title_id = self.extract_id(row.get('titleId'))
+                    if title_id:
+                        is_original = 1 if pd.notna(row.get('isOriginalTitle')) and str(row.get('isOriginalTitle')) == '1' else 0
+                        
+                        title = str(row.get('title', 'Unknown'))[:255] if pd.notna(row.get('title')) else 'Unknown'
+                        region = str(row.get('region', ''))[:10] if pd.notna(row.get('region')) else ''
+                        language = str(row.get('language', ''))[:10] if pd.notna(row.get('language')) else ''
+                        ordering = int(row.get('ordering', 1)) if pd.notna(row.get('ordering')) else 1
+                        
+                        data.append((title_id, ordering, title, region, language, is_original))
                 
-            data = []
-            for _, row in df.iterrows():
-                title_id = self.extract_id(row.get('titleId'))
-                if title_id:
-                    is_original = 1 if pd.notna(row.get('isOriginalTitle')) and str(row.get('isOriginalTitle')) == '1' else 0
-                    
-                    title = str(row.get('title', 'Unknown'))[:255] if pd.notna(row.get('title')) else 'Unknown'
-                    region = str(row.get('region', ''))[:10] if pd.notna(row.get('region')) else ''
-                    language = str(row.get('language', ''))[:10] if pd.notna(row.get('language')) else ''
-                    ordering = int(row.get('ordering', 1)) if pd.notna(row.get('ordering')) else 1
-                    
-                    data.append((title_id, ordering, title, region, language, is_original))
-
-            self.insert_fast("""INSERT IGNORE INTO nombres_produccion 
-                               (id_produccion, orden, nombres_produccion, region, lenguaje, esOriginal) 
-                               VALUES (%s, %s, %s, %s, %s, %s)""", data)
-            print(f"Nombres produccion: {len(data)} registros")
+                self.insert_fast("""INSERT IGNORE INTO nombres_produccion 
+                                   (id_produccion, orden, nombres_produccion, region, lenguaje, esOriginal) 
+                                   VALUES (%s, %s, %s, %s, %s, %s)""", data)
+                total += len(data)
+            print(f"Nombres produccion: {total} registros")
         except:
             pass
     
     def load_nombres_titulos_atributos(self):
         try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/title.akas.tsv")
-            if df is None:
-                return
+            total = 0
+            for df in self.read_tsv_chunks('title.akas.tsv'):
+                data = []
+                for _, row in df.iterrows():
+                    title_id = self.extract_id(row.get('titleId'))
+                    if title_id:
+                        ordering = int(row.get('ordering', 1)) if pd.notna(row.get('ordering')) else 1
+                        
+                        if pd.notna(row.get('attributes')) and row.get('attributes') != '\\N':
+                            try:
+                                for attr in str(row.get('attributes')).replace('\x02', '|').split('|'):
+                                    if attr.strip():
+                                        attr_id = self.attribute_ids.get(('Title attribute', attr.strip()))
+                                        if attr_id:
+                                            data.append((title_id, ordering, attr_id))
+                            except:
+                                continue
+                        
+                        if pd.notna(row.get('types')) and row.get('types') != '\\N':
+                            try:
+                                for attr_type in str(row.get('types')).replace('\x02', '|').split('|'):
+                                    if attr_type.strip() and attr_type.strip() not in ['imdbDisplay', 'original']:
+                                        attr_id = self.attribute_ids.get(('Title types', attr_type.strip()))
+                                        if attr_id:
+                                            data.append((title_id, ordering, attr_id))
+                            except:
+                                continue
                 
-            data = []
-            for _, row in df.iterrows():
-                title_id = self.extract_id(row.get('titleId'))
-                if title_id:
-                    ordering = int(row.get('ordering', 1)) if pd.notna(row.get('ordering')) else 1
-                    
-                    if pd.notna(row.get('attributes')) and row.get('attributes') != '\\N':
-                        try:
-                            for attr in str(row.get('attributes')).replace('\x02', '|').split('|'):
-                                if attr.strip():
-                                    attr_id = self.attribute_ids.get(('Title attribute', attr.strip()))
-                                    if attr_id:
-                                        data.append((title_id, ordering, attr_id))
-                        except:
-                            continue
-                    
-                    if pd.notna(row.get('types')) and row.get('types') != '\\N':
-                        try:
-                            for attr_type in str(row.get('types')).replace('\x02', '|').split('|'):
-                                if attr_type.strip() and attr_type.strip() not in ['imdbDisplay', 'original']:
-                                    attr_id = self.attribute_ids.get(('Title types', attr_type.strip()))
-                                    if attr_id:
-                                        data.append((title_id, ordering, attr_id))
-                        except:
-                            continue
-
-            self.insert_fast("INSERT IGNORE INTO nombres_titulos_atributos (id_titulo, orden, id_atributo) VALUES (%s, %s, %s)", data)
-            print(f"Nombres titulos atributos: {len(data)} registros")
+                self.insert_fast("INSERT IGNORE INTO nombres_titulos_atributos (id_titulo, orden, id_atributo) VALUES (%s, %s, %s)", data)
+                total += len(data)
+            print(f"Nombres titulos atributos: {total} registros")
         except:
             pass
     
     def load_personas_produccion(self):
         
+        principals_total = 0
         try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/title.principals.tsv")
-            if df is None:
-                return
-            
-            principals_data = []
-            for _, row in df.iterrows():
-                title_id = self.extract_id(row.get('tconst'))
-                person_id = self.extract_id(row.get('nconst'))
-                
-                if title_id and person_id:
-                    ordering = int(row.get('ordering')) if pd.notna(row.get('ordering')) else 1
-                    formatted_cat = self.format_text(row.get('category'))
-                    prof_id = self.profession_ids.get(formatted_cat)
+            for df in self.read_tsv_chunks('title.principals.tsv', usecols=['tconst', 'ordering', 'nconst', 'category']):
+                principals_data = []
+                for _, row in df.iterrows():
+                    title_id = self.extract_id(row.get('tconst'))
+                    person_id = self.extract_id(row.get('nconst'))
                     
-                    if prof_id:
-                        principals_data.append((title_id, ordering, person_id, prof_id, None))
-            
-            self.insert_fast("""INSERT IGNORE INTO personas_produccion 
-                            (id_produccion, orden, id_persona, id_profesion, conocido_por) 
-                            VALUES (%s, %s, %s, %s, %s)""", principals_data)
+                    if title_id and person_id:
+                        ordering = int(row.get('ordering')) if pd.notna(row.get('ordering')) else 1
+                        formatted_cat = self.format_text(row.get('category'))
+                        prof_id = self.profession_ids.get(formatted_cat)
+                        
+                        if prof_id:
+                            principals_data.append((title_id, ordering, person_id, prof_id, None))
+                
+                self.insert_fast("""INSERT IGNORE INTO personas_produccion 
+                                (id_produccion, orden, id_persona, id_profesion, conocido_por) 
+                                VALUES (%s, %s, %s, %s, %s)""", principals_data)
+                principals_total += len(principals_data)
             
         except Exception as e:
             return
         
         try:
-            df_crew = self.read_tsv_safely(f"{self.tsv_path}/title.crew.tsv")
-            if df_crew is None:
-                print(f"Personas produccion: {len(principals_data)} registros")
+            if not os.path.exists(f"{self.tsv_path}/title.crew.tsv"):
+                print(f"Personas produccion: {principals_total} registros")
                 return
             
             self.keep_alive()
             cursor = self.connection.cursor()
             
-            cursor.execute("""CREATE TEMPORARY TABLE writers_directors (
-                                titleId INT,
-                                principalId INT,
-                                professionId INT,
-                                INDEX idx_wd (titleId, principalId)
-                            )""")
+            self.sink.create_temp_table('writers_directors',
+                                        'titleId INT, principalId INT, professionId INT',
+                                        ['titleId', 'principalId'])
             
             director_prof_id = self.profession_ids.get('Director')
             writer_prof_id = self.profession_ids.get('Writer')
             
-            for _, row in df_crew.iterrows():
-                title_id = self.extract_id(row.get('tconst'))
-                if title_id:
-                    
-                    if pd.notna(row.get('directors')) and row.get('directors') != '\\N':
-                        for director in row.get('directors').split(','):
-                            if director.strip():
-                                person_id = self.extract_id(director.strip())
-                                if person_id and director_prof_id:
-                                    cursor.execute("""
-                                        INSERT INTO writers_directors (titleId, principalId, professionId)
-                                        SELECT %s, %s, %s
-                                        WHERE NOT EXISTS (
-                                            SELECT 1 FROM personas_produccion pp 
-                                            WHERE pp.id_produccion = %s AND pp.id_persona = %s
-                                        )
-                                    """, (title_id, person_id, director_prof_id, title_id, person_id))
-                    
-                    if pd.notna(row.get('writers')) and row.get('writers') != '\\N':
-                        for writer in row.get('writers').split(','):
-                            if writer.strip():
-                                person_id = self.extract_id(writer.strip())
-                                if person_id and writer_prof_id:
-                                    cursor.execute("""
-                                        INSERT INTO writers_directors (titleId, principalId, professionId)
-                                        SELECT %s, %s, %s
-                                        WHERE NOT EXISTS (
-                                            SELECT 1 FROM personas_produccion pp 
-                                            WHERE pp.id_produccion = %s AND pp.id_persona = %s
-                                        )
-                                    """, (title_id, person_id, writer_prof_id, title_id, person_id))
-            
-            self.connection.commit()
+            for df_crew in self.read_tsv_chunks('title.crew.tsv'):
+                for _, row in df_crew.iterrows():
+                    title_id = self.extract_id(row.get('tconst'))
+                    if title_id:
+                        
+                        if pd.notna(row.get('directors')) and row.get('directors') != '\\N':
+                            for director in row.get('directors').split(','):
+                                if director.strip():
+                                    person_id = self.extract_id(director.strip())
+                                    if person_id and director_prof_id:
+                                        cursor.execute("""
+                                            INSERT INTO writers_directors (titleId, principalId, professionId)
+                                            SELECT %s, %s, %s
+                                            WHERE NOT EXISTS (
+                                                SELECT 1 FROM personas_produccion pp 
+                                                WHERE pp.id_produccion = %s AND pp.id_persona = %s
+                                            )
+                                        """, (title_id, person_id, director_prof_id, title_id, person_id))
+                        
+                        if pd.notna(row.get('writers')) and row.get('writers') != '\\N':
+                            for writer in row.get('writers').split(','):
+                                if writer.strip():
+                                    person_id = self.extract_id(writer.strip())
+                                    if person_id and writer_prof_id:
+                                        cursor.execute("""
+                                            INSERT INTO writers_directors (titleId, principalId, professionId)
+                                            SELECT %s, %s, %s
+                                            WHERE NOT EXISTS (
+                                                SELECT 1 FROM personas_produccion pp 
+                                                WHERE pp.id_produccion = %s AND pp.id_persona = %s
+                                            )
+                                        """, (title_id, person_id, writer_prof_id, title_id, person_id))
+                
+                self.connection.commit()
             
             cursor.execute("SELECT titleId, principalId, professionId FROM writers_directors")
             missing_crew = cursor.fetchall()
@@ -587,22 +558,22 @@ class IMDBDataLoader:
                                 (id_produccion, orden, id_persona, id_profesion, conocido_por) 
                                 VALUES (%s, %s, %s, %s, %s)""", final_crew_data)
                 
-                total_records = len(principals_data) + len(final_crew_data)
+                total_records = principals_total + len(final_crew_data)
             else:
-                total_records = len(principals_data)
+                total_records = principals_total
             
-            cursor.execute("DROP TEMPORARY TABLE writers_directors")
+            self.sink.drop_temp_table('writers_directors')
             cursor.close()
             
             print(f"Personas produccion: {total_records} registros")
             
         except Exception as e:
             try:
-                cursor.execute("DROP TEMPORARY TABLE IF EXISTS writers_directors")
+                self.sink.drop_temp_table('writers_directors')
                 cursor.close()
             except:
                 pass
-            print(f"Personas produccion: {len(principals_data)} registros")
+            print(f"Personas produccion: {principals_total} registros")
     
     def parse_characters(self, chars_str):
         if not chars_str or chars_str == '\\N':
@@ -617,60 +588,54 @@ class IMDBDataLoader:
     
     def load_personajes(self):
         try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/title.principals.tsv", usecols=['tconst', 'nconst', 'characters'])
-            if df is None:
-                return
-            
-            data = []
-            for _, row in df.iterrows():
-                title_id = self.extract_id(row.get('tconst'))
-                person_id = self.extract_id(row.get('nconst'))
+            total = 0
+            for df in self.read_tsv_chunks('title.principals.tsv', usecols=['tconst', 'nconst', 'characters']):
+                data = []
+                for _, row in df.iterrows():
+                    title_id = self.extract_id(row.get('tconst'))
+                    person_id = self.extract_id(row.get('nconst'))
+                    
+                    if title_id and person_id and pd.notna(row.get('characters')):
+                        characters = self.parse_characters(row.get('characters'))
+                        for char in characters:
+                            if char and char != '\\N':
+                                data.append((title_id, person_id, char[:100]))
                 
-                if title_id and person_id and pd.notna(row.get('characters')):
-                    characters = self.parse_characters(row.get('characters'))
-                    for char in characters:
-                        if char and char != '\\N':
-                            data.append((title_id, person_id, char[:100]))
-            
-            self.insert_fast("INSERT IGNORE INTO personajes (id_produccion, persona_id, personaje) VALUES (%s, %s, %s)", data)
-            print(f"Personajes: {len(data)} registros")
+                self.insert_fast("INSERT IGNORE INTO personajes (id_produccion, persona_id, personaje) VALUES (%s, %s, %s)", data)
+                total += len(data)
+            print(f"Personajes: {total} registros")
         except:
             pass
     
     def load_episodios(self):
         try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/title.episode.tsv")
-            if df is None:
-                return
-            
-            data = []
-            for _, row in df.iterrows():
-                episode_id = self.extract_id(row.get('tconst'))
-                parent_id = self.extract_id(row.get('parentTconst'))
+            total = 0
+            for df in self.read_tsv_chunks('title.episode.tsv'):
+                data = []
+                for _, row in df.iterrows():
+                    episode_id = self.extract_id(row.get('tconst'))
+                    parent_id = self.extract_id(row.get('parentTconst'))
+                    
+                    if episode_id and parent_id:
+                        # temporada y episodio son NOT NULL: el 0 que guardaba INSERT IGNORE de MySQL
+                        # para un NULL, explicito para que PostgreSQL no rechace el batch
+                        season = int(row.get('seasonNumber')) if pd.notna(row.get('seasonNumber')) else 0
+                        episode_num = int(row.get('episodeNumber')) if pd.notna(row.get('episodeNumber')) else 0
+                        data.append((episode_id, parent_id, season, episode_num))
                 
-                if episode_id and parent_id:
-                    season = int(row.get('seasonNumber')) if pd.notna(row.get('seasonNumber')) else None
-                    episode_num = int(row.get('episodeNumber')) if pd.notna(row.get('episodeNumber')) else None
-                    data.append((episode_id, parent_id, season, episode_num))
-            
-            self.insert_fast("INSERT IGNORE INTO episodios (id_episodio, id_serie, temporada, episodio) VALUES (%s, %s, %s, %s)", data)
-            print(f"Episodios: {len(data)} registros")
+                self.insert_fast("INSERT IGNORE INTO episodios (id_episodio, id_serie, temporada, episodio) VALUES (%s, %s, %s, %s)", data)
+                total += len(data)
+            print(f"Episodios: {total} registros")
         except:
             pass
     
     def update_ratings(self):
         try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/title.ratings.tsv")
-            if df is None:
-                return
-            
             self.keep_alive()
             cursor = self.connection.cursor()
             
             updated_count = 0
-            for i in range(0, len(df), 100000):
-                batch = df.iloc[i:i+100000]
-                
+            for batch in self.read_tsv_chunks('title.ratings.tsv'):
                 for _, row in batch.iterrows():
                     title_id = self.extract_id(row.get('tconst'))
                     if title_id:
@@ -691,30 +656,27 @@ class IMDBDataLoader:
     
     def update_conocido_por(self):
         try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/name.basics.tsv", usecols=['nconst', 'knownForTitles'])
-            if df is None:
-                return
-            
             self.keep_alive()
             cursor = self.connection.cursor()
             
             updated_count = 0
-            for i, row in df.iterrows():
-                person_id = self.extract_id(row.get('nconst'))
-                if person_id and pd.notna(row.get('knownForTitles')) and row.get('knownForTitles') != '\\N':
+            for df in self.read_tsv_chunks('name.basics.tsv', usecols=['nconst', 'knownForTitles']):
+                for i, row in df.iterrows():
+                    person_id = self.extract_id(row.get('nconst'))
+                    if person_id and pd.notna(row.get('knownForTitles')) and row.get('knownForTitles') != '\\N':
+                        
+                        for ordinal, title in enumerate(row.get('knownForTitles').split(','), 1):
+                            if title.strip():
+                                title_id = self.extract_id(title.strip())
+                                if title_id:
+                                    cursor.execute("""UPDATE personas_produccion 
+                                                   SET conocido_por = %s 
+                                                   WHERE id_persona = %s AND id_produccion = %s""",
+                                                 (ordinal, person_id, title_id))
+                                    updated_count += 1
                     
-                    for ordinal, title in enumerate(row.get('knownForTitles').split(','), 1):
-                        if title.strip():
-                            title_id = self.extract_id(title.strip())
-                            if title_id:
-                                cursor.execute("""UPDATE personas_produccion 
-                                               SET conocido_por = %s 
-                                               WHERE id_persona = %s AND id_produccion = %s""",
-                                             (ordinal, person_id, title_id))
-                                updated_count += 1
-                
-                if i % 100000 == 0:
-                    self.connection.commit()
+                    if i % 100000 == 0:
+                        self.connection.commit()
             
             self.connection.commit()
             cursor.close()
@@ -747,6 +709,8 @@ class IMDBDataLoader:
             self.load_personajes()
             self.load_episodios()
             
+            self.sink.retry_failed()
+            
             print("=== ACTUALIZACIONES FINALES ===")
             self.update_ratings()
             self.update_conocido_por()
@@ -758,4 +722,5 @@ class IMDBDataLoader:
         except Exception as e:
             print(f"Error: {e}")
         finally:
-            self.disconnect_db()
\ No newline at end of file
+            self.disconnect_db()
+            self.sink.print_stats()
\ No newline at end of file
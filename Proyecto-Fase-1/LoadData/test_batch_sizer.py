@@ -0,0 +1,71 @@
+import fase2  # agrega Proyecto-Fase-2/LoadData al path
+import db_sinks
+from batch_sizer import BatchSizer, MIN_BYTES, MAX_BYTES
+
+# BatchSizer de la Fase 2 en los sinks: con una latencia proporcional a los bytes del batch
+# el objetivo converge al tamaño que tarda TARGET_SECONDS
+
+
+class TimedSink(db_sinks.DatabaseSink):
+    """Sink sin base de datos: cada batch 'tarda' sus bytes / bytes_per_second"""
+
+    def __init__(self, bytes_per_second, adaptive_batches=True):
+        super().__init__({}, BatchSizer() if adaptive_batches else None)
+        self.bytes_per_second = bytes_per_second
+        self.written = []
+
+    def open_connection(self):
+        return object()
+
+    def is_alive(self, connection):
+        return True
+
+    def close_connection(self, connection):
+        pass
+
+    def write_batch(self, connection, target, batch):
+        self.written.append(batch)
+        return 'simulado'
+
+    def observe(self, table, batch, seconds):
+        if self.batch_sizer:
+            seconds = len(batch) * self.batch_sizer.row_bytes[table] / self.bytes_per_second
+        return super().observe(table, batch, seconds)
+
+    def create_temp_table(self, name, definition, index_columns):
+        pass
+
+    def drop_temp_table(self, name):
+        pass
+
+
+def test_batches_converge_to_target_latency():
+    sink = TimedSink(bytes_per_second=2 * 1024 * 1024)
+    rows = [(i, f"nombre {i}", None) for i in range(300000)]
+
+    for _ in range(5):
+        sink.write("INSERT IGNORE INTO personas (id_persona, nombre, ahno_muerte) VALUES (%s, %s, %s)", rows, 200000)
+
+    assert sum(len(batch) for batch in sink.written) == 5 * len(rows)
+    target = sink.batch_sizer.target_bytes['personas']
+    assert abs(target - 2 * 1024 * 1024) < 0.1 * 2 * 1024 * 1024
+    _, first, last = sink.batch_rows['personas']
+    assert last < first
+
+
+def test_target_stays_within_limits():
+    sizer = BatchSizer()
+    sizer.measure('episodios', [(1, 2, 3, 4)])
+    for _ in range(50):
+        sizer.observe('episodios', sizer.rows('episodios'), 100.0)
+    assert sizer.target_bytes['episodios'] == MIN_BYTES
+
+    for _ in range(50):
+        sizer.observe('episodios', sizer.rows('episodios'), 0.001)
+    assert sizer.target_bytes['episodios'] == MAX_BYTES
+
+
+def test_fixed_batches_without_sizer():
+    sink = TimedSink(bytes_per_second=1, adaptive_batches=False)
+    sink.write("INSERT IGNORE INTO generos (id_genero, genero) VALUES (%s, %s)", [(i, 'g') for i in range(25)], 10)
+    assert [len(batch) for batch in sink.written] == [10, 10, 5]
@@ -0,0 +1,83 @@
+import json
+import os
+import tracemalloc
+
+import pandas as pd
+import pytest
+
+import fase2  # agrega Proyecto-Fase-2/LoadData al path
+import db_sinks
+from synthetic_imdb import SyntheticIMDB
+from imdb_loader import IMDBDataLoader
+
+# Lectura por chunks de la Fase 1 sobre un IMDB sintetico (synthetic_imdb.py de
+# la Fase 2): recorrer title.principals.tsv tiene que mantener el pico de
+# memoria por debajo de un techo fijo, menor que el propio archivo
+
+SCALE = 0.004
+CHUNK_SIZE = 50000
+MAX_CHUNK_MB = 4
+# Techo del pico de tracemalloc al recorrer title.principals.tsv
+PEAK_CEILING_MB = 12
+
+
+class CountingSink(db_sinks.DatabaseSink):
+    """Sink sin base de datos: cuenta las filas escritas sin guardarlas"""
+
+    def open_connection(self):
+        return object()
+
+    def is_alive(self, connection):
+        return True
+
+    def close_connection(self, connection):
+        pass
+
+    def write_batch(self, connection, target, batch):
+        return 'memoria'
+
+    def create_temp_table(self, name, definition, index_columns):
+        pass
+
+    def drop_temp_table(self, name):
+        pass
+
+
+@pytest.fixture(scope='module')
+def tsv_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp('imdb')
+    SyntheticIMDB(str(path), scale=SCALE).generate()
+    return str(path)
+
+
+@pytest.fixture
+def loader(tsv_path, monkeypatch):
+    monkeypatch.setitem(db_sinks.SINKS, 'memoria', CountingSink)
+    return IMDBDataLoader({}, tsv_path, backend='memoria', chunk_size=CHUNK_SIZE, max_chunk_mb=MAX_CHUNK_MB)
+
+
+def test_principals_chunks_peak_memory(loader, tsv_path):
+    # El techo solo prueba algo si el archivo completo no entra en el techo
+    size_mb = os.path.getsize(os.path.join(tsv_path, 'title.principals.tsv')) / 1024 / 1024
+    assert size_mb > PEAK_CEILING_MB
+
+    tracemalloc.start()
+    try:
+        rows = sum(len(df) for df in loader.read_tsv_chunks('title.principals.tsv'))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    with open(os.path.join(tsv_path, 'synthetic.json'), encoding='utf-8') as f:
+        assert rows == json.load(f)['rows']['title.principals.tsv']
+    assert peak / 1024 / 1024 < PEAK_CEILING_MB
+
+
+def test_load_personas_adds_missing_principals(loader, tsv_path):
+    read_params = {'delimiter': '\t', 'dtype': str, 'quoting': 3}
+    persons = set(pd.read_csv(os.path.join(tsv_path, 'name.basics.tsv'), usecols=['nconst'], **read_params)['nconst'])
+    principals = set(pd.read_csv(os.path.join(tsv_path, 'title.principals.tsv'), usecols=['nconst'], **read_params)['nconst'])
+
+    loader.load_personas()
+
+    assert loader.sink.load_stats[('personas', 'memoria')][0] == len(persons) + len(principals - persons)
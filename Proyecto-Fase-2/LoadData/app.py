@@ -3,6 +3,7 @@ import psycopg2
 from psycopg2 import sql
 import hashlib
 import os
+import sys
 from datetime import datetime
 from imdb_loader import IMDBDataLoader
 
@@ -17,5 +18,62 @@ if __name__ == "__main__":
     
     tsv_path = r"C:\Users\PC\Desktop\bases2p1"
     
-    loader = IMDBDataLoader(db_config, tsv_path)
-    loader.load_all_data()
\ No newline at end of file
+    # Tablas grandes que se cargan con COPY FROM STDIN
+    copy_tables = {
+        'personas_produccion': 'binary',
+        'personajes': 'binary',
+        'nombres_produccion': 'binary',
+    }
+    
+    # Con más de 1 worker los loaders independientes corren en paralelo
+    workers = 4
+    
+    # Journal de progreso: `python app.py resume` continúa una carga interrumpida
+    checkpoint_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'checkpoints')
+    # Hashes por fila del último snapshot: `python app.py delta` aplica solo los cambios,
+    # `python app.py delta-index` registra el snapshot actual sin tocar la base
+    delta_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'delta_index')
+    
+    # Cache columnar de los TSV: las siguientes cargas no vuelven a parsear los archivos
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tsv_cache')
+    
+    # title.principals y title.akas se parsean por rangos de bytes en varios procesos
+    parse_processes = 4
+    
+    # Ratings y conocido_por: COPY a tablas temporales y un UPDATE por tabla
+    set_based_updates = True
+    # Votos y rating se insertan con produccion (sin la pasada UPDATE de update_ratings)
+    prejoin_ratings = True
+    
+    # Conexiones de escritura por loader: insert_fast encola los batches y sigue
+    # transformando mientras los hilos escriben (cada rango de IDs en una sola conexión)
+    writer_connections = 4
+    # Filas por batch según el ancho de las filas de cada tabla y la duración de los batches
+    adaptive_batches = True
+    
+    # Reporte de métricas por loader (filas/s, tiempos de parseo/transformación/base, RSS)
+    metrics_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'load_metrics.json')
+    
+    # FKs y PK de personajes se eliminan durante la carga y se reconstruyen al final
+    manage_indexes = True
+    
+    # Recarga completa en tablas UNLOGGED de staging; la API sigue leyendo las
+    # tablas actuales hasta el intercambio final
+    staging = True
+    
+    loader = IMDBDataLoader(db_config, tsv_path, copy_tables=copy_tables, workers=workers,
+                            checkpoint_dir=checkpoint_dir, delta_dir=delta_dir,
+                            manage_indexes=manage_indexes, staging=staging, cache_dir=cache_dir,
+                            parse_processes=parse_processes, metrics_path=metrics_path,
+                            set_based_updates=set_based_updates, prejoin_ratings=prejoin_ratings,
+                            writer_connections=writer_connections, adaptive_batches=adaptive_batches)
+    
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command == 'resume':
+        sys.exit(loader.resume())
+    elif command == 'delta':
+        loader.refresh_delta()
+    elif command == 'delta-index':
+        loader.refresh_delta(apply=False)
+    else:
+        sys.exit(loader.load_all_data())
\ No newline at end of file
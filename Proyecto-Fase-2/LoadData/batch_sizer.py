@@ -0,0 +1,72 @@
+import threading
+
+# Tamaño de batch adaptativo para insert_fast: en lugar de un número fijo de
+# filas por llamada, cada tabla tiene un objetivo en bytes que se ajusta después
+# de cada batch para acercar su duración a TARGET_SECONDS. Las filas por batch
+# salen del objetivo dividido por el ancho promedio de las filas de la tabla
+# (una fila de nombres_produccion pesa varias veces una de genero_produccion).
+
+# Duración buscada por batch (COPY/INSERT + commit)
+TARGET_SECONDS = 1.0
+# Objetivo inicial y límites por batch
+START_BYTES = 4 * 1024 * 1024
+MIN_BYTES = 256 * 1024
+MAX_BYTES = 64 * 1024 * 1024
+# Cambio máximo del objetivo por batch (÷2 .. ×2): un batch lento aislado no lo colapsa
+MAX_STEP = 2.0
+# Filas muestreadas para estimar el ancho de las filas de un chunk
+SAMPLE_ROWS = 200
+
+
+def row_bytes(rows, sample=SAMPLE_ROWS):
+    """Bytes promedio por fila (texto de los valores + separadores) en una muestra de rows"""
+    if not rows:
+        return 1.0
+    sampled = rows[::max(1, len(rows) // sample)][:sample]
+    total = sum(len(str(value)) + 1 for row in sampled for value in row)
+    return max(1.0, total / len(sampled))
+
+
+class BatchSizer:
+    """Objetivo de bytes por batch y tabla, ajustado con la latencia observada
+
+    measure() registra el ancho de las filas de un chunk, rows() da las filas
+    del próximo batch y observe() corrige el objetivo con la duración del batch.
+    observe() puede llamarse desde los hilos de WriterPool.
+    """
+
+    def __init__(self, target_seconds=TARGET_SECONDS, start_bytes=START_BYTES,
+                 min_bytes=MIN_BYTES, max_bytes=MAX_BYTES):
+        self.target_seconds = target_seconds
+        self.start_bytes = start_bytes
+        self.min_bytes = min_bytes
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.target_bytes = {}
+        self.row_bytes = {}
+
+    def measure(self, table, rows):
+        width = row_bytes(rows)
+        with self.lock:
+            self.row_bytes[table] = width
+
+    def rows(self, table):
+        """Filas del próximo batch de la tabla"""
+        with self.lock:
+            target = self.target_bytes.get(table, self.start_bytes)
+            width = self.row_bytes.get(table, 1.0)
+        return max(1, int(target / width))
+
+    def observe(self, table, rows, seconds):
+        """Ajusta el objetivo de la tabla con un batch de `rows` filas; devuelve sus bytes estimados"""
+        with self.lock:
+            current = self.target_bytes.get(table, self.start_bytes)
+            size = rows * self.row_bytes.get(table, 1.0)
+            # Un batch parcial (resto del chunk) rápido está dominado por la latencia
+            # fija del commit: no dice nada sobre el tamaño ideal
+            partial = size < current / MAX_STEP
+            if seconds > 0 and not (partial and seconds < self.target_seconds):
+                ideal = size * self.target_seconds / seconds
+                ideal = min(max(ideal, current / MAX_STEP), current * MAX_STEP)
+                self.target_bytes[table] = min(max(ideal, self.min_bytes), self.max_bytes)
+        return size
@@ -0,0 +1,237 @@
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+import psycopg2
+from imdb_loader import IMDBDataLoader
+from index_manager import LOAD_TABLES
+from scheduler import PHASES
+from synthetic_imdb import SyntheticIMDB
+
+# Benchmark del loader con datos sintéticos: genera los TSV para un factor de
+# escala, vacía la base de pruebas y ejecuta cada fase (PHASES) midiendo filas/s.
+#
+#   python benchmark.py --scale 0.001 --database imdb_bench
+#   python benchmark.py --scale 0.01 --output bench.json --baseline bench_anterior.json
+
+BENCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_data')
+
+# Variación de filas/s (respecto al baseline) a partir de la cual se marca una regresión
+REGRESSION_THRESHOLD = 0.10
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de IMDBDataLoader con datos sintéticos")
+    parser.add_argument('--scale', type=float, default=0.001, help="1.0 ≈ tamaño real de IMDB")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir', help="Directorio de los TSV (por defecto benchmark_data/scale-<s>-seed-<n>)")
+    parser.add_argument('--gzip', action='store_true', help="Generar y leer .tsv.gz")
+    parser.add_argument('--repeat', type=int, default=1, help="Repeticiones (se reporta la mediana)")
+
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=5432)
+    parser.add_argument('--database', default='imdb_bench', help="Base de pruebas: se vacía antes de cada corrida")
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='root')
+
+    parser.add_argument('--copy-format', choices=['none', 'text', 'binary'], default='binary',
+                        help="COPY para personas_produccion, personajes y nombres_produccion")
+    parser.add_argument('--parse-processes', type=int, default=1)
+    parser.add_argument('--cache-dir', help="Cache columnar de TSVCache")
+    parser.add_argument('--set-based-updates', action='store_true',
+                        help="Ratings y conocido_por con tabla temporal y un solo UPDATE")
+    parser.add_argument('--prejoin-ratings', action='store_true',
+                        help="Votos y rating insertados con produccion (sin update_ratings)")
+    parser.add_argument('--writer-connections', type=int, default=1,
+                        help="Conexiones de escritura de insert_fast (WriterPool)")
+    parser.add_argument('--adaptive-batches', action='store_true',
+                        help="Tamaño de batch por bytes ajustado a la duración de cada batch (BatchSizer)")
+
+    parser.add_argument('--output', help="Reporte JSON (por defecto benchmark_results/<fecha>.json)")
+    parser.add_argument('--baseline', help="Reporte JSON anterior para comparar filas/s")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument('--verbose', action='store_true', help="Mostrar la salida del loader")
+    return parser.parse_args(argv)
+
+
+def db_config(args):
+    config = {'host': args.host, 'port': args.port, 'database': args.database, 'user': args.user}
+    if args.password:
+        config['password'] = args.password
+    return config
+
+
+def reset_database(config):
+    """Vacía las tablas de la carga (el esquema debe existir, ver mm-config/load)"""
+    connection = psycopg2.connect(**config)
+    cursor = connection.cursor()
+    cursor.execute(f"TRUNCATE {', '.join(LOAD_TABLES)} RESTART IDENTITY CASCADE")
+    connection.commit()
+    cursor.close()
+    connection.close()
+
+
+def run_phases(loader):
+    """Ejecuta cada fase con sus loaders en orden; devuelve {fase: segundos}"""
+    timings = {}
+    loader.metrics.started = time.time()
+    loader.connect_db()
+    try:
+        for phase, methods in PHASES:
+            start = time.perf_counter()
+            for method_name in methods:
+                getattr(loader, method_name)()
+            loader.retry_failed_batches()
+            timings[phase] = time.perf_counter() - start
+    finally:
+        loader.disconnect_db()
+    return timings
+
+
+def run_once(args, data_dir, config):
+    reset_database(config)
+    copy_tables = {} if args.copy_format == 'none' else {
+        table: args.copy_format for table in ('personas_produccion', 'personajes', 'nombres_produccion')
+    }
+    loader = IMDBDataLoader(
+        config, data_dir, copy_tables=copy_tables, single_pass=False,
+        parse_processes=args.parse_processes, cache_dir=args.cache_dir,
+        set_based_updates=args.set_based_updates, prejoin_ratings=args.prejoin_ratings,
+        writer_connections=args.writer_connections, adaptive_batches=args.adaptive_batches
+    )
+
+    if args.verbose:
+        timings = run_phases(loader)
+    else:
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+            timings = run_phases(loader)
+
+    steps = loader.metrics.report()['steps']
+    phases = {}
+    for phase, methods in PHASES:
+        rows = sum(steps.get(m, {}).get('rows_inserted', 0) for m in methods)
+        phases[phase] = {'seconds': timings[phase], 'rows': rows}
+    return phases, steps
+
+
+def median_run(runs):
+    """Mediana por fase y por loader de varias corridas"""
+    phases = {}
+    for phase, _ in PHASES:
+        seconds = statistics.median(run[0][phase]['seconds'] for run in runs)
+        rows = runs[0][0][phase]['rows']
+        phases[phase] = {'seconds': seconds, 'rows': rows, 'rows_per_second': rows / seconds if seconds else None}
+
+    loaders = {}
+    for method_name in runs[0][1]:
+        samples = [run[1][method_name] for run in runs if method_name in run[1]]
+        seconds = statistics.median(s['wall_seconds'] for s in samples)
+        rows = samples[0]['rows_inserted']
+        loaders[method_name] = {
+            'seconds': seconds,
+            'rows': rows,
+            'rows_per_second': rows / seconds if seconds else None,
+            'parse_seconds': statistics.median(s['parse_seconds'] for s in samples),
+            'transform_seconds': statistics.median(s['transform_seconds'] for s in samples),
+            'insert_seconds': statistics.median(s['insert_seconds'] for s in samples),
+            'peak_rss_bytes': max((s['peak_rss_bytes'] or 0) for s in samples) or None,
+        }
+    return phases, loaders
+
+
+def compare(report, baseline, threshold):
+    """Variación de filas/s respecto al baseline; devuelve las regresiones"""
+    regressions = []
+    print(f"\n📈 COMPARACIÓN CON BASELINE ({baseline['generated_at']})")
+    print("-" * 60)
+    for section in ('phases', 'loaders'):
+        for name, current in report[section].items():
+            previous = baseline.get(section, {}).get(name)
+            if not previous or not previous.get('rows_per_second') or not current['rows_per_second']:
+                continue
+            change = current['rows_per_second'] / previous['rows_per_second'] - 1
+            mark = '⚠️ ' if change < -threshold else '  '
+            print(f"{mark} {name:<36} {previous['rows_per_second']:>12,.0f} → "
+                  f"{current['rows_per_second']:>12,.0f} filas/s ({change:+.1%})")
+            if change < -threshold:
+                regressions.append(name)
+    return regressions
+
+
+def print_report(report):
+    print("\n⏱️  FILAS/S POR FASE")
+    print("-" * 60)
+    for phase, result in report['phases'].items():
+        rate = result['rows_per_second'] or 0
+        print(f"{phase:<40} {result['rows']:>12,} filas  {result['seconds']:>8.2f}s  {rate:>12,.0f} filas/s")
+    print("\n⏱️  FILAS/S POR LOADER")
+    print("-" * 60)
+    for name, result in report['loaders'].items():
+        rate = result['rows_per_second'] or 0
+        print(f"   {name:<36} {result['rows']:>12,} filas  {result['seconds']:>8.2f}s  {rate:>12,.0f} filas/s")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    data_dir = args.data_dir or os.path.join(BENCH_DIR, f"scale-{args.scale:g}-seed-{args.seed}")
+
+    generator = SyntheticIMDB(data_dir, scale=args.scale, seed=args.seed, compress=args.gzip)
+    if generator.is_current():
+        print(f"♻️  Usando datos sintéticos existentes en {data_dir}")
+    else:
+        generator.generate()
+    with open(os.path.join(data_dir, 'synthetic.json'), encoding='utf-8') as f:
+        input_rows = json.load(f)['rows']
+
+    config = db_config(args)
+    runs = []
+    for i in range(args.repeat):
+        print(f"\n🏁 Corrida {i + 1}/{args.repeat}...")
+        runs.append(run_once(args, data_dir, config))
+
+    phases, loaders = median_run(runs)
+    report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'scale': args.scale,
+        'seed': args.seed,
+        'gzip': args.gzip,
+        'repeat': args.repeat,
+        'options': {
+            'copy_format': args.copy_format,
+            'parse_processes': args.parse_processes,
+            'cache_dir': bool(args.cache_dir),
+            'set_based_updates': args.set_based_updates,
+            'prejoin_ratings': args.prejoin_ratings,
+            'writer_connections': args.writer_connections,
+            'adaptive_batches': args.adaptive_batches,
+        },
+        'input_rows': input_rows,
+        'phases': phases,
+        'loaders': loaders,
+    }
+    print_report(report)
+
+    output = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'benchmark_results',
+        f"{datetime.now():%Y%m%d-%H%M%S}-scale-{args.scale:g}.json"
+    )
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n📊 Reporte: {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regresiones de más de {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+# Catálogos (profesiones, géneros, tipos, atributos) como arreglos de códigos:
+# las relaciones convierten columnas completas a IDs sin trabajo por fila en Python
+
+
+class CatalogMap:
+    """Mapa nombre → id de un catálogo con búsqueda vectorizada
+
+    Los nombres forman un pd.Index (posición = código) y los IDs un arreglo int64
+    paralelo. lookup() factoriza la columna, normaliza solo los valores distintos
+    (p.ej. format_texts) y pasa de códigos a IDs con un np.take.
+    """
+
+    def __init__(self, items=None, normalize=None):
+        self.normalize = normalize
+        self.names = []
+        self.ids = np.zeros(0, dtype=np.int64)
+        self._index = None
+        # Asignaciones aún no aplicadas a names/ids: se aplican en bloque antes de
+        # la próxima búsqueda, así llenar el mapa de a uno no reconstruye los arreglos
+        self.pending = {}
+        if items:
+            self.update(items)
+
+    def __len__(self):
+        self.flush()
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.pending or self.position(name) >= 0
+
+    def __setitem__(self, name, catalog_id):
+        self.pending[name] = catalog_id
+
+    def position(self, name):
+        """Posición de name en los nombres ya aplicados (sin incluir pending); -1 si no está"""
+        return self.position_array([name])[0]
+
+    def get(self, name, default=None):
+        if name in self.pending:
+            return int(self.pending[name])
+        position = self.position(name)
+        return int(self.ids[position]) if position >= 0 else default
+
+    def items(self):
+        self.flush()
+        return zip(self.names, self.ids.tolist())
+
+    def update(self, items):
+        """Agrega pares (nombre, id) de otro CatalogMap, un dict o una lista"""
+        if hasattr(items, 'items'):
+            items = items.items()
+        for name, catalog_id in items:
+            self[name] = catalog_id
+
+    def flush(self):
+        """Aplica pending: actualiza los ids de nombres existentes y agrega los nuevos (una sola reconstrucción)"""
+        if not self.pending:
+            return
+        names = list(self.pending)
+        ids = np.fromiter(self.pending.values(), dtype=np.int64, count=len(names))
+        self.pending = {}
+
+        positions = self.position_array(names)
+        found = positions >= 0
+        self.ids[positions[found]] = ids[found]
+        if not found.all():
+            self.names.extend(name for name, known in zip(names, found) if not known)
+            self.ids = np.concatenate([self.ids, ids[~found]])
+            self._index = None
+
+    def position_array(self, names):
+        if not self.names:
+            return np.full(len(names), -1, dtype=np.intp)
+        return self.applied_index().get_indexer(pd.Index(names, dtype=object))
+
+    def index(self):
+        self.flush()
+        return self.applied_index()
+
+    def applied_index(self):
+        if self._index is None:
+            self._index = pd.Index(self.names, dtype=object)
+        return self._index
+
+    def codes(self, values):
+        """Códigos de un arreglo de nombres (ya normalizados); -1 si no están"""
+        return self.index().get_indexer(pd.Index(values, dtype=object))
+
+    def lookup(self, series):
+        """IDs (Int64, NA si no están) de cada valor de la columna"""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            uniques = series.cat.categories
+        else:
+            codes, uniques = pd.factorize(series)
+
+        keys = pd.Series(np.asarray(uniques, dtype=object))
+        if self.normalize is not None:
+            keys = self.normalize(keys)
+
+        # Tabla código de la columna → id; el último elemento (-1) es el de los NA
+        positions = self.codes(keys.astype(object).where(keys.notna(), None).tolist())
+        table = np.full(len(positions) + 1, -1, dtype=np.int64)
+        found = positions >= 0
+        table[np.flatnonzero(found)] = self.ids[positions[found]]
+        ids = table.take(codes)
+        return pd.Series(pd.arrays.IntegerArray(ids, ids < 0), index=series.index)
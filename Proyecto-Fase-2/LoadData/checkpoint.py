@@ -0,0 +1,123 @@
+import glob
+import json
+import os
+
+
+class CheckpointJournal:
+    """Journal de progreso por loader para reanudar una carga interrumpida
+
+    Cada ScanTask tiene su propio archivo <directorio>/<key>.json con, por
+    archivo TSV, el número de chunks completos y las filas ya confirmadas del
+    chunk en curso. Un archivo por tarea permite que los workers de
+    PhaseScheduler escriban sin pisarse.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.states = {}
+        # Posición actual: (key, archivo, chunk) mientras se procesa un chunk
+        self.position = None
+        self.pending_skip = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def reset(self):
+        """Borra el journal para empezar una carga desde cero
+
+        Solo se borran los archivos del journal; otros archivos del directorio
+        (p.ej. el estado de IndexManager) se conservan.
+        """
+        for pattern in ('*.json', 'failed_batches_*.jsonl'):
+            for path in glob.glob(os.path.join(self.directory, pattern)):
+                os.remove(path)
+        self.states = {}
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def state(self, key):
+        if key not in self.states:
+            try:
+                with open(self._path(key), encoding='utf-8') as f:
+                    self.states[key] = json.load(f)
+            except (OSError, ValueError):
+                self.states[key] = {'done': False, 'files': {}}
+        return self.states[key]
+
+    def save(self, key):
+        """Escritura atómica del estado de una tarea"""
+        tmp_path = self._path(key) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.states[key], f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path(key))
+
+    def is_done(self, key):
+        return self.state(key)['done']
+
+    def mark_done(self, key):
+        self.state(key)['done'] = True
+        self.save(key)
+
+    def file_progress(self, key, file_name):
+        return self.state(key)['files'].setdefault(
+            file_name, {'chunks': 0, 'partial_rows': 0, 'rows': 0}
+        )
+
+    def start_chunk(self, key, file_name, chunk_index):
+        """Marca el chunk en curso; si ya había filas confirmadas se saltan al reinsertar"""
+        progress = self.file_progress(key, file_name)
+        self.position = (key, file_name)
+        self.pending_skip = progress['partial_rows'] if chunk_index == progress['chunks'] else 0
+
+    def take_skip(self, count):
+        """Cuántas de las siguientes `count` filas ya estaban confirmadas"""
+        if self.position is None:
+            return 0
+        skip = min(self.pending_skip, count)
+        self.pending_skip -= skip
+        return skip
+
+    def record_rows(self, count):
+        """Registra filas confirmadas (commit) del chunk en curso"""
+        if self.position is None:
+            return
+        key, file_name = self.position
+        progress = self.file_progress(key, file_name)
+        progress['partial_rows'] += count
+        progress['rows'] += count
+        self.save(key)
+
+    def finish_chunk(self):
+        key, file_name = self.position
+        progress = self.file_progress(key, file_name)
+        progress['chunks'] += 1
+        progress['partial_rows'] = 0
+        self.save(key)
+        self.position = None
+        self.pending_skip = 0
+
+    # ==========================================
+    # COLA DE REINTENTOS
+    # ==========================================
+
+    def queue_failed(self, query, batch):
+        """Guarda un batch fallido para reintentarlo (un archivo por proceso)"""
+        path = os.path.join(self.directory, f"failed_batches_{os.getpid()}.jsonl")
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'query': query, 'rows': [list(r) for r in batch]}, ensure_ascii=False))
+            f.write('\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def pop_failed(self):
+        """Devuelve y borra todos los batches en cola"""
+        failed = []
+        for path in sorted(glob.glob(os.path.join(self.directory, 'failed_batches_*.jsonl'))):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        failed.append((entry['query'], [tuple(r) for r in entry['rows']]))
+            os.remove(path)
+        return failed
@@ -0,0 +1,117 @@
+import io
+import re
+import struct
+from datetime import date
+
+# Encabezado y terminador del formato binario de COPY
+PGCOPY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('>ii', 0, 0)
+PGCOPY_TRAILER = struct.pack('>h', -1)
+
+PG_EPOCH = date(2000, 1, 1).toordinal()
+
+# INSERT [IGNORE] INTO tabla (columnas) VALUES %s | (%s, ...) [ON CONFLICT ...]:
+# la forma de execute_values (Fase 2) y la de executemany de MySQL (Fase 1)
+INSERT_PATTERN = re.compile(
+    r'INSERT\s+(IGNORE\s+)?INTO\s+(\w+)\s*\(([^)]*)\)\s*VALUES\s+(?:%s|\(\s*%s(?:\s*,\s*%s)*\s*\))'
+    r'\s*(ON\s+CONFLICT.*)?$',
+    re.IGNORECASE | re.DOTALL
+)
+
+# INSERT IGNORE equivale a descartar las filas con clave repetida
+IGNORE_CONFLICT = 'ON CONFLICT DO NOTHING'
+
+
+def parse_insert(query):
+    """Extrae (tabla, columnas, cláusula ON CONFLICT) de un INSERT ... VALUES"""
+    match = INSERT_PATTERN.search(query.strip())
+    if not match:
+        return None
+    table = match.group(2)
+    columns = [c.strip() for c in match.group(3).split(',') if c.strip()]
+    if match.group(4):
+        conflict = ' '.join(match.group(4).split())
+    else:
+        conflict = IGNORE_CONFLICT if match.group(1) else None
+    return table, columns, conflict
+
+
+def escape_text(value):
+    """Convierte un valor Python a su representación en COPY formato texto"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+def write_text_rows(rows, file):
+    """Escribe filas en formato texto de COPY (también lo lee LOAD DATA de MySQL)"""
+    for row in rows:
+        file.write('\t'.join(escape_text(v) for v in row))
+        file.write('\n')
+
+
+def build_text_buffer(rows):
+    """Construye un buffer en memoria con filas en formato texto de COPY"""
+    buffer = io.StringIO()
+    write_text_rows(rows, buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def _encode_date(value):
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return struct.pack('>i', value.toordinal() - PG_EPOCH)
+
+
+def _encode_text(value):
+    return str(value).encode('utf-8')
+
+
+# Codificadores binarios por tipo de PostgreSQL (pg_type.typname)
+BINARY_ENCODERS = {
+    'int2': lambda v: struct.pack('>h', int(v)),
+    'int4': lambda v: struct.pack('>i', int(v)),
+    'int8': lambda v: struct.pack('>q', int(v)),
+    'bool': lambda v: struct.pack('>?', bool(v)),
+    'float4': lambda v: struct.pack('>f', float(v)),
+    'float8': lambda v: struct.pack('>d', float(v)),
+    'date': _encode_date,
+    'text': _encode_text,
+    'varchar': _encode_text,
+    'bpchar': _encode_text,
+}
+
+
+def supports_binary(type_names):
+    """Indica si todas las columnas tienen codificador binario"""
+    return all(t in BINARY_ENCODERS for t in type_names)
+
+
+def build_binary_buffer(rows, type_names):
+    """Construye un buffer en memoria con filas en formato binario de COPY"""
+    encoders = [BINARY_ENCODERS[t] for t in type_names]
+    field_count = struct.pack('>h', len(encoders))
+    null_field = struct.pack('>i', -1)
+
+    buffer = io.BytesIO()
+    buffer.write(PGCOPY_HEADER)
+    for row in rows:
+        buffer.write(field_count)
+        for encode, value in zip(encoders, row):
+            if value is None:
+                buffer.write(null_field)
+            else:
+                payload = encode(value)
+                buffer.write(struct.pack('>i', len(payload)))
+                buffer.write(payload)
+    buffer.write(PGCOPY_TRAILER)
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,457 @@
+import os
+import tempfile
+import time
+from abc import ABC, abstractmethod
+import psycopg2
+from psycopg2.extras import execute_values
+from copy_stream import (
+    IGNORE_CONFLICT, parse_insert, write_text_rows, build_text_buffer, build_binary_buffer, supports_binary
+)
+
+# Destinos de las filas ya transformadas por los loaders de la Fase 1 y la Fase 2.
+# Las consultas llegan como INSERT [IGNORE] INTO tabla (columnas) VALUES ...
+# [ON CONFLICT ...]; copy_stream las reduce a (tabla, columnas, conflicto) y
+# codifica las filas. Cada sink escribe ese destino con su carga masiva más
+# rápida: COPY en PostgreSQL, LOAD DATA LOCAL INFILE en MySQL.
+
+
+class DatabaseSink(ABC):
+    """Conexión y escritura por batches para un backend
+
+    Las subclases implementan la conexión y write_batch (la carga masiva de un
+    batch); la división en batches, el reintento con conexión nueva y las
+    estadísticas por tabla son comunes.
+    """
+
+    def __init__(self, db_config, batch_sizer=None):
+        self.db_config = db_config
+        self.connection = None
+        # Filas confirmadas y segundos por tabla y modo: {(tabla, modo): [filas, segundos]}
+        self.load_stats = {}
+        # Batches que fallaron dos veces: (query, filas)
+        self.failed = []
+        # Con un BatchSizer las filas por batch se ajustan a la duración de cada batch
+        self.batch_sizer = batch_sizer
+        # Trayectoria de BatchSizer por tabla: {tabla: [batches, filas del primero, filas del último]}
+        self.batch_rows = {}
+
+    @abstractmethod
+    def open_connection(self):
+        """Conexión nueva configurada para carga masiva"""
+
+    @abstractmethod
+    def is_alive(self, connection):
+        """Indica si la conexión sigue respondiendo"""
+
+    @abstractmethod
+    def close_connection(self, connection):
+        """Restaura la sesión (constraints, commits síncronos) y cierra la conexión"""
+
+    @abstractmethod
+    def write_batch(self, connection, target, batch):
+        """Escribe y confirma un batch en connection; devuelve el modo usado"""
+
+    @abstractmethod
+    def create_temp_table(self, name, definition, index_columns):
+        """Tabla temporal de la sesión con un índice sobre index_columns"""
+
+    @abstractmethod
+    def drop_temp_table(self, name):
+        """Elimina una tabla temporal de create_temp_table"""
+
+    def target(self, query):
+        """(tabla, columnas, conflicto) del INSERT; ValueError si no es un INSERT ... VALUES"""
+        target = parse_insert(query)
+        if not target:
+            raise ValueError(f"Consulta no soportada por el sink: {query}")
+        return target
+
+    def connect(self):
+        self.connection = self.open_connection()
+
+    def keep_alive(self):
+        try:
+            if self.connection is None or not self.is_alive(self.connection):
+                self.connect()
+        except Exception:
+            self.connect()
+
+    def disconnect(self):
+        if self.connection is not None:
+            try:
+                self.close_connection(self.connection)
+            except Exception:
+                pass
+            self.connection = None
+
+    def rollback(self):
+        try:
+            self.connection.rollback()
+        except Exception:
+            pass
+
+    def batches(self, table, rows, batch_size):
+        """(posición, filas) de rows: batch_size filas, o las que indique BatchSizer"""
+        if self.batch_sizer:
+            self.batch_sizer.measure(table, rows)
+        i = 0
+        while i < len(rows):
+            size = self.batch_sizer.rows(table) if self.batch_sizer else batch_size
+            yield i, rows[i:i + size]
+            i += size
+
+    def observe(self, table, batch, seconds):
+        """Duración de un batch para BatchSizer; devuelve el tamaño siguiente en bytes"""
+        if not self.batch_sizer:
+            return None
+        trajectory = self.batch_rows.setdefault(table, [0, len(batch), len(batch)])
+        trajectory[0] += 1
+        trajectory[2] = len(batch)
+        return self.batch_sizer.observe(table, len(batch), seconds)
+
+    def write(self, query, rows, batch_size):
+        """Escribe rows por batches en la conexión del sink; devuelve las filas confirmadas
+
+        Cada batch tiene un reintento con conexión nueva; si vuelve a fallar
+        queda en failed para retry_failed.
+        """
+        target = self.target(query)
+        table = target[0]
+        committed = 0
+        for _, batch in self.batches(table, rows, batch_size):
+            for attempt in range(2):
+                start = time.perf_counter()
+                try:
+                    self.keep_alive()
+                    mode = self.write_batch(self.connection, target, batch)
+                except Exception as e:
+                    self.rollback()
+                    if attempt:
+                        print(f"⚠️  Batch de {len(batch):,} filas de {table} no insertado: {e}")
+                        self.failed.append((query, batch))
+                    else:
+                        self.disconnect()
+                        self.connect()
+                    continue
+                seconds = time.perf_counter() - start
+                self.observe(table, batch, seconds)
+                self.add_stats(table, mode, len(batch), seconds)
+                committed += len(batch)
+                break
+        return committed
+
+    def retry_failed(self):
+        """Reintenta los batches fallidos; los que vuelven a fallar quedan en failed"""
+        failed, self.failed = self.failed, []
+        if failed:
+            print(f"\n🔁 Reintentando {len(failed):,} batches fallidos...")
+        for query, batch in failed:
+            self.write(query, batch, len(batch))
+
+    def add_stats(self, table, mode, rows, seconds):
+        stats = self.load_stats.setdefault((table, mode), [0, 0.0])
+        stats[0] += rows
+        stats[1] += seconds
+
+    def print_stats(self):
+        if not self.load_stats:
+            return
+        print("=== FILAS/S POR TABLA ===")
+        for (table, mode), (rows, seconds) in self.load_stats.items():
+            rate = rows / seconds if seconds else 0
+            print(f"{table:<28} {mode:<14} {rows:>12,} filas {seconds:>9.1f}s {rate:>12,.0f} filas/s")
+
+        if self.failed:
+            rows = sum(len(batch) for _, batch in self.failed)
+            print(f"NO INSERTADOS: {len(self.failed)} batches, {rows:,} filas")
+
+        if self.batch_rows:
+            print("=== FILAS POR BATCH ===")
+            for table, (count, first, last) in self.batch_rows.items():
+                print(f"{table:<28} {count:>6} batches  inicial {first:>10,}  final {last:>10,}")
+
+
+class PostgresSink(DatabaseSink):
+    """PostgreSQL: COPY FROM STDIN (texto o binario), o execute_values
+
+    copy_tables indica el formato de COPY por tabla ({tabla: 'text' | 'binary'});
+    las tablas que no están usan execute_values. Con copy_tables=None todas las
+    tablas usan COPY en formato texto. Un conflicto (ON CONFLICT o INSERT IGNORE)
+    pasa por una tabla temporal porque COPY no lo soporta.
+    """
+
+    def __init__(self, db_config, copy_tables=None, search_path=None, batch_sizer=None):
+        super().__init__(db_config, batch_sizer)
+        self.copy_tables = copy_tables
+        # Esquema donde escriben las consultas sin esquema (staging de la Fase 2)
+        self.search_path = search_path
+        # Tipos (pg_type.typname) por tabla para COPY binario
+        self.column_types = {}
+
+    def open_connection(self):
+        connection = psycopg2.connect(
+            **self.db_config,
+            keepalives=1,
+            keepalives_idle=30,
+            keepalives_interval=10,
+            keepalives_count=5
+        )
+        connection.autocommit = False
+
+        cursor = connection.cursor()
+        # 🔧 DESACTIVAR CONSTRAINTS Y TRIGGERS PARA CARGA MASIVA
+        cursor.execute("SET session_replication_role = 'replica';")
+        cursor.execute("SET maintenance_work_mem = '1GB';")
+        cursor.execute("SET work_mem = '256MB';")
+        cursor.execute("SET synchronous_commit = OFF;")
+        if self.search_path:
+            # Las consultas sin esquema escriben en las copias UNLOGGED
+            cursor.execute(f"SET search_path = {self.search_path}, public;")
+        cursor.close()
+        return connection
+
+    def is_alive(self, connection):
+        if connection.closed:
+            return False
+        cursor = connection.cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+        cursor.close()
+        return True
+
+    def close_connection(self, connection):
+        if not connection.closed:
+            cursor = connection.cursor()
+            cursor.execute("SET session_replication_role = 'origin';")
+            cursor.execute("SET synchronous_commit = ON;")
+            connection.commit()
+            cursor.close()
+            connection.close()
+
+    def copy_format(self, table):
+        """'text' | 'binary' si la tabla se carga con COPY, None para execute_values"""
+        if self.copy_tables is None:
+            return 'text'
+        return self.copy_tables.get(table)
+
+    def get_column_types(self, cursor, table, columns):
+        """Obtiene los tipos (pg_type.typname) de las columnas de una tabla"""
+        if table not in self.column_types:
+            cursor.execute("""
+                SELECT a.attname, t.typname
+                FROM pg_attribute a
+                JOIN pg_type t ON t.oid = a.atttypid
+                WHERE a.attrelid = %s::regclass AND a.attnum > 0 AND NOT a.attisdropped
+            """, (table,))
+            self.column_types[table] = dict(cursor.fetchall())
+        types = self.column_types[table]
+        return [types.get(c.lower()) for c in columns]
+
+    def copy_types(self, cursor, target):
+        """Tipos para COPY binario de la tabla, o None si se usa formato texto"""
+        table, columns, _ = target
+        if self.copy_format(table) != 'binary':
+            return None
+        type_names = self.get_column_types(cursor, table, columns)
+        return type_names if supports_binary(type_names) else None
+
+    def copy_batch(self, cursor, target, batch):
+        """Carga un batch con COPY FROM STDIN desde un buffer en memoria; devuelve el modo"""
+        type_names = self.copy_types(cursor, target)
+        if type_names:
+            self.copy_buffer(cursor, target, build_binary_buffer(batch, type_names), 'binary')
+            return 'copy_binary'
+        self.copy_buffer(cursor, target, build_text_buffer(batch), 'text')
+        return 'copy_text'
+
+    def copy_buffer(self, cursor, target, buffer, copy_format):
+        """COPY FROM STDIN de un buffer ya armado (temporal + ON CONFLICT si hace falta)"""
+        table, columns, conflict = target
+        cols = ', '.join(columns)
+
+        if conflict:
+            # COPY no soporta ON CONFLICT: se pasa por una tabla temporal
+            stage = f"copy_stage_{table}"
+            cursor.execute(f"""
+                CREATE TEMP TABLE IF NOT EXISTS {stage}
+                (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS
+            """)
+            cursor.copy_expert(f"COPY {stage} ({cols}) FROM STDIN WITH (FORMAT {copy_format})", buffer)
+            cursor.execute(f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {stage} {conflict}")
+        else:
+            cursor.copy_expert(f"COPY {table} ({cols}) FROM STDIN WITH (FORMAT {copy_format})", buffer)
+
+    def write_batch(self, connection, target, batch):
+        """Escribe y confirma un batch con COPY o execute_values
+
+        Sin SELECT 1 previo: si la conexión se cayó, el error lleva al reintento
+        con conexión nueva de quien llama.
+        """
+        cursor = connection.cursor()
+        if self.copy_format(target[0]):
+            mode = self.copy_batch(cursor, target, batch)
+        else:
+            table, columns, conflict = target
+            query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s {conflict or ''}"
+            execute_values(cursor, query, batch, page_size=len(batch))
+            mode = 'execute_values'
+        connection.commit()
+        cursor.close()
+        return mode
+
+    def create_temp_table(self, name, definition, index_columns):
+        cursor = self.connection.cursor()
+        cursor.execute(f"CREATE TEMP TABLE {name} ({definition})")
+        cursor.execute(f"CREATE INDEX idx_{name} ON {name} ({', '.join(index_columns)})")
+        cursor.close()
+
+    def drop_temp_table(self, name):
+        cursor = self.connection.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {name}")
+        cursor.close()
+
+
+# Errores de LOAD DATA LOCAL INFILE deshabilitado: 1148 (ER_NOT_ALLOWED_COMMAND),
+# 2068 (CR_LOAD_DATA_LOCAL_INFILE_REJECTED) y 3948 (ER_CLIENT_LOCAL_FILES_DISABLED).
+# Cualquier otro error es del batch o de la conexión y se reintenta
+LOCAL_INFILE_ERRORS = {1148, 2068, 3948}
+
+
+class MySQLSink(DatabaseSink):
+    """MySQL: LOAD DATA LOCAL INFILE, o executemany si el servidor no lo permite
+
+    MySQL solo descarta claves repetidas (IGNORE): un ON CONFLICT ... DO UPDATE
+    no tiene equivalente y target() lo rechaza.
+    """
+
+    def __init__(self, db_config, bulk_mode='load_data', batch_sizer=None):
+        super().__init__(db_config, batch_sizer)
+        import mysql.connector
+
+        # 'load_data': LOAD DATA LOCAL INFILE desde un TSV temporal
+        # 'executemany': INSERT por lotes (extensión C de mysql-connector si está instalada)
+        self.bulk_mode = bulk_mode
+        self.use_pure = not getattr(mysql.connector, 'HAVE_CEXT', False)
+
+    def target(self, query):
+        target = super().target(query)
+        if target[2] not in (None, IGNORE_CONFLICT):
+            raise ValueError(f"MySQLSink solo soporta INSERT o INSERT IGNORE: {query}")
+        return target
+
+    def open_connection(self):
+        import mysql.connector
+        from mysql.connector import Error
+
+        try:
+            config = self.db_config.copy()
+            config.update({
+                'autocommit': False,
+                'connection_timeout': 3600,
+                'use_unicode': True,
+                'charset': 'utf8mb4',
+                'ssl_disabled': True,
+                'use_pure': self.use_pure,
+                'allow_local_infile': self.bulk_mode == 'load_data',
+            })
+
+            connection = mysql.connector.connect(**config)
+
+            cursor = connection.cursor()
+            cursor.execute("SET SESSION wait_timeout = 86400")
+            cursor.execute("SET SESSION interactive_timeout = 86400")
+            cursor.execute("SET SESSION autocommit = 0")
+            cursor.execute("SET SESSION foreign_key_checks = 0")
+            cursor.execute("SET SESSION unique_checks = 0")
+            cursor.close()
+            return connection
+
+        except Error as e:
+            print(f"❌ Error conectando: {e}")
+            raise
+
+    def is_alive(self, connection):
+        if connection.is_connected():
+            connection.ping(reconnect=True, attempts=1, delay=0)
+            return True
+        return False
+
+    def close_connection(self, connection):
+        if connection.is_connected():
+            try:
+                cursor = connection.cursor()
+                cursor.execute("SET SESSION foreign_key_checks = 1")
+                cursor.execute("SET SESSION unique_checks = 1")
+                cursor.close()
+            except Exception:
+                pass
+        connection.close()
+
+    def load_data(self, connection, target, batch):
+        """LOAD DATA LOCAL INFILE de las filas escritas en un TSV temporal"""
+        table, columns, conflict = target
+        ignore = 'IGNORE ' if conflict else ''
+        tmp = tempfile.NamedTemporaryFile('w', suffix='.tsv', encoding='utf-8', newline='\n', delete=False)
+        try:
+            with tmp:
+                write_text_rows(batch, tmp)
+
+            cursor = connection.cursor()
+            cursor.execute(f"""LOAD DATA LOCAL INFILE %s {ignore}INTO TABLE {table}
+                               CHARACTER SET utf8mb4
+                               FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'
+                               LINES TERMINATED BY '\\n'
+                               ({', '.join(columns)})""", (tmp.name.replace('\\', '/'),))
+            connection.commit()
+            cursor.close()
+        finally:
+            os.remove(tmp.name)
+
+    def execute_batch(self, connection, target, batch):
+        table, columns, conflict = target
+        ignore = 'IGNORE ' if conflict else ''
+        query = f"INSERT {ignore}INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+        cursor = connection.cursor()
+        cursor.executemany(query, batch)
+        connection.commit()
+        cursor.close()
+
+    def write_batch(self, connection, target, batch):
+        if self.bulk_mode == 'load_data':
+            try:
+                self.load_data(connection, target, batch)
+                return 'load_data'
+            except Exception as e:
+                if getattr(e, 'errno', None) not in LOCAL_INFILE_ERRORS:
+                    raise
+                # Pasar a executemany no cuenta como intento del batch
+                connection.rollback()
+                print(f"⚠️  LOAD DATA no disponible ({e}), usando executemany")
+                self.bulk_mode = 'executemany'
+        self.execute_batch(connection, target, batch)
+        return 'executemany'
+
+    def create_temp_table(self, name, definition, index_columns):
+        cursor = self.connection.cursor()
+        cursor.execute(f"""CREATE TEMPORARY TABLE {name} (
+                            {definition},
+                            INDEX idx_{name} ({', '.join(index_columns)})
+                        )""")
+        cursor.close()
+
+    def drop_temp_table(self, name):
+        cursor = self.connection.cursor()
+        cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {name}")
+        cursor.close()
+
+
+SINKS = {
+    'mysql': MySQLSink,
+    'postgresql': PostgresSink,
+}
+
+
+def create_sink(backend, db_config, **options):
+    if backend not in SINKS:
+        raise ValueError(f"Backend no soportado: {backend} (opciones: {', '.join(SINKS)})")
+    return SINKS[backend](db_config, **options)
@@ -0,0 +1,87 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Hashes por fila de un snapshot IMDB para el refresh incremental
+
+
+def row_hashes(df):
+    """Hash de 64 bits de cada fila (valores del TSV como texto, sin el índice)
+
+    Se normaliza a texto para que el hash no cambie si la columna viene tipada
+    desde TSVCache.
+    """
+    return pd.util.hash_pandas_object(df.astype('string'), index=False).to_numpy(dtype=np.uint64)
+
+
+def pair_keys(ids, ordinals):
+    """Clave única para filas (id, orden), p.ej. title.akas (titleId, ordering)"""
+    return (np.asarray(ids, dtype=np.int64) << 16) | np.asarray(ordinals, dtype=np.int64)
+
+
+def split_pair_keys(keys):
+    keys = np.asarray(keys, dtype=np.int64)
+    return keys >> 16, keys & 0xFFFF
+
+
+class RowHashIndex:
+    """Archivo sidecar .npz con (id, hash) del snapshot anterior
+
+    diff() compara cada chunk del snapshot nuevo contra el anterior y acumula el
+    índice nuevo; removed() devuelve los IDs que ya no están y save() reemplaza
+    el sidecar de forma atómica al terminar.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with np.load(path) as stored:
+                self.old_ids = stored['ids']
+                self.old_hashes = stored['hashes']
+        except (OSError, KeyError, ValueError):
+            self.old_ids = np.zeros(0, dtype=np.int64)
+            self.old_hashes = np.zeros(0, dtype=np.uint64)
+        self.new_ids = []
+        self.new_hashes = []
+        self.changed = 0
+
+    def lookup(self, ids):
+        """Hash anterior de cada ID y máscara de los que existían"""
+        if len(self.old_ids) == 0:
+            return np.zeros(len(ids), dtype=np.uint64), np.zeros(len(ids), dtype=bool)
+        pos = np.minimum(np.searchsorted(self.old_ids, ids), len(self.old_ids) - 1)
+        found = self.old_ids[pos] == ids
+        return self.old_hashes[pos], found
+
+    def diff(self, ids, hashes):
+        """Máscara de filas nuevas o modificadas respecto al snapshot anterior"""
+        ids = np.asarray(ids, dtype=np.int64)
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        self.new_ids.append(ids)
+        self.new_hashes.append(hashes)
+
+        old_hashes, found = self.lookup(ids)
+        changed = ~found | (old_hashes != hashes)
+        self.changed += int(changed.sum())
+        return changed
+
+    def current(self):
+        ids = np.concatenate(self.new_ids) if self.new_ids else np.zeros(0, dtype=np.int64)
+        hashes = np.concatenate(self.new_hashes) if self.new_hashes else np.zeros(0, dtype=np.uint64)
+        order = np.argsort(ids, kind='stable')
+        return ids[order], hashes[order]
+
+    def removed(self):
+        """IDs del snapshot anterior que no aparecen en el nuevo"""
+        ids, _ = self.current()
+        return np.setdiff1d(self.old_ids, ids, assume_unique=False)
+
+    def save(self):
+        ids, hashes = self.current()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, ids=ids, hashes=hashes)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,92 @@
+import gzip
+import io
+import itertools
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+
+# Lectura directa de los dumps *.tsv.gz de IMDB: un hilo descomprime bloques de
+# `chunksize` líneas, un pool parsea cada bloque y el consumidor (inserts en la
+# base) recibe los chunks en orden mientras se preparan los siguientes
+
+GZ_PARSE_WORKERS = 2
+GZ_QUEUE_SIZE = 4
+
+_END = object()
+
+
+def decompress_blocks(file_path, chunksize, skip_lines, blocks, stop):
+    """Hilo descompresor: pone (encabezado, bloque) en la cola acotada"""
+    def put(item):
+        while not stop.is_set():
+            try:
+                blocks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    try:
+        with gzip.open(file_path, 'rb') as f:
+            header = f.readline()
+            # Las filas ya procesadas (reanudación) se descartan sin parsear
+            for _ in itertools.islice(f, skip_lines):
+                pass
+            while True:
+                lines = list(itertools.islice(f, chunksize))
+                if not lines or not put((header, b''.join(lines))):
+                    break
+        put(_END)
+    except Exception as e:
+        put(e)
+
+
+def parse_block(header, block, read_params):
+    return pd.read_csv(io.BytesIO(header + block), **read_params)
+
+
+def read_gzip_chunks(file_path, read_params, chunksize, skip_lines=0,
+                     workers=GZ_PARSE_WORKERS, queue_size=GZ_QUEUE_SIZE):
+    """Iterador de DataFrames de `chunksize` filas de un .tsv.gz, en orden
+
+    read_params son los mismos de pd.read_csv (sin chunksize ni skiprows). El
+    índice continúa entre chunks igual que en read_csv(chunksize=...).
+    """
+    blocks = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=decompress_blocks, args=(file_path, chunksize, skip_lines, blocks, stop), daemon=True
+    )
+    thread.start()
+
+    pending = deque()
+    row = 0
+    finished = False
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            while True:
+                while not finished and len(pending) < workers:
+                    item = blocks.get()
+                    if item is _END:
+                        finished = True
+                    elif isinstance(item, Exception):
+                        raise item
+                    else:
+                        pending.append(executor.submit(parse_block, *item, read_params))
+
+                if not pending:
+                    break
+
+                df = pending.popleft().result()
+                df.index = pd.RangeIndex(row, row + len(df))
+                row += len(df)
+                yield df
+        finally:
+            # Si el consumidor se detiene antes, el hilo descompresor termina solo
+            stop.set()
+            for future in pending:
+                future.cancel()
+            thread.join()
@@ -1,42 +1,209 @@
 import pandas as pd
-import psycopg2
 from psycopg2.extras import execute_values
+import io
 import os
+import time
 import traceback
+from collections import deque
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from copy_stream import build_text_buffer
+from db_sinks import PostgresSink
+from transforms import (
+    extract_ids, valid_ids, years_to_dates, minutes_to_ints, parse_ints,
+    format_texts, truncate_texts, explode_list, split_characters, to_records
+)
+from catalog_map import CatalogMap
+from scan_planner import ScanTask, TSVScanPlanner
+from scheduler import PhaseScheduler
+from checkpoint import CheckpointJournal
+from delta import RowHashIndex, row_hashes, pair_keys, split_pair_keys
+from index_manager import IndexManager
+from staging import StagingSwap, STAGING_SCHEMA, wal_lsn, wal_bytes_since
+from tsv_cache import TSVCache
+from gz_reader import read_gzip_chunks, GZ_PARSE_WORKERS
+from range_parser import RangeTask, line_ranges, read_range, init_range_worker, parse_range
+from streaming import IdBitmap, RatingsIndex, RowSink
+from load_metrics import LoadMetrics, OTHER_STEP
+from writer_pool import WriterPool
+from batch_sizer import BatchSizer
+
+# Tamaño de chunk por archivo para el scan
+CHUNK_SIZES = {
+    'title.akas.tsv': 500000,
+    'title.principals.tsv': 1000000,
+}
+
+# Parámetros de pd.read_csv para los TSV de IMDB
+TSV_READ_PARAMS = {
+    'delimiter': '\t',
+    'dtype': str,
+    'na_values': ['\\N'],
+    'keep_default_na': False,
+    'encoding': 'utf-8',
+    'quoting': 3,
+    'low_memory': False,
+}
+
+# Refresh incremental: filas dependientes que se borran junto con cada entidad
+# (session_replication_role = 'replica' desactiva los FK, no hay ON DELETE CASCADE)
+DELTA_DELETES = {
+    'personas': [
+        ('top_profesiones', ['id_persona']),
+        ('personas_produccion', ['id_persona']),
+        ('personajes', ['persona_id']),
+        ('personas', ['id_persona']),
+    ],
+    'produccion': [
+        ('genero_produccion', ['id_produccion']),
+        ('nombres_titulos_atributos', ['id_titulo']),
+        ('nombres_produccion', ['id_produccion']),
+        ('personas_produccion', ['id_produccion']),
+        ('personajes', ['id_produccion']),
+        ('episodios', ['id_episodio']),
+        ('episodios', ['id_serie']),
+        ('produccion', ['id_titulo']),
+    ],
+    'nombres_produccion': [
+        ('nombres_titulos_atributos', ['id_titulo', 'orden']),
+        ('nombres_produccion', ['id_produccion', 'orden']),
+    ],
+}
 
 class IMDBDataLoader:
-    def __init__(self, db_config, tsv_path):
+    def __init__(self, db_config, tsv_path, copy_tables=None, copy_format='text', single_pass=True,
+                 workers=1, streaming=True, checkpoint_dir=None, delta_dir=None, manage_indexes=False,
+                 staging=False, search_path=None, cache_dir=None, parse_workers=GZ_PARSE_WORKERS,
+                 parse_processes=1, metrics_path=None, prometheus_path=None, set_based_updates=False,
+                 prejoin_ratings=False, writer_connections=1, adaptive_batches=False):
         self.db_config = db_config
         self.tsv_path = tsv_path
         self.connection = None
         
-        # Diccionarios para mapear IDs
-        self.profession_ids = {}
-        self.genre_ids = {}
-        self.titletype_ids = {}
+        # Si es True, load_all_data lee cada archivo una vez por fase (TSVScanPlanner)
+        self.single_pass = single_pass
+        # Con más de 1 worker, load_all_data usa PhaseScheduler (un proceso y conexión por worker)
+        self.workers = workers
+        # Si es True, personas/produccion/personas_produccion insertan cada chunk al leerlo
+        self.streaming = streaming
+        
+        # Catálogos para mapear IDs (búsqueda vectorizada por columna)
+        self.profession_ids = CatalogMap(normalize=format_texts)
+        self.genre_ids = CatalogMap(normalize=format_texts)
+        self.titletype_ids = CatalogMap()
+        # Atributos por clase ('Title attribute', 'Title types')
         self.attribute_ids = {}
+        
+        # Tablas que se cargan con COPY FROM STDIN: {tabla: 'text' | 'binary'}
+        if isinstance(copy_tables, dict):
+            self.copy_tables = dict(copy_tables)
+        else:
+            self.copy_tables = {table: copy_format for table in (copy_tables or [])}
+        
+        # Journal para reanudar una carga interrumpida (None = sin checkpoints)
+        self.checkpoint_dir = checkpoint_dir
+        self.journal = CheckpointJournal(checkpoint_dir) if checkpoint_dir else None
+        # Si es True, load_all_data elimina índices/FKs antes de cargar y los reconstruye al final
+        self.manage_indexes = manage_indexes
+        
+        # Si es True, load_all_data carga en tablas UNLOGGED de staging y las intercambia al final
+        self.staging = staging
+        # Cache columnar de los TSV parseados (None = leer siempre el TSV)
+        self.cache_dir = cache_dir
+        self.tsv_cache = TSVCache(cache_dir) if cache_dir else None
+        
+        # Hilos que parsean bloques de los .tsv.gz mientras otro hilo descomprime
+        self.parse_workers = parse_workers
+        # Con más de 1 proceso, personajes y title.akas se parsean por rangos de bytes en paralelo
+        self.parse_processes = parse_processes
+        
+        # Sidecars con hashes por fila del último snapshot (refresh_delta)
+        self.delta_dir = delta_dir
+        # Si es True, ratings y conocido_por se copian a tablas temporales y se aplican
+        # con un solo UPDATE ... FROM por tabla en lugar de UPDATEs por batch
+        self.set_based_updates = set_based_updates
+        # Si es True, load_produccion lee title.ratings antes e inserta votos y rating
+        # en cada fila; update_ratings no hace nada
+        self.prejoin_ratings = prejoin_ratings
+        
+        # Con más de 1 conexión, insert_fast encola los batches en un WriterPool y
+        # sigue con el siguiente chunk mientras los hilos escriben
+        self.writer_connections = writer_connections
+        self.writer_pool = None
+        # Si es True, insert_fast ignora batch_size: BatchSizer ajusta los bytes por batch
+        # de cada tabla hacia una duración objetivo (trayectoria en metrics.batches)
+        self.adaptive_batches = adaptive_batches
+        self.batch_sizer = BatchSizer() if adaptive_batches else None
+        
+        # Conexiones y escritura de batches (COPY / execute_values): db_sinks.py,
+        # compartido con la Fase 1
+        self.sink = PostgresSink(db_config, self.copy_tables, search_path, self.batch_sizer)
+        
+        # Batches que fallaron dos veces: (query, filas) para reintentar al final
+        self.retry_queue = []
+        # Loaders que no terminaron (error en un chunk, en el cierre o en un rango)
+        self.failed_steps = []
+        
+        # Métricas por loader; load_all_data escribe el reporte JSON en metrics_path
+        # y, si hay prometheus_path, el formato texto de Prometheus
+        self.metrics = LoadMetrics()
+        self.metrics_path = metrics_path
+        self.prometheus_path = prometheus_path
+
+    def worker_options(self):
+        """Opciones para crear el loader de cada worker de PhaseScheduler"""
+        return {
+            'copy_tables': self.copy_tables,
+            'streaming': self.streaming,
+            'checkpoint_dir': self.checkpoint_dir,
+            'delta_dir': self.delta_dir,
+            'search_path': self.search_path,
+            'cache_dir': self.cache_dir,
+            'parse_workers': self.parse_workers,
+            'parse_processes': self.parse_processes,
+            'set_based_updates': self.set_based_updates,
+            'prejoin_ratings': self.prejoin_ratings,
+            'writer_connections': self.writer_connections,
+            'adaptive_batches': self.adaptive_batches,
+        }
+
+    def catalog_state(self):
+        """Mapas de catálogos que necesitan los loaders de relaciones"""
+        return {
+            'profession_ids': self.profession_ids,
+            'genre_ids': self.genre_ids,
+            'titletype_ids': self.titletype_ids,
+            'attribute_ids': self.attribute_ids,
+        }
+
+    def set_catalog_state(self, state):
+        for name, values in state.items():
+            getattr(self, name).update(values)
+
+    def attribute_map(self, class_name):
+        """CatalogMap de atributos de una clase (los nombres se recortan a 200 chars)"""
+        if class_name not in self.attribute_ids:
+            self.attribute_ids[class_name] = CatalogMap(normalize=partial(truncate_texts, length=200))
+        return self.attribute_ids[class_name]
+
+    @property
+    def search_path(self):
+        """Esquema donde escriben las consultas sin esquema (load_all_data lo fija en staging)"""
+        return self.sink.search_path
+
+    @search_path.setter
+    def search_path(self, value):
+        self.sink.search_path = value
+
+    def open_connection(self):
+        """Conexión configurada para carga masiva (principal o de un hilo de WriterPool)"""
+        return self.sink.open_connection()
 
     def connect_db(self):
         """Conexión optimizada para PostgreSQL"""
         try:
-            self.connection = psycopg2.connect(
-                **self.db_config,
-                keepalives=1,
-                keepalives_idle=30,
-                keepalives_interval=10,
-                keepalives_count=5
-            )
-            self.connection.autocommit = False
-            
-            cursor = self.connection.cursor()
-            # 🔧 DESACTIVAR CONSTRAINTS Y TRIGGERS PARA CARGA MASIVA
-            cursor.execute("SET session_replication_role = 'replica';")
-            cursor.execute("SET maintenance_work_mem = '1GB';")
-            cursor.execute("SET work_mem = '256MB';")
-            cursor.execute("SET synchronous_commit = OFF;")
-            cursor.close()
-            
+            self.connection = self.open_connection()
             print("✅ Conectado a PostgreSQL")
             
         except Exception as e:
@@ -46,91 +213,224 @@ class IMDBDataLoader:
     def keep_alive(self):
         """Mantiene la conexión activa"""
         try:
-            if self.connection and not self.connection.closed:
-                cursor = self.connection.cursor()
-                cursor.execute("SELECT 1")
-                cursor.fetchone()
-                cursor.close()
-            else:
+            if not (self.connection and self.sink.is_alive(self.connection)):
                 self.connect_db()
         except:
             self.connect_db()
 
     def disconnect_db(self):
         """Cierra la conexión y reactiva constraints"""
+        self.close_writer_pool()
         if self.connection and not self.connection.closed:
             try:
-                cursor = self.connection.cursor()
                 print("\n🔄 Reactivando constraints...")
-                cursor.execute("SET session_replication_role = 'origin';")
-                cursor.execute("SET synchronous_commit = ON;")
-                self.connection.commit()
-                cursor.close()
-                self.connection.close()
+                self.sink.close_connection(self.connection)
                 print("✅ Desconectado de PostgreSQL")
             except Exception as e:
                 print(f"⚠️  Error al cerrar: {e}")
 
+    def write_batch(self, target, batch, connection=None):
+        """Escribe y confirma un batch con el sink en `connection` o la principal"""
+        if connection is None:
+            if self.connection is None or self.connection.closed:
+                self.connect_db()
+            connection = self.connection
+        self.sink.write_batch(connection, target, batch)
+
+    def write_sized(self, target, batch, connection=None):
+        """write_batch midiendo la duración del batch para BatchSizer"""
+        start = time.perf_counter()
+        self.write_batch(target, batch, connection)
+        if self.batch_sizer:
+            seconds = time.perf_counter() - start
+            size = self.sink.observe(target[0], batch, seconds)
+            self.metrics.add_batch(target[0], len(batch), size, seconds)
+
+    def pool_write(self, connection, query, target, batch):
+        self.write_sized(target, batch, connection)
+
+    def flush_writes(self):
+        """Espera a que WriterPool confirme los batches en cola
+
+        Se llama antes de cualquier consulta de la conexión principal que lea o
+        modifique tablas cargadas con insert_fast (UPDATEs, merge de crew, borrados).
+        """
+        if not self.writer_pool:
+            return
+        
+        with self.metrics.timed('insert_seconds'):
+            inserted, failed = self.writer_pool.flush()
+        for step, rows in inserted.items():
+            self.metrics.stats(step)['rows_inserted'] += rows
+        for step, query, batch, error in failed:
+            print(f"⚠️  Batch en cola de reintentos: {error}")
+            self.queue_failed(query, batch)
+        
+        if inserted:
+            print(f"✅ Total insertado ({self.writer_connections} conexiones): {sum(inserted.values()):,} registros")
+
+    def close_writer_pool(self):
+        if self.writer_pool:
+            self.flush_writes()
+            self.writer_pool.close()
+            self.writer_pool = None
+
+    def queue_failed(self, query, batch):
+        """Guarda un batch fallido en la cola de reintentos (journal si hay checkpoints)"""
+        if self.journal:
+            self.journal.queue_failed(query, batch)
+        else:
+            self.retry_queue.append((query, batch))
+
     def insert_fast(self, query, data, batch_size=10000):
-        """Inserción masiva optimizada con execute_values"""
+        """Inserción masiva optimizada con execute_values o COPY"""
+        self.metrics.count('rows_produced', len(data))
+        if self.journal:
+            # Al reanudar, las filas ya confirmadas del chunk no se reinsertan
+            data = data[self.journal.take_skip(len(data)):]
+        
         if not data:
             return
             
         total_inserted = 0
         
-        for i in range(0, len(data), batch_size):
-            batch = data[i:i + batch_size]
-            
+        target = self.sink.target(query)
+        
+        if self.writer_connections > 1:
+            self.submit_writes(query, target, data, batch_size)
+            return
+        
+        for i, batch in self.sink.batches(target[0], data, batch_size):
             try:
-                self.keep_alive()
-                cursor = self.connection.cursor()
-                
-                execute_values(cursor, query, batch, page_size=batch_size)
-                
-                self.connection.commit()
-                cursor.close()
-                
+                with self.metrics.timed('insert_seconds'):
+                    self.write_sized(target, batch)
                 total_inserted += len(batch)
                 
-                if total_inserted % 100000 == 0:
+                # Con batches adaptativos el total no cae justo en múltiplos de 100,000
+                if total_inserted // 100000 > (total_inserted - len(batch)) // 100000:
                     print(f"  → {total_inserted:,} registros insertados...")
                     
             except Exception as e:
                 print(f"⚠️  Error en batch {i}: {e}")
-                self.connection.rollback()
+                try:
+                    self.connection.rollback()
+                except Exception:
+                    pass
+                
+                # Un reintento con conexión nueva; si vuelve a fallar va a la cola
                 try:
                     self.connect_db()
-                except:
-                    continue
+                    with self.metrics.timed('insert_seconds'):
+                        self.write_batch(target, batch)
+                    total_inserted += len(batch)
+                except Exception as retry_error:
+                    print(f"⚠️  Batch {i} en cola de reintentos: {retry_error}")
+                    self.queue_failed(query, batch)
+            
+            if self.journal:
+                self.journal.record_rows(len(batch))
         
+        self.metrics.count('rows_inserted', total_inserted)
         print(f"✅ Total insertado: {total_inserted:,} registros")
 
-    def read_tsv_safely(self, file_path, usecols=None, chunksize=None):
-        """Lectura segura de archivos TSV"""
+    def submit_writes(self, query, target, data, batch_size):
+        """Encola los batches en WriterPool; las filas se cuentan al confirmarse (flush_writes)"""
+        if self.writer_pool is None:
+            self.writer_pool = WriterPool(self.open_connection, self.pool_write, self.writer_connections)
+        
+        step = self.metrics.current or OTHER_STEP
+        # Sin ON CONFLICT la tabla no tiene clave de carga (id SERIAL): un solo hilo
+        # conserva el orden de inserción y los IDs generados
+        ordered = not target[2]
+        for _, batch in self.sink.batches(target[0], data, batch_size):
+            # Solo cuenta como escritura el tiempo bloqueado con las colas llenas
+            with self.metrics.timed('insert_seconds'):
+                self.writer_pool.submit(step, query, target, batch, ordered)
+        
+        if self.journal:
+            # El journal solo registra filas confirmadas: el chunk espera a sus batches
+            self.flush_writes()
+            self.journal.record_rows(len(data))
+
+    def retry_failed_batches(self):
+        """Reintenta los batches en cola; los que vuelven a fallar quedan en cola"""
+        self.flush_writes()
+        failed = self.retry_queue
+        self.retry_queue = []
+        if self.journal:
+            failed += self.journal.pop_failed()
+        
+        if not failed:
+            return
+        
+        print(f"\n🔁 Reintentando {len(failed):,} batches fallidos...")
+        recovered = 0
+        
+        for query, batch in failed:
+            try:
+                with self.metrics.timed('insert_seconds'):
+                    self.write_batch(self.sink.target(query), batch)
+                recovered += len(batch)
+            except Exception as e:
+                print(f"⚠️  Batch sigue fallando: {e}")
+                try:
+                    self.connection.rollback()
+                except Exception:
+                    pass
+                self.queue_failed(query, batch)
+        
+        self.metrics.count('rows_inserted', recovered)
+        print(f"✅ Total recuperado: {recovered:,} registros")
+
+    def read_tsv_safely(self, file_path, usecols=None, chunksize=None, skiprows=None):
+        """Lectura segura de archivos TSV (o del .tsv.gz de IMDB sin descomprimir)"""
         try:
+            if not os.path.exists(file_path) and os.path.exists(file_path + '.gz'):
+                file_path += '.gz'
+            
             if not os.path.exists(file_path):
                 print(f"⚠️  Archivo no encontrado: {file_path}")
                 return None
                 
             print(f"📖 Leyendo: {os.path.basename(file_path)}")
+            
+            if self.tsv_cache:
+                cached = self.tsv_cache.open(file_path)
+                if cached:
+                    print(f"  ⚡ Desde cache columnar ({cached.rows:,} filas)")
+                    start = len(skiprows) if skiprows else 0
+                    if chunksize:
+                        return cached.chunks(chunksize, start, usecols)
+                    return cached.frame(start, cached.rows, usecols)
+            
+            # El cache se construye con todas las columnas en la primera lectura completa
+            build_cache = self.tsv_cache is not None and not skiprows
 
-            read_params = {
-                'delimiter': '\t',
-                'dtype': str,
-                'na_values': ['\\N'],
-                'keep_default_na': False,
-                'encoding': 'utf-8',
-                'quoting': 3,
-                'low_memory': False,
-            }
-            
-            if usecols:
+            read_params = dict(TSV_READ_PARAMS)
+            
+            if usecols and not build_cache:
                 read_params['usecols'] = usecols
                 
-            if chunksize:
-                read_params['chunksize'] = chunksize
+            if file_path.endswith('.gz') and chunksize:
+                # Descompresión y parseo en paralelo con los inserts
+                df = read_gzip_chunks(
+                    file_path, read_params, chunksize,
+                    skip_lines=len(skiprows) if skiprows else 0, workers=self.parse_workers
+                )
+            else:
+                if chunksize:
+                    read_params['chunksize'] = chunksize
                 
-            df = pd.read_csv(file_path, **read_params)
+                if skiprows:
+                    read_params['skiprows'] = skiprows
+                    
+                df = pd.read_csv(file_path, **read_params)
+            
+            if build_cache:
+                if isinstance(df, pd.DataFrame):
+                    df = list(self.tsv_cache.build_through(file_path, [df], usecols))[0]
+                else:
+                    df = self.tsv_cache.build_through(file_path, df, usecols)
             
             if isinstance(df, pd.DataFrame):
                 print(f"  → {len(df):,} filas leídas")
@@ -177,70 +477,205 @@ class IMDBDataLoader:
             return None
 
     # ==========================================
-    # CARGA DE CATÁLOGOS
+    # SCAN DE ARCHIVOS
     # ==========================================
 
-    def load_professions(self):
-        """Carga profesiones con IDs secuenciales"""
-        print("\n📋 Cargando PROFESIONES...")
-        professions = set()
+    def scan(self, *tasks, checkpoint=True):
+        """Ejecuta uno o varios ScanTask leyendo cada archivo una sola vez
+
+        Los RangeTask se cargan después del scan, cuando ya están las entidades
+        que referencian.
+        """
+        journal = self.journal if checkpoint else None
+        # None = tarea desactivada por la configuración (p.ej. ratings con prejoin_ratings)
+        tasks = [task for task in tasks if task is not None]
+        scan_tasks = [task for task in tasks if not isinstance(task, RangeTask)]
+        if scan_tasks:
+            planner = TSVScanPlanner(self.read_tsv_safely, self.tsv_path, CHUNK_SIZES, journal, self.metrics)
+            planner.register(*scan_tasks)
+            planner.run()
+            self.failed_steps.extend(planner.failed)
         
-        try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/name.basics.tsv", usecols=['primaryProfession'])
-            if df is not None:
-                for profs in df['primaryProfession'].dropna():
-                    if profs != '\\N':
-                        for p in profs.split(','):
-                            if p.strip():
-                                professions.add(self.format_text(p.strip()))
-        except:
-            pass
+        for task in tasks:
+            if isinstance(task, RangeTask):
+                with self.metrics.step(task.key):
+                    self.copy_ranges(task, journal)
+        self.flush_writes()
+
+    # ==========================================
+    # PARSEO MULTIPROCESO POR RANGOS
+    # ==========================================
+
+    def range_task(self, name, key, file_name, usecols, builder, query):
+        """RangeTask si hay procesos de parseo y el TSV está sin comprimir, si no None
+
+        Un .tsv.gz no se puede dividir por bytes: en ese caso se usa el ScanTask.
+        """
+        if self.parse_processes > 1 and os.path.exists(os.path.join(self.tsv_path, file_name)):
+            return RangeTask(name, key, file_name, usecols, builder, query)
+        return None
+
+    def write_range(self, target, payload, copy_format):
+        """COPY y commit del buffer de un rango; un reintento con conexión nueva"""
+        for attempt in range(2):
+            try:
+                if attempt:
+                    self.connect_db()
+                self.keep_alive()
+                cursor = self.connection.cursor()
+                self.sink.copy_buffer(cursor, target, io.BytesIO(payload), copy_format)
+                self.connection.commit()
+                cursor.close()
+                return True
+            except Exception as e:
+                print(f"⚠️  Error en COPY del rango: {e}")
+                try:
+                    self.connection.rollback()
+                except Exception:
+                    pass
+        return False
+
+    def copy_ranges(self, task, journal=None):
+        """Carga un RangeTask: procesos parsean rangos de bytes y el principal hace COPY en orden"""
+        if journal and journal.is_done(task.key):
+            print(f"  ⏭️  {task.name} ya completado (checkpoint)")
+            return
         
-        try:
-            chunk_iterator = self.read_tsv_safely(
-                f"{self.tsv_path}/title.principals.tsv", 
-                usecols=['category'], 
-                chunksize=1000000
-            )
-            if chunk_iterator is not None:
-                for df_chunk in chunk_iterator:
-                    for cat in df_chunk['category'].dropna().unique():
-                        if cat != '\\N':
-                            professions.add(self.format_text(cat))
-        except:
-            pass
+        file_path = os.path.join(self.tsv_path, task.file_name)
+        header, ranges = line_ranges(file_path)
+        print(f"📖 Leyendo: {task.file_name} → {task.name} ({len(ranges)} rangos, {self.parse_processes} procesos)")
+        self.metrics.add_file(task.file_name, file_path, [task.key])
         
-        data = []
-        prof_id = 1
+        # Progreso por rango, separado del progreso por chunks del mismo archivo
+        progress_name = f"{task.file_name}@{len(ranges)}"
+        first = journal.file_progress(task.key, progress_name)['chunks'] if journal else 0
+        if first:
+            print(f"  ⏩ {task.file_name}: reanudando desde el rango {first}")
         
-        for prof in sorted(professions):
-            if prof:
-                self.profession_ids[prof] = prof_id
-                data.append((prof_id, prof))
-                prof_id += 1
+        target = self.sink.target(task.query)
+        self.flush_writes()
+        self.keep_alive()
+        cursor = self.connection.cursor()
+        type_names = self.sink.copy_types(cursor, target)
+        cursor.close()
+        copy_format = 'binary' if type_names else 'text'
         
-        query = """
-            INSERT INTO profesiones (id_profesion, profesion) 
-            VALUES %s 
-            ON CONFLICT (id_profesion) DO NOTHING
-        """
-        self.insert_fast(query, data)
+        total_inserted = 0
+        completed = True
+        pending = deque()
+        indexes = iter(range(first, len(ranges)))
+        
+        with ProcessPoolExecutor(
+            max_workers=self.parse_processes,
+            initializer=init_range_worker,
+            initargs=(self.tsv_path, self.catalog_state())
+        ) as executor:
+            def submit_next():
+                for index in indexes:
+                    start, end = ranges[index]
+                    pending.append((index, executor.submit(
+                        parse_range, file_path, header, start, end, task, TSV_READ_PARAMS, type_names
+                    )))
+                    return
+            
+            # Hasta 2 rangos por proceso se parsean por delante del COPY
+            for _ in range(self.parse_processes * 2):
+                submit_next()
+            
+            try:
+                while pending:
+                    index, future = pending.popleft()
+                    with self.metrics.timed('parse_seconds'):
+                        payload, rows = future.result()
+                    submit_next()
+                    self.metrics.count('rows_produced', rows)
+                    
+                    if journal:
+                        journal.start_chunk(task.key, progress_name, index)
+                    with self.metrics.timed('insert_seconds'):
+                        written = self.write_range(target, payload, copy_format)
+                    if written:
+                        total_inserted += rows
+                    else:
+                        # Las filas del rango van a la cola de reintentos como batches normales
+                        df = read_range(file_path, header, *ranges[index], task.usecols, TSV_READ_PARAMS)
+                        data = getattr(self, task.builder)(df)
+                        for i in range(0, len(data), 10000):
+                            self.queue_failed(task.query, data[i:i + 10000])
+                        print(f"⚠️  Rango {index + 1} en cola de reintentos")
+                    if journal:
+                        journal.record_rows(rows)
+                        journal.finish_chunk()
+                    
+                    print(f"  → rango {index + 1}/{len(ranges)}: {total_inserted:,} registros insertados...")
+            except Exception as e:
+                print(f"⚠️  Error en {task.name} ({task.file_name}): {e}")
+                completed = False
+                if journal:
+                    journal.position = None
+                for _, future in pending:
+                    future.cancel()
+        
+        self.metrics.count('rows_inserted', total_inserted)
+        print(f"✅ Total insertado: {total_inserted:,} registros")
+        if not completed:
+            self.failed_steps.append(task.key)
+        elif journal:
+            journal.mark_done(task.key)
 
-    def load_genres(self):
-        """Carga géneros"""
-        print("\n🎭 Cargando GÉNEROS...")
-        try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/title.basics.tsv", usecols=['genres'])
-            if df is None:
-                return
+    # ==========================================
+    # CARGA DE CATÁLOGOS
+    # ==========================================
+
+    def professions_task(self):
+        """Profesiones de name.basics y categorías de title.principals"""
+        professions = set()
+        
+        def collect_professions(df):
+            profs = explode_list(df['primaryProfession'])['value']
+            professions.update(format_texts(profs.drop_duplicates()).dropna().tolist())
+        
+        def collect_categories(df):
+            cats = pd.Series(df['category'].dropna().unique())
+            professions.update(format_texts(cats).dropna().tolist())
+        
+        def finish():
+            data = []
+            prof_id = 1
             
-            genres = set()
-            for genre_list in df['genres'].dropna():
-                if genre_list != '\\N':
-                    for g in genre_list.split(','):
-                        if g.strip():
-                            genres.add(self.format_text(g.strip()))
+            for prof in sorted(professions):
+                if prof:
+                    self.profession_ids[prof] = prof_id
+                    data.append((prof_id, prof))
+                    prof_id += 1
             
+            query = """
+                INSERT INTO profesiones (id_profesion, profesion) 
+                VALUES %s 
+                ON CONFLICT (id_profesion) DO NOTHING
+            """
+            self.insert_fast(query, data)
+        
+        return (
+            ScanTask('📋 PROFESIONES', finish, 'load_professions')
+            .consume('name.basics.tsv', collect_professions, ['primaryProfession'], checkpoint=False)
+            .consume('title.principals.tsv', collect_categories, ['category'], checkpoint=False)
+        )
+
+    def load_professions(self):
+        """Carga profesiones con IDs secuenciales"""
+        print("\n📋 Cargando PROFESIONES...")
+        self.scan(self.professions_task())
+
+    def genres_task(self):
+        """Géneros de title.basics"""
+        genres = set()
+        
+        def collect(df):
+            values = explode_list(df['genres'])['value']
+            genres.update(format_texts(values.drop_duplicates()).dropna().tolist())
+        
+        def finish():
             data = []
             genre_id = 1
             
@@ -256,23 +691,28 @@ class IMDBDataLoader:
                 ON CONFLICT (id_genero) DO NOTHING
             """
             self.insert_fast(query, data)
-        except Exception as e:
-            print(f"⚠️  Error en géneros: {e}")
+        
+        return ScanTask('🎭 GÉNEROS', finish, 'load_genres').consume(
+            'title.basics.tsv', collect, ['genres'], checkpoint=False
+        )
 
-    def load_title_types(self):
-        """Carga tipos de producción"""
-        print("\n🎬 Cargando TIPOS DE PRODUCCIÓN...")
-        try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/title.basics.tsv", usecols=['titleType'])
-            if df is None:
-                return
-            
-            types = set(df['titleType'].dropna().unique())
+    def load_genres(self):
+        """Carga géneros"""
+        print("\n🎭 Cargando GÉNEROS...")
+        self.scan(self.genres_task())
+
+    def title_types_task(self):
+        """Tipos de producción de title.basics"""
+        types = set()
+        
+        def collect(df):
+            types.update(df['titleType'].dropna().unique().tolist())
+        
+        def finish():
             types.discard('\\N')
             types.add('Unknown')
             
             data = []
-            type_id = 0
             
             self.titletype_ids['Unknown'] = 0
             data.append((0, 'Unknown'))
@@ -290,163 +730,102 @@ class IMDBDataLoader:
                 ON CONFLICT (id_tipo_produccion) DO NOTHING
             """
             self.insert_fast(query, data)
-        except Exception as e:
-            print(f"⚠️  Error en tipos: {e}")
+        
+        return ScanTask('🎬 TIPOS DE PRODUCCIÓN', finish, 'load_title_types').consume(
+            'title.basics.tsv', collect, ['titleType'], checkpoint=False
+        )
 
-    def load_attributes(self):
-        """Carga atributos (🔧 LIMITADO A 200 caracteres)"""
-        print("\n🏷️  Cargando ATRIBUTOS...")
+    def load_title_types(self):
+        """Carga tipos de producción"""
+        print("\n🎬 Cargando TIPOS DE PRODUCCIÓN...")
+        self.scan(self.title_types_task())
+
+    def attributes_task(self):
+        """Atributos y tipos de title.akas (🔧 LIMITADO A 200 caracteres)"""
         attributes = set()
         
-        try:
-            chunk_iterator = self.read_tsv_safely(
-                f"{self.tsv_path}/title.akas.tsv", 
-                usecols=['attributes', 'types'], 
-                chunksize=1000000
-            )
-            if chunk_iterator is not None:
-                for df_chunk in chunk_iterator:
-                    for attr_str in df_chunk['attributes'].dropna():
-                        if attr_str != '\\N':
-                            try:
-                                for attr in str(attr_str).replace('\x02', '|').split('|'):
-                                    if attr.strip():
-                                        attributes.add(('Title attribute', attr.strip()[:200]))
-                            except:
-                                continue
-                    
-                    for type_str in df_chunk['types'].dropna():
-                        if type_str != '\\N':
-                            try:
-                                for t in str(type_str).replace('\x02', '|').split('|'):
-                                    if t.strip() and t.strip() not in ['imdbDisplay', 'original']:
-                                        attributes.add(('Title types', t.strip()[:200]))
-                            except:
-                                continue
-        except Exception as e:
-            print(f"⚠️  Error en atributos: {e}")
-        
-        data = []
-        attr_id = 1
+        def collect(df):
+            attrs = explode_list(df['attributes'].str.replace('\x02', '|', regex=False), sep='|')['value']
+            attributes.update(('Title attribute', a) for a in attrs.str.slice(0, 200).unique().tolist())
+            
+            types = explode_list(df['types'].str.replace('\x02', '|', regex=False), sep='|')['value']
+            types = types[~types.isin(['imdbDisplay', 'original'])]
+            attributes.update(('Title types', t) for t in types.str.slice(0, 200).unique().tolist())
         
-        for class_name, attribute in sorted(attributes):
-            self.attribute_ids[(class_name, attribute)] = attr_id
-            data.append((attr_id, class_name, attribute))
-            attr_id += 1
+        def finish():
+            data = []
+            attr_id = 1
+            
+            for class_name, attribute in sorted(attributes):
+                self.attribute_map(class_name)[attribute] = attr_id
+                data.append((attr_id, class_name, attribute))
+                attr_id += 1
+            
+            query = """
+                INSERT INTO atributos (id_atributo, class, atributo) 
+                VALUES %s 
+                ON CONFLICT (id_atributo) DO NOTHING
+            """
+            self.insert_fast(query, data)
         
-        query = """
-            INSERT INTO atributos (id_atributo, class, atributo) 
-            VALUES %s 
-            ON CONFLICT (id_atributo) DO NOTHING
-        """
-        self.insert_fast(query, data)
+        return ScanTask('🏷️  ATRIBUTOS', finish, 'load_attributes').consume(
+            'title.akas.tsv', collect, ['attributes', 'types'], checkpoint=False
+        )
+
+    def load_attributes(self):
+        """Carga atributos (🔧 LIMITADO A 200 caracteres)"""
+        print("\n🏷️  Cargando ATRIBUTOS...")
+        self.scan(self.attributes_task())
 
     # ==========================================
     # CARGA DE ENTIDADES PRINCIPALES
     # ==========================================
 
-    def load_personas(self):
-        """Carga personas (🔧 VARCHAR(200))"""
-        print("\n👥 Cargando PERSONAS...")
-        personas_data = []
-        existing_ids = set()
-        
-        try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/name.basics.tsv")
-            if df is not None:
-                for _, row in df.iterrows():
-                    person_id = self.extract_id(row.get('nconst'))
-                    if person_id:
-                        birth = self.year_to_date(row.get('birthYear'))
-                        death = self.year_to_date(row.get('deathYear'), True)
-                        name = str(row.get('primaryName', 'Unknown'))[:200] if pd.notna(row.get('primaryName')) else 'Unknown'
-                        
-                        personas_data.append((person_id, name, birth, death))
-                        existing_ids.add(person_id)
-        except Exception as e:
-            print(f"⚠️  Error en name.basics: {e}")
-        
-        try:
-            chunk_iterator = self.read_tsv_safely(
-                f"{self.tsv_path}/title.principals.tsv", 
-                usecols=['nconst'], 
-                chunksize=1000000
-            )
-            if chunk_iterator is not None:
-                for df_chunk in chunk_iterator:
-                    for _, row in df_chunk.iterrows():
-                        person_id = self.extract_id(row.get('nconst'))
-                        if person_id and person_id not in existing_ids:
-                            personas_data.append((person_id, 'Unknown', None, None))
-                            existing_ids.add(person_id)
-        except Exception as e:
-            print(f"⚠️  Error en principals: {e}")
-        
+    def personas_task(self):
+        """Personas de name.basics más las que solo aparecen en title.principals"""
         query = """
             INSERT INTO personas (id_persona, nombre, ahno_nacimiento, ahno_muerte) 
             VALUES %s 
             ON CONFLICT (id_persona) DO NOTHING
         """
-        self.insert_fast(query, personas_data, batch_size=50000)
-
-    def load_produccion(self):
-        """Carga producciones (🔧 minutos_duracion como INT)"""
-        print("\n🎥 Cargando PRODUCCIÓN...")
-        produccion_data = []
-        existing_ids = set()
-        
-        try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/title.basics.tsv")
-            if df is not None:
-                for _, row in df.iterrows():
-                    title_id = self.extract_id(row.get('tconst'))
-                    if title_id:
-                        type_id = self.titletype_ids.get(row.get('titleType'), 0)
-                        start_date = self.year_to_date(row.get('startYear'))
-                        end_date = self.year_to_date(row.get('endYear'), True)
-                        runtime = self.minutes_to_int(row.get('runtimeMinutes'))  # 🔧 INT
-                        is_adult = True if row.get('isAdult') == '1' else False
-                        
-                        produccion_data.append((
-                            title_id, type_id, is_adult, start_date, 
-                            end_date, runtime, None, None
-                        ))
-                        existing_ids.add(title_id)
-        except Exception as e:
-            print(f"⚠️  Error en title.basics: {e}")
+        sink = RowSink(self, query, batch_size=50000, streaming=self.streaming)
+        existing_ids = IdBitmap()
         
-        try:
-            chunk_iterator = self.read_tsv_safely(
-                f"{self.tsv_path}/title.akas.tsv", 
-                usecols=['titleId'], 
-                chunksize=1000000
-            )
-            if chunk_iterator is not None:
-                for df_chunk in chunk_iterator:
-                    for _, row in df_chunk.iterrows():
-                        title_id = self.extract_id(row.get('titleId'))
-                        if title_id and title_id not in existing_ids:
-                            produccion_data.append((title_id, 0, False, None, None, None, None, None))
-                            existing_ids.add(title_id)
-        except Exception as e:
-            print(f"⚠️  Error en title.akas: {e}")
+        def collect_names(df):
+            ids = extract_ids(df['nconst'])
+            df = df[valid_ids(ids)]
+            ids = ids.loc[df.index]
+            
+            sink.add(self.persona_records(df, ids))
+            existing_ids.add(ids.to_numpy(dtype='int64'))
         
-        try:
-            chunk_iterator = self.read_tsv_safely(
-                f"{self.tsv_path}/title.principals.tsv", 
-                usecols=['tconst'], 
-                chunksize=1000000
-            )
-            if chunk_iterator is not None:
-                for df_chunk in chunk_iterator:
-                    for _, row in df_chunk.iterrows():
-                        title_id = self.extract_id(row.get('tconst'))
-                        if title_id and title_id not in existing_ids:
-                            produccion_data.append((title_id, 0, False, None, None, None, None, None))
-                            existing_ids.add(title_id)
-        except Exception as e:
-            print(f"⚠️  Error en title.principals: {e}")
+        def collect_principals(df):
+            ids = extract_ids(df['nconst'])
+            new_ids = existing_ids.add_new(ids[valid_ids(ids)].to_numpy(dtype='int64'))
+            
+            sink.add([(i, 'Unknown', None, None) for i in new_ids.tolist()])
         
+        return (
+            ScanTask('👥 PERSONAS', sink.close, 'load_personas')
+            .consume('name.basics.tsv', collect_names, ['nconst', 'primaryName', 'birthYear', 'deathYear'],
+                     checkpoint=self.streaming)
+            .consume('title.principals.tsv', collect_principals, ['nconst'], checkpoint=self.streaming)
+        )
+
+    def persona_records(self, df, ids):
+        """Filas de personas a partir de name.basics (ids alineados con df)"""
+        birth = years_to_dates(df['birthYear'])
+        death = years_to_dates(df['deathYear'], True)
+        name = df['primaryName'].fillna('Unknown').astype(str).str.slice(0, 200)
+        return to_records(ids, name, birth, death)
+
+    def load_personas(self):
+        """Carga personas (🔧 VARCHAR(200))"""
+        print("\n👥 Cargando PERSONAS...")
+        self.scan(self.personas_task())
+
+    def produccion_task(self):
+        """Producciones de title.basics más las que solo aparecen en akas/principals"""
         query = """
             INSERT INTO produccion 
             (id_titulo, id_tipo_titulo, adultos, ahno_inicio, ahno_finalizacion, 
@@ -454,33 +833,117 @@ class IMDBDataLoader:
             VALUES %s
             ON CONFLICT (id_titulo) DO NOTHING
         """
-        self.insert_fast(query, produccion_data, batch_size=50000)
+        sink = RowSink(self, query, batch_size=50000, streaming=self.streaming)
+        existing_ids = IdBitmap()
+        # Se lee en el primer chunk, dentro del paso load_produccion (métricas y checkpoints)
+        ratings = [None]
+        
+        def ratings_index():
+            if self.prejoin_ratings and ratings[0] is None:
+                ratings[0] = self.read_ratings_index()
+            return ratings[0]
+        
+        def collect_basics(df):
+            ids = extract_ids(df['tconst'])
+            df = df[valid_ids(ids)]
+            ids = ids.loc[df.index]
+            
+            sink.add(self.produccion_records(df, ids, ratings_index()))
+            existing_ids.add(ids.to_numpy(dtype='int64'))
+        
+        def collect_missing(column):
+            def collect(df):
+                ids = extract_ids(df[column])
+                new_ids = existing_ids.add_new(ids[valid_ids(ids)].to_numpy(dtype='int64'))
+                
+                empty = [None] * len(new_ids)
+                votes, rating = self.rating_columns(pd.Series(new_ids), ratings_index())
+                sink.add(to_records(
+                    new_ids.tolist(), [0] * len(new_ids), [False] * len(new_ids),
+                    empty, empty, empty, votes, rating
+                ))
+            return collect
+        
+        return (
+            ScanTask('🎥 PRODUCCIÓN', sink.close, 'load_produccion')
+            .consume('title.basics.tsv', collect_basics, [
+                'tconst', 'titleType', 'isAdult', 'startYear', 'endYear', 'runtimeMinutes'
+            ], checkpoint=self.streaming)
+            .consume('title.akas.tsv', collect_missing('titleId'), ['titleId'], checkpoint=self.streaming)
+            .consume('title.principals.tsv', collect_missing('tconst'), ['tconst'], checkpoint=self.streaming)
+        )
+
+    def produccion_records(self, df, ids, ratings=None):
+        """Filas de produccion a partir de title.basics (votos y rating de `ratings` o vacíos)"""
+        type_id = self.titletype_ids.lookup(df['titleType']).fillna(0).astype(int)
+        start_date = years_to_dates(df['startYear'])
+        end_date = years_to_dates(df['endYear'], True)
+        runtime = minutes_to_ints(df['runtimeMinutes'])  # 🔧 INT
+        is_adult = (df['isAdult'] == '1').fillna(False).astype(bool)
+        votes, rating = self.rating_columns(ids, ratings)
+        
+        return to_records(
+            ids, type_id, is_adult, start_date,
+            end_date, runtime, votes, rating
+        )
+
+    def rating_columns(self, ids, ratings=None):
+        """Columnas votos y rating (NA sin dato) de cada ID según un RatingsIndex"""
+        if ratings is None:
+            empty = [None] * len(ids)
+            return empty, empty
+        votes, rating = ratings.lookup(ids.to_numpy(dtype='int64'))
+        return (
+            pd.Series(pd.arrays.IntegerArray(votes, votes < 0), index=ids.index),
+            pd.Series(rating, index=ids.index),
+        )
+
+    def read_ratings_index(self):
+        """Lee title.ratings completo en un RatingsIndex (prejoin_ratings)"""
+        file_path = os.path.join(self.tsv_path, 'title.ratings.tsv')
+        ratings = RatingsIndex()
+        chunks = self.read_tsv_safely(
+            file_path, usecols=['tconst', 'averageRating', 'numVotes'], chunksize=1000000
+        )
+        if chunks is None:
+            return ratings
+        
+        self.metrics.add_file('title.ratings.tsv', file_path, [self.metrics.current])
+        for df in self.metrics.timed_chunks('title.ratings.tsv', chunks, [self.metrics.current]):
+            ids = extract_ids(df['tconst'])
+            df = df[valid_ids(ids)]
+            ratings.add(
+                ids.loc[df.index].to_numpy(dtype='int64'),
+                parse_ints(df['numVotes']).to_numpy(dtype='int64', na_value=-1),
+                pd.to_numeric(df['averageRating'], errors='coerce').to_numpy(dtype='float64', na_value=float('nan')),
+            )
+        ratings.freeze()
+        print(f"  → {len(ratings):,} ratings para unir a PRODUCCIÓN")
+        return ratings
+
+    def load_produccion(self):
+        """Carga producciones (🔧 minutos_duracion como INT)"""
+        print("\n🎥 Cargando PRODUCCIÓN...")
+        self.scan(self.produccion_task())
 
     # ==========================================
     # CARGA DE RELACIONES
     # ==========================================
 
-    def load_top_profesiones(self):
-        """Carga top profesiones de cada persona"""
-        print("\n🏆 Cargando TOP PROFESIONES...")
-        try:
-            df = self.read_tsv_safely(
-                f"{self.tsv_path}/name.basics.tsv", 
-                usecols=['nconst', 'primaryProfession']
-            )
-            if df is None:
-                return
+    def top_profesiones_task(self):
+        """Top profesiones de cada persona (name.basics)"""
+        def insert_chunk(df):
+            ids = extract_ids(df['nconst'])
+            df = df[valid_ids(ids)]
+            ids = ids.loc[df.index]
             
-            data = []
-            for _, row in df.iterrows():
-                person_id = self.extract_id(row.get('nconst'))
-                if person_id and pd.notna(row.get('primaryProfession')) and row.get('primaryProfession') != '\\N':
-                    for ordinal, prof in enumerate(row.get('primaryProfession').split(','), 1):
-                        if prof.strip():
-                            formatted_prof = self.format_text(prof.strip())
-                            prof_id = self.profession_ids.get(formatted_prof)
-                            if prof_id:
-                                data.append((person_id, prof_id, ordinal))
+            profs = explode_list(df['primaryProfession'])
+            prof_id = self.profession_ids.lookup(profs['value'])
+            profs = profs[prof_id.notna()]
+            
+            data = to_records(
+                ids.loc[profs.index], prof_id[prof_id.notna()].astype(int), profs['ordinal']
+            )
             
             query = """
                 INSERT INTO top_profesiones (id_persona, id_profesion, ordinal) 
@@ -488,30 +951,27 @@ class IMDBDataLoader:
                 ON CONFLICT (id_persona, id_profesion) DO NOTHING
             """
             self.insert_fast(query, data)
-        except Exception as e:
-            print(f"⚠️  Error: {e}")
+        
+        return ScanTask('🏆 TOP PROFESIONES', key='load_top_profesiones').consume(
+            'name.basics.tsv', insert_chunk, ['nconst', 'primaryProfession']
+        )
 
-    def load_genero_produccion(self):
-        """Carga géneros de cada producción"""
-        print("\n🎭 Cargando GÉNEROS POR PRODUCCIÓN...")
-        try:
-            df = self.read_tsv_safely(
-                f"{self.tsv_path}/title.basics.tsv", 
-                usecols=['tconst', 'genres']
-            )
-            if df is None:
-                return
-            
-            data = []
-            for _, row in df.iterrows():
-                title_id = self.extract_id(row.get('tconst'))
-                if title_id and pd.notna(row.get('genres')) and row.get('genres') != '\\N':
-                    for genre in row.get('genres').split(','):
-                        if genre.strip():
-                            formatted_genre = self.format_text(genre.strip())
-                            genre_id = self.genre_ids.get(formatted_genre)
-                            if genre_id:
-                                data.append((title_id, genre_id))
+    def load_top_profesiones(self):
+        """Carga top profesiones de cada persona"""
+        print("\n🏆 Cargando TOP PROFESIONES...")
+        self.scan(self.top_profesiones_task())
+
+    def genero_produccion_task(self):
+        """Géneros de cada producción (title.basics)"""
+        def insert_chunk(df):
+            ids = extract_ids(df['tconst'])
+            df = df[valid_ids(ids)]
+            ids = ids.loc[df.index]
+            
+            genres = explode_list(df['genres'])
+            genre_id = self.genre_ids.lookup(genres['value']).dropna().astype(int)
+            
+            data = to_records(ids.loc[genre_id.index], genre_id)
             
             query = """
                 INSERT INTO genero_produccion (id_produccion, id_genero) 
@@ -519,225 +979,279 @@ class IMDBDataLoader:
                 ON CONFLICT (id_produccion, id_genero) DO NOTHING
             """
             self.insert_fast(query, data)
-        except Exception as e:
-            print(f"⚠️  Error: {e}")
+        
+        return ScanTask('🎭 GÉNEROS POR PRODUCCIÓN', key='load_genero_produccion').consume(
+            'title.basics.tsv', insert_chunk, ['tconst', 'genres']
+        )
+
+    def load_genero_produccion(self):
+        """Carga géneros de cada producción"""
+        print("\n🎭 Cargando GÉNEROS POR PRODUCCIÓN...")
+        self.scan(self.genero_produccion_task())
+
+    def nombres_produccion_task(self):
+        """Nombres alternativos (title.akas, 🔧 VARCHAR(500))"""
+        query = """
+            INSERT INTO nombres_produccion 
+            (id_produccion, orden, nombres_produccion, region, lenguaje, esOriginal) 
+            VALUES %s
+            ON CONFLICT (id_produccion, orden) DO NOTHING
+        """
+        usecols = ['titleId', 'ordering', 'title', 'region', 'language', 'isOriginalTitle']
+        
+        range_task = self.range_task(
+            '📝 NOMBRES DE PRODUCCIÓN', 'load_nombres_produccion', 'title.akas.tsv', usecols, 'akas_records', query
+        )
+        if range_task:
+            return range_task
+        
+        def insert_chunk(df_chunk):
+            self.insert_fast(query, self.akas_records(df_chunk), batch_size=10000)
+        
+        return ScanTask('📝 NOMBRES DE PRODUCCIÓN', key='load_nombres_produccion').consume(
+            'title.akas.tsv', insert_chunk, usecols
+        )
+
+    def akas_records(self, df_chunk):
+        """Filas de nombres_produccion de un chunk de title.akas (solo IDs válidos)"""
+        ids = extract_ids(df_chunk['titleId'])
+        df_chunk = df_chunk[valid_ids(ids)]
+        return self.nombres_produccion_records(df_chunk, ids.loc[df_chunk.index])
+
+    def nombres_produccion_records(self, df_chunk, ids):
+        """Filas de nombres_produccion a partir de title.akas"""
+        is_original = (df_chunk['isOriginalTitle'] == '1').fillna(False).astype(bool)
+        title = df_chunk['title'].fillna('Unknown').astype(str).str.slice(0, 500)
+        region = df_chunk['region'].astype(object).fillna('').astype(str).str.slice(0, 100)
+        language = df_chunk['language'].astype(object).fillna('').astype(str).str.slice(0, 100)
+        ordering = parse_ints(df_chunk['ordering']).fillna(1)
+        
+        return to_records(ids, ordering, title, region, language, is_original)
 
     def load_nombres_produccion(self):
         """Carga nombres alternativos (🔧 VARCHAR(500))"""
         print("\n📝 Cargando NOMBRES DE PRODUCCIÓN...")
-        try:
-            chunk_iterator = self.read_tsv_safely(
-                f"{self.tsv_path}/title.akas.tsv", 
-                chunksize=500000
-            )
-            if chunk_iterator is None:
-                return
-                
-            for df_chunk in chunk_iterator:
-                data = []
-                for _, row in df_chunk.iterrows():
-                    title_id = self.extract_id(row.get('titleId'))
-                    if title_id:
-                        is_original = True if pd.notna(row.get('isOriginalTitle')) and str(row.get('isOriginalTitle')) == '1' else False
-                        
-                        title = str(row.get('title', 'Unknown'))[:500] if pd.notna(row.get('title')) else 'Unknown'
-                        region = str(row.get('region', ''))[:100] if pd.notna(row.get('region')) else ''
-                        language = str(row.get('language', ''))[:100] if pd.notna(row.get('language')) else ''
-                        ordering = int(row.get('ordering', 1)) if pd.notna(row.get('ordering')) else 1
-                        
-                        data.append((title_id, ordering, title, region, language, is_original))
-
-                query = """
-                    INSERT INTO nombres_produccion 
-                    (id_produccion, orden, nombres_produccion, region, lenguaje, esOriginal) 
-                    VALUES %s
-                    ON CONFLICT (id_produccion, orden) DO NOTHING
-                """
-                self.insert_fast(query, data, batch_size=10000)
-        except Exception as e:
-            print(f"⚠️  Error: {e}")
+        self.scan(self.nombres_produccion_task())
+
+    def nombres_titulos_atributos_task(self):
+        """Atributos de nombres (title.akas, 🔧 limitado a 200 chars)"""
+        query = """
+            INSERT INTO nombres_titulos_atributos (id_titulo, orden, id_atributo) 
+            VALUES %s 
+            ON CONFLICT (id_titulo, orden, id_atributo) DO NOTHING
+        """
+        usecols = ['titleId', 'ordering', 'attributes', 'types']
+        
+        range_task = self.range_task(
+            '🏷️  ATRIBUTOS DE NOMBRES', 'load_nombres_titulos_atributos', 'title.akas.tsv', usecols,
+            'akas_attribute_records', query
+        )
+        if range_task:
+            return range_task
+        
+        def insert_chunk(df_chunk):
+            self.insert_fast(query, self.akas_attribute_records(df_chunk), batch_size=10000)
+        
+        return ScanTask('🏷️  ATRIBUTOS DE NOMBRES', key='load_nombres_titulos_atributos').consume(
+            'title.akas.tsv', insert_chunk, usecols
+        )
+
+    def akas_attribute_records(self, df_chunk):
+        """Filas de nombres_titulos_atributos de un chunk de title.akas (usa attribute_ids)"""
+        ids = extract_ids(df_chunk['titleId'])
+        df_chunk = df_chunk[valid_ids(ids)]
+        ids = ids.loc[df_chunk.index]
+        ordering = parse_ints(df_chunk['ordering']).fillna(1)
+        
+        attrs = explode_list(df_chunk['attributes'].str.replace('\x02', '|', regex=False), sep='|')['value']
+        attr_id = self.attribute_map('Title attribute').lookup(attrs)
+        
+        types = explode_list(df_chunk['types'].str.replace('\x02', '|', regex=False), sep='|')['value']
+        types = types[~types.isin(['imdbDisplay', 'original'])]
+        type_id = self.attribute_map('Title types').lookup(types)
+        
+        # Mismo orden que por fila: atributos y luego tipos de cada título
+        found = pd.concat([attr_id, type_id]).dropna().astype(int).sort_index(kind='stable')
+        return to_records(ids.loc[found.index], ordering.loc[found.index], found)
 
     def load_nombres_titulos_atributos(self):
         """Carga atributos de nombres (🔧 limitado a 200 chars)"""
         print("\n🏷️  Cargando ATRIBUTOS DE NOMBRES...")
-        try:
-            chunk_iterator = self.read_tsv_safely(
-                f"{self.tsv_path}/title.akas.tsv", 
-                chunksize=500000
-            )
-            if chunk_iterator is None:
-                return
-                
-            for df_chunk in chunk_iterator:
-                data = []
-                for _, row in df_chunk.iterrows():
-                    title_id = self.extract_id(row.get('titleId'))
-                    if title_id:
-                        ordering = int(row.get('ordering', 1)) if pd.notna(row.get('ordering')) else 1
-                        
-                        if pd.notna(row.get('attributes')) and row.get('attributes') != '\\N':
-                            try:
-                                for attr in str(row.get('attributes')).replace('\x02', '|').split('|'):
-                                    if attr.strip():
-                                        attr_id = self.attribute_ids.get(('Title attribute', attr.strip()[:200]))
-                                        if attr_id:
-                                            data.append((title_id, ordering, attr_id))
-                            except:
-                                continue
-                        
-                        if pd.notna(row.get('types')) and row.get('types') != '\\N':
-                            try:
-                                for attr_type in str(row.get('types')).replace('\x02', '|').split('|'):
-                                    if attr_type.strip() and attr_type.strip() not in ['imdbDisplay', 'original']:
-                                        attr_id = self.attribute_ids.get(('Title types', attr_type.strip()[:200]))
-                                        if attr_id:
-                                            data.append((title_id, ordering, attr_id))
-                            except:
-                                continue
-
-                query = """
-                    INSERT INTO nombres_titulos_atributos (id_titulo, orden, id_atributo) 
-                    VALUES %s 
-                    ON CONFLICT (id_titulo, orden, id_atributo) DO NOTHING
-                """
-                self.insert_fast(query, data, batch_size=10000)
-        except Exception as e:
-            print(f"⚠️  Error: {e}")
+        self.scan(self.nombres_titulos_atributos_task())
 
-    def load_personas_produccion(self):
-        """Carga relación personas-producción"""
-        print("\n🎬 Cargando PERSONAS-PRODUCCIÓN...")
-        principals_data = []
+    def personas_produccion_task(self):
+        """Relación personas-producción (title.principals + title.crew)"""
+        query = """
+            INSERT INTO personas_produccion 
+            (id_produccion, orden, id_persona, id_profesion, conocido_por) 
+            VALUES %s
+            ON CONFLICT (id_produccion, orden) DO NOTHING
+        """
+        sink = RowSink(self, query, batch_size=50000, streaming=self.streaming)
+        crew_staged = [False]
         
-        try:
-            chunk_iterator = self.read_tsv_safely(
-                f"{self.tsv_path}/title.principals.tsv", 
-                chunksize=1000000
-            )
-            if chunk_iterator is not None:
-                for df_chunk in chunk_iterator:
-                    for _, row in df_chunk.iterrows():
-                        title_id = self.extract_id(row.get('tconst'))
-                        person_id = self.extract_id(row.get('nconst'))
-                        
-                        if title_id and person_id:
-                            ordering = int(row.get('ordering')) if pd.notna(row.get('ordering')) else 1
-                            formatted_cat = self.format_text(row.get('category'))
-                            prof_id = self.profession_ids.get(formatted_cat)
-                            
-                            if prof_id:
-                                principals_data.append((title_id, ordering, person_id, prof_id, None))
+        def collect_principals(df_chunk):
+            title_ids = extract_ids(df_chunk['tconst'])
+            person_ids = extract_ids(df_chunk['nconst'])
+            prof_id = self.profession_ids.lookup(df_chunk['category'])
             
-            query = """
-                INSERT INTO personas_produccion 
-                (id_produccion, orden, id_persona, id_profesion, conocido_por) 
-                VALUES %s
-                ON CONFLICT (id_produccion, orden) DO NOTHING
-            """
-            self.insert_fast(query, principals_data, batch_size=50000)
+            keep = valid_ids(title_ids) & valid_ids(person_ids) & prof_id.notna()
+            ordering = parse_ints(df_chunk['ordering'][keep]).fillna(1)
             
-        except Exception as e:
-            print(f"⚠️  Error en principals: {e}")
-            return
+            sink.add(to_records(
+                title_ids[keep], ordering, person_ids[keep],
+                prof_id[keep].astype(int), [None] * int(keep.sum())
+            ))
+        
+        def collect_crew(df_chunk):
+            self.stage_crew(df_chunk, first_chunk=not crew_staged[0])
+            crew_staged[0] = True
+        
+        def finish():
+            sink.close()
+            
+            if crew_staged[0]:
+                self.merge_crew()
+        
+        return (
+            ScanTask('🎬 PERSONAS-PRODUCCIÓN', finish, 'load_personas_produccion')
+            .consume('title.principals.tsv', collect_principals, ['tconst', 'ordering', 'nconst', 'category'],
+                     checkpoint=self.streaming)
+            # writers_directors es temporal: al reanudar se vuelve a copiar todo title.crew
+            .consume('title.crew.tsv', collect_crew, ['tconst', 'directors', 'writers'], checkpoint=False)
+        )
+
+    def stage_crew(self, df_crew, first_chunk=False):
+        """Copia en bloque los directores y escritores de un chunk de title.crew a writers_directors"""
+        director_prof_id = self.profession_ids.get('Director')
+        writer_prof_id = self.profession_ids.get('Writer')
+        
+        title_ids = extract_ids(df_crew['tconst'])
+        df_crew = df_crew[valid_ids(title_ids)]
         
+        crew = []
+        for column, crew_prof_id in (('directors', director_prof_id), ('writers', writer_prof_id)):
+            if not crew_prof_id:
+                continue
+            members = extract_ids(explode_list(df_crew[column])['value'])
+            members = members[valid_ids(members)]
+            crew.append(pd.DataFrame({
+                'title_id': title_ids.loc[members.index].to_numpy(),
+                'person_id': members.to_numpy(),
+                'prof_id': crew_prof_id,
+            }, index=members.index))
+        
+        crew_rows = to_records(*(
+            pd.concat(crew)[c] for c in ('title_id', 'person_id', 'prof_id')
+        )) if crew else []
+        
+        self.stage_temp(
+            'writers_directors', 'titleId INT, principalId INT, professionId INT',
+            crew_rows, first_chunk
+        )
+
+    def stage_temp(self, table, definition, rows, first_chunk=False):
+        """COPY de filas a una tabla temporal; el primer chunk la (re)crea"""
+        self.keep_alive()
+        cursor = self.connection.cursor()
+        
+        if first_chunk:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            cursor.execute(f"CREATE TEMP TABLE {table} ({definition})")
+        
+        buffer = build_text_buffer(rows)
+        with self.metrics.timed('insert_seconds'):
+            cursor.copy_expert(f"COPY {table} FROM STDIN", buffer)
+            self.connection.commit()
+        cursor.close()
+
+    def apply_staged(self, table, statement):
+        """Ejecuta un UPDATE ... FROM contra una tabla temporal y la elimina; devuelve filas afectadas"""
+        self.flush_writes()
+        self.keep_alive()
+        cursor = self.connection.cursor()
+        try:
+            with self.metrics.timed('insert_seconds'):
+                cursor.execute(f"ANALYZE {table}")
+                cursor.execute(statement)
+                updated = cursor.rowcount
+                cursor.execute(f"DROP TABLE {table}")
+                self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+        self.metrics.count('rows_inserted', updated)
+        return updated
+
+    def merge_crew(self):
+        """Agrega directores y escritores de title.crew que no están en principals
+
+        Un solo INSERT ... SELECT hace el anti-join contra personas_produccion y
+        numera cada título a partir de su MAX(orden) con ROW_NUMBER().
+        """
         print("  → Procesando directores y escritores...")
         try:
-            df_crew = self.read_tsv_safely(f"{self.tsv_path}/title.crew.tsv")
-            if df_crew is None:
-                return
-            
+            self.flush_writes()
             self.keep_alive()
             cursor = self.connection.cursor()
             
-            cursor.execute("""
-                CREATE TEMP TABLE writers_directors (
-                    titleId INT,
-                    principalId INT,
-                    professionId INT
-                )
-            """)
-            cursor.execute("CREATE INDEX idx_wd ON writers_directors (titleId, principalId)")
-            
-            director_prof_id = self.profession_ids.get('Director')
-            writer_prof_id = self.profession_ids.get('Writer')
-            
-            for _, row in df_crew.iterrows():
-                title_id = self.extract_id(row.get('tconst'))
-                if title_id:
-                    if pd.notna(row.get('directors')) and row.get('directors') != '\\N':
-                        for director in row.get('directors').split(','):
-                            if director.strip():
-                                person_id = self.extract_id(director.strip())
-                                if person_id and director_prof_id:
-                                    cursor.execute("""
-                                        INSERT INTO writers_directors (titleId, principalId, professionId)
-                                        SELECT %s, %s, %s
-                                        WHERE NOT EXISTS (
-                                            SELECT 1 FROM personas_produccion pp 
-                                            WHERE pp.id_produccion = %s AND pp.id_persona = %s
-                                        )
-                                    """, (title_id, person_id, director_prof_id, title_id, person_id))
-                    
-                    if pd.notna(row.get('writers')) and row.get('writers') != '\\N':
-                        for writer in row.get('writers').split(','):
-                            if writer.strip():
-                                person_id = self.extract_id(writer.strip())
-                                if person_id and writer_prof_id:
-                                    cursor.execute("""
-                                        INSERT INTO writers_directors (titleId, principalId, professionId)
-                                        SELECT %s, %s, %s
-                                        WHERE NOT EXISTS (
-                                            SELECT 1 FROM personas_produccion pp 
-                                            WHERE pp.id_produccion = %s AND pp.id_persona = %s
-                                        )
-                                    """, (title_id, person_id, writer_prof_id, title_id, person_id))
-            
-            self.connection.commit()
-            
-            cursor.execute("SELECT titleId, principalId, professionId FROM writers_directors")
-            missing_crew = cursor.fetchall()
-            
-            if missing_crew:
+            with self.metrics.timed('insert_seconds'):
+                cursor.execute("ANALYZE writers_directors")
                 cursor.execute("""
-                    SELECT id_produccion, MAX(orden) as max_ordinal
-                    FROM personas_produccion
-                    GROUP BY id_produccion
-                """)
-                max_ordinals = dict(cursor.fetchall())
-                
-                final_crew_data = []
-                current_title = None
-                current_ordinal = 0
-                
-                missing_crew.sort(key=lambda x: (x[0], x[2], x[1]))
-                
-                for title_id, person_id, prof_id in missing_crew:
-                    if title_id != current_title:
-                        current_title = title_id
-                        current_ordinal = max_ordinals.get(title_id, 0)
-                    
-                    current_ordinal += 1
-                    final_crew_data.append((title_id, current_ordinal, person_id, prof_id, None))
-                
-                query = """
+                    WITH missing AS (
+                        SELECT wd.titleId, wd.principalId, wd.professionId
+                        FROM writers_directors wd
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM personas_produccion pp 
+                            WHERE pp.id_produccion = wd.titleId AND pp.id_persona = wd.principalId
+                        )
+                    ),
+                    max_ordinals AS (
+                        SELECT id_produccion, MAX(orden) AS max_ordinal
+                        FROM personas_produccion
+                        WHERE id_produccion IN (SELECT titleId FROM missing)
+                        GROUP BY id_produccion
+                    )
                     INSERT INTO personas_produccion 
-                    (id_produccion, orden, id_persona, id_profesion, conocido_por) 
-                    VALUES %s
+                    (id_produccion, orden, id_persona, id_profesion, conocido_por)
+                    SELECT
+                        m.titleId,
+                        COALESCE(mo.max_ordinal, 0) + ROW_NUMBER() OVER (
+                            PARTITION BY m.titleId ORDER BY m.professionId, m.principalId
+                        ),
+                        m.principalId,
+                        m.professionId,
+                        NULL
+                    FROM missing m
+                    LEFT JOIN max_ordinals mo ON mo.id_produccion = m.titleId
                     ON CONFLICT (id_produccion, orden) DO NOTHING
-                """
-                self.insert_fast(query, final_crew_data, batch_size=50000)
+                """)
+                inserted = cursor.rowcount
+            self.metrics.count('rows_inserted', inserted)
             
             cursor.execute("DROP TABLE writers_directors")
+            self.connection.commit()
             cursor.close()
             
+            print(f"✅ Total insertado: {inserted:,} registros")
+            
         except Exception as e:
             print(f"⚠️  Error en crew: {e}")
             try:
+                self.connection.rollback()
                 cursor.execute("DROP TABLE IF EXISTS writers_directors")
+                self.connection.commit()
                 cursor.close()
             except:
                 pass
 
+    def load_personas_produccion(self):
+        """Carga relación personas-producción"""
+        print("\n🎬 Cargando PERSONAS-PRODUCCIÓN...")
+        self.scan(self.personas_produccion_task())
+
     def parse_characters(self, chars_str):
         """Parsea string de personajes"""
         if not chars_str or chars_str == '\\N':
@@ -750,52 +1264,51 @@ class IMDBDataLoader:
         except:
             return [chars_str] if chars_str else []
 
+    def personajes_task(self):
+        """Personajes (title.principals, 🔧 VARCHAR(200))"""
+        query = "INSERT INTO personajes (id_produccion, persona_id, personaje) VALUES %s"
+        usecols = ['tconst', 'nconst', 'characters']
+        
+        range_task = self.range_task(
+            '🎭 PERSONAJES', 'load_personajes', 'title.principals.tsv', usecols, 'personajes_records', query
+        )
+        if range_task:
+            return range_task
+        
+        def insert_chunk(df_chunk):
+            self.insert_fast(query, self.personajes_records(df_chunk), batch_size=10000)
+        
+        return ScanTask('🎭 PERSONAJES', key='load_personajes').consume(
+            'title.principals.tsv', insert_chunk, usecols
+        )
+
+    def personajes_records(self, df_chunk):
+        """Filas de personajes a partir de title.principals"""
+        title_ids = extract_ids(df_chunk['tconst'])
+        person_ids = extract_ids(df_chunk['nconst'])
+        df_chunk = df_chunk[valid_ids(title_ids) & valid_ids(person_ids)]
+        
+        characters = split_characters(df_chunk['characters']).str.slice(0, 200)
+        return to_records(
+            title_ids.loc[characters.index], person_ids.loc[characters.index], characters
+        )
+
     def load_personajes(self):
         """Carga personajes (🔧 VARCHAR(200))"""
         print("\n🎭 Cargando PERSONAJES...")
-        try:
-            chunk_iterator = self.read_tsv_safely(
-                f"{self.tsv_path}/title.principals.tsv", 
-                usecols=['tconst', 'nconst', 'characters'], 
-                chunksize=1000000
-            )
-            if chunk_iterator is None:
-                return
-            
-            for df_chunk in chunk_iterator:
-                data = []
-                for _, row in df_chunk.iterrows():
-                    title_id = self.extract_id(row.get('tconst'))
-                    person_id = self.extract_id(row.get('nconst'))
-                    
-                    if title_id and person_id and pd.notna(row.get('characters')):
-                        characters = self.parse_characters(row.get('characters'))
-                        for char in characters:
-                            if char and char != '\\N':
-                                data.append((title_id, person_id, char[:200]))
-                
-                query = "INSERT INTO personajes (id_produccion, persona_id, personaje) VALUES %s"
-                self.insert_fast(query, data, batch_size=10000)
-        except Exception as e:
-            print(f"⚠️  Error: {e}")
+        self.scan(self.personajes_task())
 
-    def load_episodios(self):
-        """Carga episodios (🔧 temporada y episodio NULL permitidos)"""
-        print("\n📺 Cargando EPISODIOS...")
-        try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/title.episode.tsv")
-            if df is None:
-                return
+    def episodios_task(self):
+        """Episodios (title.episode, 🔧 temporada y episodio NULL permitidos)"""
+        def insert_chunk(df):
+            episode_ids = extract_ids(df['tconst'])
+            parent_ids = extract_ids(df['parentTconst'])
+            keep = valid_ids(episode_ids) & valid_ids(parent_ids)
             
-            data = []
-            for _, row in df.iterrows():
-                episode_id = self.extract_id(row.get('tconst'))
-                parent_id = self.extract_id(row.get('parentTconst'))
-                
-                if episode_id and parent_id:
-                    season = int(row.get('seasonNumber')) if pd.notna(row.get('seasonNumber')) and row.get('seasonNumber') != '\\N' else None
-                    episode_num = int(row.get('episodeNumber')) if pd.notna(row.get('episodeNumber')) and row.get('episodeNumber') != '\\N' else None
-                    data.append((episode_id, parent_id, season, episode_num))
+            data = to_records(
+                episode_ids[keep], parent_ids[keep],
+                parse_ints(df['seasonNumber'][keep]), parse_ints(df['episodeNumber'][keep])
+            )
             
             query = """
                 INSERT INTO episodios (id_episodio, id_serie, temporada, episodio) 
@@ -803,54 +1316,84 @@ class IMDBDataLoader:
                 ON CONFLICT (id_episodio) DO NOTHING
             """
             self.insert_fast(query, data)
-        except Exception as e:
-            print(f"⚠️  Error: {e}")
+        
+        return ScanTask('📺 EPISODIOS', key='load_episodios').consume('title.episode.tsv', insert_chunk)
+
+    def load_episodios(self):
+        """Carga episodios (🔧 temporada y episodio NULL permitidos)"""
+        print("\n📺 Cargando EPISODIOS...")
+        self.scan(self.episodios_task())
 
     # ==========================================
     # ACTUALIZACIONES FINALES
     # ==========================================
 
-    def update_ratings(self):
-        """Actualiza ratings"""
-        print("\n⭐ Actualizando RATINGS...")
-        try:
-            df = self.read_tsv_safely(f"{self.tsv_path}/title.ratings.tsv")
-            if df is None:
+    def ratings_task(self):
+        """Votos y rating de title.ratings (None si ya se insertan con produccion)"""
+        if self.prejoin_ratings:
+            return None
+        if self.set_based_updates:
+            return self.staged_ratings_task()
+        updated = [0]
+        
+        def update_chunk(df):
+            ids = extract_ids(df['tconst'])
+            df = df[valid_ids(ids)]
+            updated[0] += self.write_ratings(self.rating_records(df, ids.loc[df.index]), updated[0])
+        
+        def finish():
+            print(f"✅ Total ratings actualizados: {updated[0]:,}")
+        
+        return ScanTask('⭐ RATINGS', finish, 'update_ratings').consume(
+            'title.ratings.tsv', update_chunk, ['tconst', 'averageRating', 'numVotes']
+        )
+
+    def staged_ratings_task(self):
+        """Ratings con COPY a una tabla temporal y un solo UPDATE de produccion"""
+        staged = [False]
+        
+        def stage_chunk(df):
+            ids = extract_ids(df['tconst'])
+            df = df[valid_ids(ids)]
+            ratings = self.rating_records(df, ids.loc[df.index])
+            self.metrics.count('rows_produced', len(ratings))
+            self.stage_temp('ratings_stage', 'votos INT, rating NUMERIC, id_titulo INT', ratings, not staged[0])
+            staged[0] = True
+        
+        def finish():
+            if not staged[0]:
                 return
-            
-            self.keep_alive()
-            cursor = self.connection.cursor()
-            
-            updated_count = 0
-            batch_data = []
-            
-            for _, row in df.iterrows():
-                title_id = self.extract_id(row.get('tconst'))
-                if title_id:
-                    votos = int(row.get('numVotes')) if pd.notna(row.get('numVotes')) else None
-                    rating = float(row.get('averageRating')) if pd.notna(row.get('averageRating')) else None
-                    
-                    batch_data.append((votos, rating, title_id))
-                    updated_count += 1
-                    
-                    if len(batch_data) >= 10000:
-                        execute_values(
-                            cursor,
-                            """
-                            UPDATE produccion p
-                            SET votos = t.votos, promedio_rating = t.rating
-                            FROM (VALUES %s) AS t(votos, rating, id_titulo)
-                            WHERE p.id_titulo = t.id_titulo
-                            """,
-                            batch_data
-                        )
-                        self.connection.commit()
-                        batch_data = []
-                        
-                        if updated_count % 100000 == 0:
-                            print(f"  → {updated_count:,} ratings actualizados...")
-            
-            if batch_data:
+            updated = self.apply_staged('ratings_stage', """
+                UPDATE produccion p
+                SET votos = t.votos, promedio_rating = t.rating
+                FROM ratings_stage t
+                WHERE p.id_titulo = t.id_titulo
+            """)
+            print(f"✅ Total ratings actualizados: {updated:,}")
+        
+        # La tabla temporal no sobrevive al proceso: al reanudar se copia todo de nuevo
+        return ScanTask('⭐ RATINGS', finish, 'update_ratings').consume(
+            'title.ratings.tsv', stage_chunk, ['tconst', 'averageRating', 'numVotes'], checkpoint=False
+        )
+
+    def rating_records(self, df, ids):
+        """Filas (votos, rating, id_titulo) a partir de title.ratings"""
+        return to_records(
+            parse_ints(df['numVotes']),
+            pd.to_numeric(df['averageRating'], errors='coerce'),
+            ids
+        )
+
+    def write_ratings(self, ratings, updated=0):
+        """UPDATE de votos y rating por batches de 10,000; devuelve filas enviadas"""
+        self.metrics.count('rows_produced', len(ratings))
+        self.flush_writes()
+        self.keep_alive()
+        cursor = self.connection.cursor()
+        
+        for i in range(0, len(ratings), 10000):
+            batch_data = ratings[i:i + 10000]
+            with self.metrics.timed('insert_seconds'):
                 execute_values(
                     cursor,
                     """
@@ -862,120 +1405,388 @@ class IMDBDataLoader:
                     batch_data
                 )
                 self.connection.commit()
+            self.metrics.count('rows_inserted', len(batch_data))
+            updated += len(batch_data)
+            
+            if updated % 100000 == 0:
+                print(f"  → {updated:,} ratings actualizados...")
+        
+        cursor.close()
+        return len(ratings)
+
+    def update_ratings(self):
+        """Actualiza ratings"""
+        print("\n⭐ Actualizando RATINGS...")
+        if self.prejoin_ratings:
+            print("  ⏭️  Votos y rating ya insertados con PRODUCCIÓN (prejoin_ratings)")
+            return
+        self.scan(self.ratings_task())
+
+    def known_for_records(self, df):
+        """Filas (ordinal, id_persona, id_produccion) de knownForTitles"""
+        ids = extract_ids(df['nconst'])
+        df = df[valid_ids(ids)]
+        known = explode_list(df['knownForTitles'])
+        title_ids = extract_ids(known['value'])
+        known = known[valid_ids(title_ids)]
+        
+        return to_records(
+            known['ordinal'], ids.loc[known.index], title_ids[valid_ids(title_ids)]
+        )
+
+    def conocido_por_task(self):
+        """Campo conocido_por a partir de knownForTitles (name.basics)"""
+        if self.set_based_updates:
+            return self.staged_conocido_por_task()
+        updated = [0]
+        
+        def update_chunk(df):
+            known_for = self.known_for_records(df)
+            self.metrics.count('rows_produced', len(known_for))
+            self.flush_writes()
+            self.keep_alive()
+            cursor = self.connection.cursor()
+            
+            for i in range(0, len(known_for), 10000):
+                batch_data = known_for[i:i + 10000]
+                with self.metrics.timed('insert_seconds'):
+                    execute_values(
+                        cursor,
+                        """
+                        UPDATE personas_produccion pp
+                        SET conocido_por = t.ordinal
+                        FROM (VALUES %s) AS t(ordinal, id_persona, id_produccion)
+                        WHERE pp.id_persona = t.id_persona AND pp.id_produccion = t.id_produccion
+                        """,
+                        batch_data
+                    )
+                    self.connection.commit()
+                self.metrics.count('rows_inserted', len(batch_data))
+                updated[0] += len(batch_data)
+                
+                if updated[0] % 100000 == 0:
+                    print(f"  → {updated[0]:,} actualizados...")
             
             cursor.close()
-            print(f"✅ Total ratings actualizados: {updated_count:,}")
-        except Exception as e:
-            print(f"❌ Error: {e}")
+        
+        def finish():
+            print(f"✅ Total actualizados: {updated[0]:,}")
+        
+        return ScanTask('🌟 CONOCIDO POR', finish, 'update_conocido_por').consume(
+            'name.basics.tsv', update_chunk, ['nconst', 'knownForTitles']
+        )
+
+    def staged_conocido_por_task(self):
+        """conocido_por con COPY a una tabla temporal y un solo UPDATE de personas_produccion"""
+        staged = [False]
+        seq = [0]
+        
+        def stage_chunk(df):
+            # seq conserva el orden de llegada: si un par se repite gana el último, como por batches
+            known_for = [row + (seq[0] + i,) for i, row in enumerate(self.known_for_records(df))]
+            seq[0] += len(known_for)
+            self.metrics.count('rows_produced', len(known_for))
+            self.stage_temp(
+                'known_for_stage', 'ordinal INT, id_persona INT, id_produccion INT, seq BIGINT',
+                known_for, not staged[0]
+            )
+            staged[0] = True
+        
+        def finish():
+            if not staged[0]:
+                return
+            updated = self.apply_staged('known_for_stage', """
+                UPDATE personas_produccion pp
+                SET conocido_por = t.ordinal
+                FROM (
+                    SELECT DISTINCT ON (id_persona, id_produccion) ordinal, id_persona, id_produccion
+                    FROM known_for_stage
+                    ORDER BY id_persona, id_produccion, seq DESC
+                ) t
+                WHERE pp.id_persona = t.id_persona AND pp.id_produccion = t.id_produccion
+            """)
+            print(f"✅ Total actualizados: {updated:,}")
+        
+        return ScanTask('🌟 CONOCIDO POR', finish, 'update_conocido_por').consume(
+            'name.basics.tsv', stage_chunk, ['nconst', 'knownForTitles'], checkpoint=False
+        )
 
     def update_conocido_por(self):
         """Actualiza campo conocido por"""
         print("\n🌟 Actualizando CONOCIDO POR...")
-        try:
-            df = self.read_tsv_safely(
-                f"{self.tsv_path}/name.basics.tsv", 
-                usecols=['nconst', 'knownForTitles']
-            )
-            if df is None:
-                return
-            
-            self.keep_alive()
-            cursor = self.connection.cursor()
-            
-            updated_count = 0
-            batch_data = []
-            
-            for _, row in df.iterrows():
-                person_id = self.extract_id(row.get('nconst'))
-                if person_id and pd.notna(row.get('knownForTitles')) and row.get('knownForTitles') != '\\N':
-                    for ordinal, title in enumerate(row.get('knownForTitles').split(','), 1):
-                        if title.strip():
-                            title_id = self.extract_id(title.strip())
-                            if title_id:
-                                batch_data.append((ordinal, person_id, title_id))
-                                updated_count += 1
-                                
-                                if len(batch_data) >= 10000:
-                                    execute_values(
-                                        cursor,
-                                        """
-                                        UPDATE personas_produccion pp
-                                        SET conocido_por = t.ordinal
-                                        FROM (VALUES %s) AS t(ordinal, id_persona, id_produccion)
-                                        WHERE pp.id_persona = t.id_persona AND pp.id_produccion = t.id_produccion
-                                        """,
-                                        batch_data
-                                    )
-                                    self.connection.commit()
-                                    batch_data = []
-                                    
-                                    if updated_count % 100000 == 0:
-                                        print(f"  → {updated_count:,} actualizados...")
-            
-            if batch_data:
+        self.scan(self.conocido_por_task())
+
+    # ==========================================
+    # REFRESH INCREMENTAL (DELTA)
+    # ==========================================
+
+    def delete_rows(self, deletes, keys):
+        """Borra por clave en cada tabla de `deletes` [(tabla, columnas)]"""
+        if not keys:
+            return
+        
+        self.flush_writes()
+        self.keep_alive()
+        cursor = self.connection.cursor()
+        
+        for i in range(0, len(keys), 10000):
+            batch_data = keys[i:i + 10000]
+            for table, columns in deletes:
+                key_names = ', '.join(f"k{n}" for n in range(len(columns)))
+                condition = ' AND '.join(f"d.{c} = t.k{n}" for n, c in enumerate(columns))
                 execute_values(
                     cursor,
-                    """
-                    UPDATE personas_produccion pp
-                    SET conocido_por = t.ordinal
-                    FROM (VALUES %s) AS t(ordinal, id_persona, id_produccion)
-                    WHERE pp.id_persona = t.id_persona AND pp.id_produccion = t.id_produccion
-                    """,
+                    f"DELETE FROM {table} d USING (VALUES %s) AS t({key_names}) WHERE {condition}",
                     batch_data
                 )
-                self.connection.commit()
+            self.connection.commit()
+        
+        cursor.close()
+
+    def delta_task(self, name, label, file_name, id_column, columns, write, remove, ordering_column=None):
+        """ScanTask que compara file_name contra el sidecar de `name`
+
+        Solo las filas nuevas o modificadas llegan a write(df, ids); remove(keys)
+        recibe las claves que desaparecieron del snapshot. Con ordering_column la
+        clave es (id, orden).
+        """
+        index = RowHashIndex(os.path.join(self.delta_dir, f"{name}.npz"))
+        usecols = [id_column] + ([ordering_column] if ordering_column else []) + columns
+        
+        def collect(df):
+            ids = extract_ids(df[id_column])
+            df = df[valid_ids(ids)]
+            ids = ids.loc[df.index]
+            
+            keys = ids.to_numpy(dtype='int64')
+            if ordering_column:
+                keys = pair_keys(keys, parse_ints(df[ordering_column]).fillna(1).to_numpy(dtype='int64'))
+            
+            changed = index.diff(keys, row_hashes(df[columns]))
+            if write and changed.any():
+                write(df[changed], ids[changed])
+        
+        def finish():
+            removed = index.removed()
+            print(f"  → {index.changed:,} nuevos o modificados, {len(removed):,} eliminados")
             
+            if remove and len(removed):
+                if ordering_column:
+                    removed_ids, ordinals = split_pair_keys(removed)
+                    remove(list(zip(removed_ids.tolist(), ordinals.tolist())))
+                else:
+                    remove([(i,) for i in removed.tolist()])
+            index.save()
+        
+        return ScanTask(label, finish, f"delta_{name}").consume(file_name, collect, usecols)
+
+    def delta_tasks(self, apply=True):
+        """Tareas delta de personas, produccion, nombres_produccion y ratings"""
+        def upsert(query, records, batch_size=50000):
+            return lambda df, ids: self.insert_fast(query, records(df, ids), batch_size=batch_size)
+        
+        def delete(name):
+            return lambda keys: self.delete_rows(DELTA_DELETES[name], keys)
+        
+        personas_query = """
+            INSERT INTO personas (id_persona, nombre, ahno_nacimiento, ahno_muerte) 
+            VALUES %s 
+            ON CONFLICT (id_persona) DO UPDATE SET 
+                nombre = EXCLUDED.nombre, 
+                ahno_nacimiento = EXCLUDED.ahno_nacimiento, 
+                ahno_muerte = EXCLUDED.ahno_muerte
+        """
+        produccion_query = """
+            INSERT INTO produccion 
+            (id_titulo, id_tipo_titulo, adultos, ahno_inicio, ahno_finalizacion, 
+             minutos_duracion, votos, promedio_rating) 
+            VALUES %s
+            ON CONFLICT (id_titulo) DO UPDATE SET 
+                id_tipo_titulo = EXCLUDED.id_tipo_titulo, 
+                adultos = EXCLUDED.adultos, 
+                ahno_inicio = EXCLUDED.ahno_inicio, 
+                ahno_finalizacion = EXCLUDED.ahno_finalizacion, 
+                minutos_duracion = EXCLUDED.minutos_duracion
+        """
+        nombres_query = """
+            INSERT INTO nombres_produccion 
+            (id_produccion, orden, nombres_produccion, region, lenguaje, esOriginal) 
+            VALUES %s
+            ON CONFLICT (id_produccion, orden) DO UPDATE SET 
+                nombres_produccion = EXCLUDED.nombres_produccion, 
+                region = EXCLUDED.region, 
+                lenguaje = EXCLUDED.lenguaje, 
+                esOriginal = EXCLUDED.esOriginal
+        """
+        
+        def write_ratings(df, ids):
+            self.write_ratings(self.rating_records(df, ids))
+        
+        def clear_ratings(keys):
+            self.flush_writes()
+            self.keep_alive()
+            cursor = self.connection.cursor()
+            for i in range(0, len(keys), 10000):
+                cursor.execute(
+                    "UPDATE produccion SET votos = NULL, promedio_rating = NULL WHERE id_titulo = ANY(%s)",
+                    ([k for (k,) in keys[i:i + 10000]],)
+                )
+                self.connection.commit()
             cursor.close()
-            print(f"✅ Total actualizados: {updated_count:,}")
+        
+        return [
+            self.delta_task(
+                'personas', '👥 PERSONAS (delta)', 'name.basics.tsv', 'nconst',
+                ['primaryName', 'birthYear', 'deathYear'],
+                upsert(personas_query, self.persona_records) if apply else None,
+                delete('personas') if apply else None,
+            ),
+            self.delta_task(
+                'produccion', '🎥 PRODUCCIÓN (delta)', 'title.basics.tsv', 'tconst',
+                ['titleType', 'isAdult', 'startYear', 'endYear', 'runtimeMinutes'],
+                upsert(produccion_query, self.produccion_records) if apply else None,
+                delete('produccion') if apply else None,
+            ),
+            self.delta_task(
+                'nombres_produccion', '📝 NOMBRES DE PRODUCCIÓN (delta)', 'title.akas.tsv', 'titleId',
+                ['title', 'region', 'language', 'isOriginalTitle'],
+                upsert(nombres_query, self.nombres_produccion_records, 10000) if apply else None,
+                delete('nombres_produccion') if apply else None,
+                ordering_column='ordering'
+            ),
+            self.delta_task(
+                'ratings', '⭐ RATINGS (delta)', 'title.ratings.tsv', 'tconst',
+                ['averageRating', 'numVotes'],
+                write_ratings if apply else None,
+                clear_ratings if apply else None,
+            ),
+        ]
+
+    def refresh_delta(self, apply=True):
+        """Refresh incremental contra el snapshot anterior (sidecars en delta_dir)
+
+        Con apply=False solo se registran los hashes del snapshot actual, p.ej.
+        justo después de una carga completa con load_all_data.
+        """
+        if not self.delta_dir:
+            raise ValueError("refresh_delta() requiere delta_dir")
+        
+        start_time = datetime.now()
+        print("\n" + "="*60)
+        print("🔁 REFRESH INCREMENTAL DE DATOS IMDB" if apply else "🔁 REGISTRANDO SNAPSHOT IMDB")
+        print("="*60)
+        
+        try:
+            if apply:
+                self.connect_db()
+                self.load_catalogs_from_db()
+            
+            self.scan(*self.delta_tasks(apply), checkpoint=False)
+            
+            if apply:
+                self.retry_failed_batches()
+            
+            print("\n" + "="*60)
+            print(f"✅ REFRESH COMPLETADO")
+            print(f"⏱️  Tiempo total: {datetime.now() - start_time}")
+            print("="*60)
+            
         except Exception as e:
-            print(f"❌ Error: {e}")
+            print(f"\n❌ ERROR CRÍTICO: {e}")
+            traceback.print_exc()
+        finally:
+            self.disconnect_db()
 
     # ==========================================
     # FUNCIÓN PRINCIPAL
     # ==========================================
 
-    def load_all_data(self):
-        """Carga completa de datos"""
+    def load_catalogs_from_db(self):
+        """Recupera los mapas de catálogos ya cargados (para reanudar)"""
+        cursor = self.connection.cursor()
+        
+        cursor.execute("SELECT profesion, id_profesion FROM profesiones")
+        self.profession_ids.update(cursor.fetchall())
+        cursor.execute("SELECT genero, id_genero FROM generos")
+        self.genre_ids.update(cursor.fetchall())
+        cursor.execute("SELECT tipo_produccion, id_tipo_produccion FROM tipo_produccion")
+        self.titletype_ids.update(cursor.fetchall())
+        cursor.execute("SELECT class, atributo, id_atributo FROM atributos")
+        for class_name, attribute, attr_id in cursor.fetchall():
+            self.attribute_map(class_name)[attribute] = attr_id
+        
+        cursor.close()
+        print(f"  → Catálogos recuperados: {len(self.profession_ids)} profesiones, "
+              f"{len(self.genre_ids)} géneros, {len(self.titletype_ids)} tipos, "
+              f"{sum(len(m) for m in self.attribute_ids.values())} atributos")
+
+    def load_all_data(self, resume=False):
+        """Carga completa de datos (resume=True continúa desde el último checkpoint)
+
+        Devuelve 0 si todos los loaders terminaron y 1 si alguno falló o se omitió.
+        """
         start_time = datetime.now()
         print("\n" + "="*60)
         print("🚀 INICIANDO CARGA DE DATOS IMDB EN POSTGRESQL")
         print("="*60)
         
+        self.metrics = LoadMetrics()
+        self.failed_steps = []
+        index_manager = None
+        staging = StagingSwap(self.db_config, workers=max(self.workers, 4)) if self.staging else None
+        completed = False
+        wal_start = None
+        
         try:
-            self.connect_db()
+            wal_start = wal_lsn(self.db_config)
+            
+            if self.journal and not resume:
+                self.journal.reset()
+            
+            if staging and not resume:
+                staging.prepare()
+            if staging:
+                self.search_path = STAGING_SCHEMA
+            
+            # En staging las FKs no se copian con LIKE: IndexManager las agrega al final
+            if self.manage_indexes or staging:
+                state_path = os.path.join(self.checkpoint_dir, 'indexes.state') if self.checkpoint_dir else None
+                index_manager = IndexManager(
+                    self.db_config, state_path=state_path, workers=max(self.workers, 4),
+                    schema=STAGING_SCHEMA if staging else 'public', source_schema='public'
+                )
+                index_manager.drop_all()
+            
+            if resume:
+                print("\n⏩ Reanudando carga desde checkpoints...")
+                self.connect_db()
+                self.load_catalogs_from_db()
             
-            print("\n📦 FASE 1: CATÁLOGOS")
-            print("-" * 60)
-            self.load_professions()
-            self.load_genres()
-            self.load_title_types()
-            self.load_attributes()
-            
-            print("\n👥 FASE 2: ENTIDADES PRINCIPALES")
-            print("-" * 60)
-            self.load_personas()
-            self.load_produccion()
-            
-            print("\n🔗 FASE 3: RELACIONES")
-            print("-" * 60)
-            self.load_top_profesiones()
-            self.load_genero_produccion()
-            self.load_nombres_produccion()
-            self.load_nombres_titulos_atributos()
-            self.load_personas_produccion()
-            self.load_personajes()
-            self.load_episodios()
-            
-            print("\n🔄 FASE 4: ACTUALIZACIONES FINALES")
-            print("-" * 60)
-            self.update_ratings()
-            self.update_conocido_por()
+            if self.workers > 1:
+                # Cada worker abre su conexión; el proceso principal no la necesita
+                self.disconnect_db()
+                self.failed_steps.extend(PhaseScheduler(self, self.workers).run())
+            elif self.single_pass:
+                if not resume:
+                    self.connect_db()
+                self.load_all_single_pass()
+            else:
+                if not resume:
+                    self.connect_db()
+                self.load_all_sequential()
+            
+            self.retry_failed_batches()
+            # Con loaders fallidos la carga no se da por completa (staging no se intercambia)
+            completed = not self.failed_steps
             
             end_time = datetime.now()
             duration = end_time - start_time
             
             print("\n" + "="*60)
-            print(f"✅ CARGA COMPLETADA EXITOSAMENTE")
+            if completed:
+                print(f"✅ CARGA COMPLETADA EXITOSAMENTE")
+            else:
+                print(f"❌ CARGA INCOMPLETA: {', '.join(dict.fromkeys(self.failed_steps))}")
             print(f"⏱️  Tiempo total: {duration}")
             print("="*60)
             
@@ -983,4 +1794,119 @@ class IMDBDataLoader:
             print(f"\n❌ ERROR CRÍTICO: {e}")
             traceback.print_exc()
         finally:
-            self.disconnect_db()
\ No newline at end of file
+            self.disconnect_db()
+            self.search_path = None
+            self.finish_load(index_manager, staging, completed)
+            
+            if wal_start:
+                self.report_wal(wal_start)
+            self.report_metrics()
+        
+        return 0 if completed else 1
+
+    def finish_load(self, index_manager, staging, completed):
+        """Reconstruye índices y, en staging, pasa las tablas a LOGGED y las intercambia"""
+        try:
+            if staging and not completed:
+                # Las tablas de staging quedan como están para reanudar con resume()
+                print(f"\n⚠️  Carga incompleta: las tablas siguen en {STAGING_SCHEMA}")
+                return
+            
+            # Una tabla LOGGED no puede referenciar una UNLOGGED: primero SET LOGGED, luego FKs
+            if staging:
+                staging.set_logged()
+            if index_manager:
+                index_manager.rebuild_all()
+                index_manager.validate_all()
+            if staging:
+                staging.swap()
+        except Exception as e:
+            print(f"⚠️  Error al finalizar la carga: {e}")
+
+    def report_wal(self, wal_start):
+        """Reporta los bytes de WAL generados por la carga"""
+        try:
+            self.wal_bytes = wal_bytes_since(self.db_config, wal_start)
+            mode = "staging UNLOGGED" if self.staging else "carga directa"
+            print(f"📝 WAL generado ({mode}): {self.wal_bytes / (1024 * 1024):,.1f} MB")
+        except Exception as e:
+            print(f"⚠️  No se pudo medir el WAL: {e}")
+
+    def report_metrics(self):
+        """Imprime las métricas por loader y escribe los reportes configurados"""
+        self.metrics.print_report()
+        try:
+            if self.metrics_path:
+                self.metrics.write_json(self.metrics_path)
+                print(f"📊 Reporte de métricas: {self.metrics_path}")
+            if self.prometheus_path:
+                self.metrics.write_prometheus(self.prometheus_path)
+        except Exception as e:
+            print(f"⚠️  No se pudo escribir el reporte de métricas: {e}")
+
+    def resume(self):
+        """Reanuda una carga interrumpida usando el journal de checkpoints"""
+        if not self.journal:
+            raise ValueError("resume() requiere checkpoint_dir")
+        return self.load_all_data(resume=True)
+
+    def load_all_single_pass(self):
+        """Carga por fases leyendo cada archivo una sola vez por fase"""
+        # Los catálogos deben estar completos antes de mapear relaciones,
+        # y conocido_por necesita personas_produccion ya insertada
+        print("\n📦 FASE 1: CATÁLOGOS")
+        print("-" * 60)
+        self.scan(
+            self.professions_task(),
+            self.genres_task(),
+            self.title_types_task(),
+            self.attributes_task(),
+        )
+        
+        print("\n👥 FASES 2 Y 3: ENTIDADES PRINCIPALES Y RELACIONES")
+        print("-" * 60)
+        self.scan(
+            self.personas_task(),
+            self.produccion_task(),
+            self.top_profesiones_task(),
+            self.genero_produccion_task(),
+            self.nombres_produccion_task(),
+            self.nombres_titulos_atributos_task(),
+            self.personas_produccion_task(),
+            self.personajes_task(),
+            self.episodios_task(),
+            self.ratings_task(),
+        )
+        
+        print("\n🔄 FASE 4: ACTUALIZACIONES FINALES")
+        print("-" * 60)
+        self.scan(self.conocido_por_task())
+
+    def load_all_sequential(self):
+        """Carga por fases ejecutando cada loader por separado"""
+        print("\n📦 FASE 1: CATÁLOGOS")
+        print("-" * 60)
+        self.load_professions()
+        self.load_genres()
+        self.load_title_types()
+        self.load_attributes()
+        
+        print("\n👥 FASE 2: ENTIDADES PRINCIPALES")
+        print("-" * 60)
+        self.load_personas()
+        self.load_produccion()
+        
+        print("\n🔗 FASE 3: RELACIONES")
+        print("-" * 60)
+        self.load_top_profesiones()
+        self.load_genero_produccion()
+        self.load_nombres_produccion()
+        self.load_nombres_titulos_atributos()
+        self.load_personas_produccion()
+        self.load_personajes()
+        self.load_episodios()
+        
+        print("\n🔄 FASE 4: ACTUALIZACIONES FINALES")
+        print("-" * 60)
+        self.update_ratings()
+        self.update_conocido_por()
\ No newline at end of file
@@ -0,0 +1,244 @@
+import json
+import os
+import re
+import psycopg2
+from concurrent.futures import ThreadPoolExecutor
+
+# Tablas que carga IMDBDataLoader
+LOAD_TABLES = [
+    'profesiones', 'generos', 'tipo_produccion', 'atributos',
+    'personas', 'produccion',
+    'top_profesiones', 'genero_produccion', 'nombres_produccion', 'nombres_titulos_atributos',
+    'personas_produccion', 'personajes', 'episodios',
+]
+
+# Tablas cuya PRIMARY KEY se puede eliminar durante la carga. Las demás se
+# conservan porque los INSERT ... ON CONFLICT necesitan el índice único.
+DROPPABLE_KEYS = ['personajes']
+
+
+class IndexManager:
+    """Elimina índices, FKs y PKs diferibles antes de la carga masiva y los reconstruye después
+
+    Las definiciones se leen del catálogo (pg_get_indexdef / pg_get_constraintdef)
+    y, si hay state_path, se guardan en disco para poder reconstruirlas aunque el
+    proceso muera a mitad de la carga. Con schema distinto de public (staging) las
+    definiciones se leen de source_schema y se aplican en schema. Todo DROP, ALTER
+    y CREATE lleva el esquema explícito: con search_path = schema, public un nombre
+    sin esquema que no existe en schema resolvería a la tabla o índice de public.
+    """
+
+    def __init__(self, db_config, tables=None, droppable_keys=None, state_path=None, workers=4,
+                 schema='public', source_schema=None):
+        self.db_config = db_config
+        self.schema = schema
+        self.source_schema = source_schema or schema
+        self.tables = tables or LOAD_TABLES
+        self.droppable_keys = DROPPABLE_KEYS if droppable_keys is None else droppable_keys
+        self.state_path = state_path
+        self.workers = workers
+        self.definitions = None
+
+    def connect(self):
+        connection = psycopg2.connect(**self.db_config)
+        cursor = connection.cursor()
+        cursor.execute("SET maintenance_work_mem = '1GB';")
+        cursor.execute(f"SET search_path = {self.schema}, public;")
+        cursor.close()
+        connection.commit()
+        return connection
+
+    def capture(self, cursor):
+        """Lee del catálogo índices secundarios, FKs y PKs/UNIQUE diferibles"""
+        # Con search_path = source_schema las referencias de las FKs salen sin esquema
+        cursor.execute(f"SET search_path = {self.source_schema};")
+        cursor.execute("""
+            SELECT c.relname, i.relname, pg_get_indexdef(ix.indexrelid)
+            FROM pg_index ix
+            JOIN pg_class i ON i.oid = ix.indexrelid
+            JOIN pg_class c ON c.oid = ix.indrelid
+            WHERE c.relname = ANY(%s)
+              AND c.relnamespace = %s::regnamespace
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint con WHERE con.conindid = ix.indexrelid)
+            ORDER BY 1, 2
+        """, (self.tables, self.source_schema))
+        indexes = [{'table': t, 'name': n, 'definition': d} for t, n, d in cursor.fetchall()]
+
+        cursor.execute("""
+            SELECT c.relname, con.conname, con.contype, pg_get_constraintdef(con.oid)
+            FROM pg_constraint con
+            JOIN pg_class c ON c.oid = con.conrelid
+            WHERE c.relname = ANY(%s)
+              AND c.relnamespace = %s::regnamespace
+              AND (con.contype = 'f' OR (con.contype IN ('p', 'u') AND c.relname = ANY(%s)))
+            ORDER BY 1, 2
+        """, (self.tables, self.source_schema, self.droppable_keys))
+        constraints = [
+            {'table': t, 'name': n, 'type': ct, 'definition': d}
+            for t, n, ct, d in cursor.fetchall()
+        ]
+        cursor.execute(f"SET search_path = {self.schema}, public;")
+
+        return {
+            'indexes': indexes,
+            'keys': [c for c in constraints if c['type'] != 'f'],
+            'foreign_keys': [c for c in constraints if c['type'] == 'f'],
+        }
+
+    def qualified_index(self, definition):
+        """Definición de índice aplicada a la tabla de self.schema (con o sin esquema de origen)"""
+        return re.sub(r" ON (ONLY )?(?:\w+\.)?(\w+) USING ", rf" ON \g<1>{self.schema}.\2 USING ", definition, count=1)
+
+    def schema_indexes(self, cursor):
+        """Nombres de los índices secundarios (sin constraint) de las tablas en self.schema"""
+        cursor.execute("""
+            SELECT i.relname
+            FROM pg_index ix
+            JOIN pg_class i ON i.oid = ix.indexrelid
+            JOIN pg_class c ON c.oid = ix.indrelid
+            WHERE c.relname = ANY(%s)
+              AND c.relnamespace = %s::regnamespace
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint con WHERE con.conindid = ix.indexrelid)
+            ORDER BY 1
+        """, (self.tables, self.schema))
+        return [name for (name,) in cursor.fetchall()]
+
+    def save_state(self):
+        if not self.state_path:
+            return
+        os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.definitions, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def load_state(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return None
+        with open(self.state_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def drop_all(self):
+        """Captura las definiciones y elimina FKs, PKs diferibles e índices"""
+        print("\n🧹 Eliminando índices y constraints antes de la carga...")
+        connection = self.connect()
+        cursor = connection.cursor()
+
+        # Si una carga anterior murió antes de reconstruir, sus definiciones
+        # guardadas son las únicas que quedan
+        self.definitions = self.load_state() or self.capture(cursor)
+        self.save_state()
+
+        for fk in self.definitions['foreign_keys']:
+            cursor.execute(f"ALTER TABLE {self.schema}.{fk['table']} DROP CONSTRAINT IF EXISTS {fk['name']}")
+        for key in self.definitions['keys']:
+            cursor.execute(f"ALTER TABLE {self.schema}.{key['table']} DROP CONSTRAINT IF EXISTS {key['name']}")
+        # Los nombres reales de self.schema: en staging pueden no coincidir con los de origen
+        for name in self.schema_indexes(cursor):
+            cursor.execute(f"DROP INDEX IF EXISTS {self.schema}.{name}")
+
+        connection.commit()
+        cursor.close()
+        connection.close()
+
+        print(f"  → {len(self.definitions['foreign_keys'])} FKs, {len(self.definitions['keys'])} PKs/UNIQUE "
+              f"y {len(self.definitions['indexes'])} índices eliminados")
+
+    def run_per_table(self, statements):
+        """Ejecuta [(tabla, sql)] con una conexión por tabla, tablas en paralelo"""
+        by_table = {}
+        for table, statement in statements:
+            by_table.setdefault(table, []).append(statement)
+
+        def run_table(table):
+            errors = []
+            connection = self.connect()
+            cursor = connection.cursor()
+            for statement in by_table[table]:
+                try:
+                    cursor.execute(statement)
+                    connection.commit()
+                except Exception as e:
+                    connection.rollback()
+                    errors.append((statement, e))
+            cursor.close()
+            connection.close()
+            return errors
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(run_table, list(by_table)))
+        return [error for errors in results for error in errors]
+
+    def rebuild_all(self):
+        """Reconstruye índices y PKs en paralelo por tabla y agrega las FKs como NOT VALID"""
+        if self.definitions is None:
+            return
+
+        print("\n🏗️  Reconstruyendo índices y constraints...")
+        statements = [
+            (key['table'], f"ALTER TABLE {self.schema}.{key['table']} ADD CONSTRAINT {key['name']} {key['definition']}")
+            for key in self.definitions['keys']
+        ] + [
+            (index['table'], self.qualified_index(index['definition']))
+            for index in self.definitions['indexes']
+        ]
+        errors = self.run_per_table(statements)
+
+        # Las FKs bloquean también la tabla referenciada: se agregan en serie y
+        # sin revisar filas (NOT VALID); la revisión queda para validate_all
+        connection = self.connect()
+        cursor = connection.cursor()
+        for fk in self.definitions['foreign_keys']:
+            try:
+                cursor.execute(
+                    f"ALTER TABLE {self.schema}.{fk['table']} ADD CONSTRAINT {fk['name']} {fk['definition']} NOT VALID"
+                )
+                connection.commit()
+            except Exception as e:
+                connection.rollback()
+                errors.append((fk['name'], e))
+        cursor.close()
+        connection.close()
+
+        for statement, e in errors:
+            print(f"⚠️  Error reconstruyendo {statement}: {e}")
+
+        if not errors:
+            print(f"✅ {len(statements) + len(self.definitions['foreign_keys'])} índices y constraints reconstruidos")
+            if self.state_path and os.path.exists(self.state_path):
+                os.remove(self.state_path)
+        return errors
+
+    def validate_all(self):
+        """Valida las FKs y confirma que cada índice exista y sea válido"""
+        if self.definitions is None:
+            return
+
+        print("\n🔍 Validando índices y constraints...")
+        errors = self.run_per_table([
+            (fk['table'], f"ALTER TABLE {self.schema}.{fk['table']} VALIDATE CONSTRAINT {fk['name']}")
+            for fk in self.definitions['foreign_keys']
+        ])
+        for statement, e in errors:
+            print(f"⚠️  {statement}: {e}")
+
+        connection = self.connect()
+        cursor = connection.cursor()
+        names = [i['name'] for i in self.definitions['indexes']] + [k['name'] for k in self.definitions['keys']]
+        cursor.execute("""
+            SELECT i.relname
+            FROM pg_index ix
+            JOIN pg_class i ON i.oid = ix.indexrelid
+            WHERE i.relname = ANY(%s) AND i.relnamespace = %s::regnamespace AND ix.indisvalid
+        """, (names, self.schema))
+        valid = {name for (name,) in cursor.fetchall()}
+        cursor.close()
+        connection.close()
+
+        missing = [name for name in names if name not in valid]
+        for name in missing:
+            print(f"⚠️  Índice faltante o inválido: {name}")
+
+        if not errors and not missing:
+            print("✅ Índices y constraints válidos")
+        return not errors and not missing
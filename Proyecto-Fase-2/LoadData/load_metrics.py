@@ -0,0 +1,313 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Métricas de la carga por loader (load_* / update_*): filas, bytes leídos y
+# tiempo de lectura/parseo, transformación y escritura en la base
+
+STEP_FIELDS = [
+    'rows_produced', 'rows_inserted', 'bytes_read',
+    'parse_seconds', 'transform_seconds', 'insert_seconds', 'wall_seconds',
+]
+
+# Loader al que se atribuye el trabajo hecho fuera de un paso (p.ej. reintentos finales)
+OTHER_STEP = 'other'
+
+# Intervalo de muestreo de la memoria residente mientras hay un paso abierto
+RSS_SAMPLE_SECONDS = 0.05
+
+
+def peak_rss_bytes(children=False):
+    """Pico de memoria residente del proceso (o del mayor hijo); None si no se puede medir"""
+    if resource is not None:
+        who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+        peak = resource.getrusage(who).ru_maxrss
+        # ru_maxrss está en KB en Linux y en bytes en macOS
+        return peak if sys.platform == 'darwin' else peak * 1024
+    if children:
+        return None
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    return getattr(info, 'peak_wset', info.rss)
+
+
+def current_rss_bytes():
+    """Memoria residente actual del proceso; None si no se puede medir"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+class RssSampler:
+    """Pico de memoria residente de cada paso, muestreado por un hilo
+
+    ru_maxrss es el pico de toda la vida del proceso: en cada paso repetiría el
+    de cualquier paso anterior. open() abre una ventana con la memoria actual,
+    el hilo la sube con cada muestra y close() devuelve el máximo de la ventana.
+    """
+
+    def __init__(self, interval=RSS_SAMPLE_SECONDS):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.active = threading.Event()
+        self.windows = {}
+        self.pid = None
+
+    def sample(self):
+        rss = current_rss_bytes()
+        if rss is None:
+            return
+        with self.lock:
+            for token, peak in self.windows.items():
+                self.windows[token] = max(peak, rss)
+
+    def run(self):
+        while True:
+            self.active.wait()
+            time.sleep(self.interval)
+            self.sample()
+
+    def open(self):
+        """Abre una ventana; devuelve su token, o None si no se puede medir"""
+        rss = current_rss_bytes()
+        if rss is None:
+            return None
+        # El hilo no sobrevive a un fork: cada proceso arranca el suyo
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            threading.Thread(target=self.run, name='rss-sampler', daemon=True).start()
+        token = object()
+        with self.lock:
+            self.windows[token] = rss
+        self.active.set()
+        return token
+
+    def close(self, token):
+        if token is None:
+            return None
+        self.sample()
+        with self.lock:
+            peak = self.windows.pop(token)
+            if not self.windows:
+                self.active.clear()
+        return peak
+
+
+def input_size(file_path):
+    """Tamaño del TSV que se va a leer (o de su .gz si solo existe comprimido)"""
+    for path in (file_path, file_path + '.gz'):
+        if os.path.exists(path):
+            return os.path.getsize(path)
+    return 0
+
+
+class LoadMetrics:
+    """Contadores y tiempos por loader, con reporte JSON y formato texto de Prometheus
+
+    step(key) atribuye a un loader el trabajo del bloque: lo medido con
+    timed('insert_seconds') o timed('parse_seconds') dentro del bloque se
+    descuenta y el resto del tiempo cuenta como transformación.
+
+    add_batch() guarda la trayectoria de tamaños de batch por tabla (BatchSizer).
+    peak_rss_bytes de cada paso es el pico muestreado mientras el paso estaba
+    abierto; el del reporte (y el de los hijos) es el de todo el proceso.
+    """
+
+    def __init__(self):
+        self.steps = {}
+        self.rss = RssSampler()
+        self.files = {}
+        # {tabla: [[filas, bytes, segundos], ...]} en orden de escritura
+        self.batches = {}
+        self.current = None
+        self.started = time.time()
+
+    def stats(self, key=None):
+        key = key or self.current or OTHER_STEP
+        if key not in self.steps:
+            self.steps[key] = dict.fromkeys(STEP_FIELDS, 0)
+            self.steps[key]['peak_rss_bytes'] = None
+        return self.steps[key]
+
+    @contextmanager
+    def step(self, key):
+        previous = self.current
+        self.current = key
+        stats = self.stats(key)
+        measured_before = stats['insert_seconds'] + stats['parse_seconds']
+        rss_window = self.rss.open()
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            elapsed = time.perf_counter() - start
+            measured = stats['insert_seconds'] + stats['parse_seconds'] - measured_before
+            stats['wall_seconds'] += elapsed
+            stats['transform_seconds'] += max(0.0, elapsed - measured)
+            peak = self.rss.close(rss_window)
+            if peak is not None:
+                stats['peak_rss_bytes'] = max(stats['peak_rss_bytes'] or 0, peak)
+            self.current = previous
+
+    @contextmanager
+    def timed(self, field):
+        """Suma la duración del bloque a `field` del paso actual"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stats()[field] += time.perf_counter() - start
+
+    def count(self, field, value):
+        self.stats()[field] += value
+
+    def file_stats(self, file_name):
+        return self.files.setdefault(file_name, {'bytes_read': 0, 'parse_seconds': 0.0, 'chunks': 0})
+
+    def add_file(self, file_name, file_path, keys):
+        """Registra la lectura de un archivo para los loaders que lo consumen"""
+        size = input_size(file_path)
+        self.file_stats(file_name)['bytes_read'] += size
+        for key in keys:
+            self.stats(key)['bytes_read'] += size
+
+    def add_parse(self, file_name, seconds, keys):
+        """Tiempo de lectura/parseo de un chunk, repartido entre los loaders que lo comparten"""
+        stats = self.file_stats(file_name)
+        stats['parse_seconds'] += seconds
+        stats['chunks'] += 1
+        for key in keys:
+            self.stats(key)['parse_seconds'] += seconds / len(keys)
+
+    def timed_chunks(self, file_name, chunks, keys):
+        """Itera los chunks midiendo el tiempo de obtener cada uno"""
+        iterator = iter(chunks)
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+            self.add_parse(file_name, time.perf_counter() - start, keys)
+            yield chunk
+
+    def add_batch(self, table, rows, size, seconds):
+        """Registra un batch escrito (puede llamarse desde los hilos de WriterPool)"""
+        self.batches.setdefault(table, []).append([rows, int(size), round(seconds, 4)])
+
+    def snapshot(self):
+        return {'steps': self.steps, 'files': self.files, 'batches': self.batches}
+
+    def merge(self, snapshot):
+        """Suma las métricas de otro proceso (workers de PhaseScheduler)"""
+        for key, values in snapshot['steps'].items():
+            stats = self.stats(key)
+            for field in STEP_FIELDS:
+                stats[field] += values[field]
+            if values['peak_rss_bytes'] is not None:
+                stats['peak_rss_bytes'] = max(stats['peak_rss_bytes'] or 0, values['peak_rss_bytes'])
+        for file_name, values in snapshot['files'].items():
+            stats = self.file_stats(file_name)
+            for field, value in values.items():
+                stats[field] += value
+        for table, trajectory in snapshot.get('batches', {}).items():
+            self.batches.setdefault(table, []).extend(trajectory)
+
+    def report(self):
+        steps = {}
+        for key, stats in self.steps.items():
+            steps[key] = dict(stats)
+            steps[key]['rows_per_second'] = (
+                stats['rows_inserted'] / stats['wall_seconds'] if stats['wall_seconds'] else None
+            )
+        return {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'elapsed_seconds': time.time() - self.started,
+            'peak_rss_bytes': peak_rss_bytes(),
+            'peak_rss_children_bytes': peak_rss_bytes(children=True),
+            'steps': steps,
+            'files': self.files,
+            'batches': {
+                table: {
+                    'count': len(trajectory),
+                    'rows': sum(rows for rows, _, _ in trajectory),
+                    'bytes': sum(size for _, size, _ in trajectory),
+                    'seconds': sum(seconds for _, _, seconds in trajectory),
+                    'trajectory': trajectory,
+                }
+                for table, trajectory in self.batches.items()
+            },
+        }
+
+    def write_json(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def prometheus(self):
+        """Métricas en formato texto de Prometheus (textfile collector de node_exporter)"""
+        metrics = [
+            ('rows_produced', 'imdb_load_rows_produced_total', 'counter', 'Filas generadas por el loader'),
+            ('rows_inserted', 'imdb_load_rows_inserted_total', 'counter', 'Filas escritas en la base'),
+            ('bytes_read', 'imdb_load_bytes_read_total', 'counter', 'Bytes de TSV leídos'),
+            ('parse_seconds', 'imdb_load_parse_seconds_total', 'counter', 'Segundos leyendo y parseando TSV'),
+            ('transform_seconds', 'imdb_load_transform_seconds_total', 'counter', 'Segundos transformando filas'),
+            ('insert_seconds', 'imdb_load_insert_seconds_total', 'counter', 'Segundos esperando a la base'),
+            ('wall_seconds', 'imdb_load_wall_seconds_total', 'counter', 'Segundos totales del loader'),
+            ('peak_rss_bytes', 'imdb_load_peak_rss_bytes', 'gauge', 'Pico de memoria residente durante el loader'),
+        ]
+        lines = []
+        for field, name, kind, help_text in metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key in sorted(self.steps):
+                value = self.steps[key][field]
+                if value is not None:
+                    lines.append(f'{name}{{step="{key}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus())
+        os.replace(tmp_path, path)
+
+    def print_report(self):
+        print("\n📊 MÉTRICAS POR LOADER")
+        print("-" * 60)
+        for key, stats in self.steps.items():
+            rate = stats['rows_inserted'] / stats['wall_seconds'] if stats['wall_seconds'] else 0
+            rss = f"{stats['peak_rss_bytes'] / (1024 * 1024):,.0f} MB" if stats['peak_rss_bytes'] else "-"
+            print(f"   {key:<32} {stats['rows_inserted']:>12,} filas  {rate:>10,.0f} filas/s  "
+                  f"parseo {stats['parse_seconds']:.1f}s  transf. {stats['transform_seconds']:.1f}s  "
+                  f"base {stats['insert_seconds']:.1f}s  RSS {rss}")
+        if self.batches:
+            print("\n📏 TAMAÑO DE BATCH POR TABLA (primero → último)")
+            for table, trajectory in self.batches.items():
+                first, last = trajectory[0], trajectory[-1]
+                print(f"   {table:<32} {len(trajectory):>6,} batches  "
+                      f"{first[0]:>9,} → {last[0]:>9,} filas  "
+                      f"{first[1] / 1024:>9,.0f} → {last[1] / 1024:>9,.0f} KB  "
+                      f"{first[2]:.2f}s → {last[2]:.2f}s")
@@ -0,0 +1,84 @@
+import io
+import os
+import pandas as pd
+from copy_stream import build_text_buffer, build_binary_buffer
+
+# Parseo multiproceso de los TSV grandes (title.principals, title.akas): el archivo
+# se divide en rangos de bytes alineados a fin de línea, cada proceso convierte su
+# rango en un buffer listo para COPY y el proceso principal los envía en orden
+
+# Tamaño objetivo de cada rango; los rangos dependen solo del archivo y de este
+# valor, no del número de procesos, así que la salida y el journal son deterministas
+RANGE_BYTES = 64 * 1024 * 1024
+
+# Loader del proceso parser (sin conexión, solo para los builders de filas)
+_range_loader = None
+
+
+class RangeTask:
+    """Carga de un TSV por rangos de bytes (alternativa a ScanTask para archivos grandes)
+
+    builder es el nombre de un método del loader que recibe un DataFrame del
+    rango y devuelve las filas del INSERT `query`.
+    """
+
+    def __init__(self, name, key, file_name, usecols, builder, query):
+        self.name = name
+        self.key = key
+        self.file_name = file_name
+        self.usecols = usecols
+        self.builder = builder
+        self.query = query
+
+
+def line_ranges(file_path, range_bytes=None):
+    """Encabezado y [(inicio, fin)] de bytes del archivo, cada rango con líneas completas"""
+    range_bytes = range_bytes or RANGE_BYTES
+    size = os.path.getsize(file_path)
+
+    with open(file_path, 'rb') as f:
+        header = f.readline()
+        start = f.tell()
+        count = max(1, -(-(size - start) // range_bytes))
+
+        bounds = [start]
+        for i in range(1, count):
+            # El corte avanza hasta el siguiente fin de línea
+            f.seek(start + (size - start) * i // count)
+            f.readline()
+            bounds.append(max(f.tell(), bounds[-1]))
+        bounds.append(size)
+
+    return header, [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def read_range(file_path, header, start, end, usecols, read_params):
+    """DataFrame de las líneas entre los bytes start y end"""
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        block = f.read(end - start)
+    return pd.read_csv(io.BytesIO(header + block), usecols=usecols, **read_params)
+
+
+def init_range_worker(tsv_path, catalogs):
+    """Crea el loader del proceso parser con los catálogos ya cargados"""
+    global _range_loader
+    from imdb_loader import IMDBDataLoader
+
+    _range_loader = IMDBDataLoader({}, tsv_path)
+    _range_loader.set_catalog_state(catalogs)
+
+
+def parse_range(file_path, header, start, end, task, read_params, type_names=None):
+    """Convierte un rango en (buffer COPY en bytes, filas); type_names activa el formato binario"""
+    df = read_range(file_path, header, start, end, task.usecols, read_params)
+    records = getattr(_range_loader, task.builder)(df)
+
+    if type_names:
+        buffer = build_binary_buffer(records, type_names)
+    else:
+        buffer = build_text_buffer(records)
+    payload = buffer.getvalue()
+    if isinstance(payload, str):
+        payload = payload.encode('utf-8')
+    return payload, len(records)
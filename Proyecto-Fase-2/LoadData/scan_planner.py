@@ -0,0 +1,177 @@
+import os
+from contextlib import nullcontext
+
+# Orden de lectura de los archivos IMDB: las entidades se leen antes que las
+# relaciones que dependen de ellas (p.ej. principals antes que crew)
+FILE_ORDER = [
+    'name.basics.tsv',
+    'title.basics.tsv',
+    'title.akas.tsv',
+    'title.principals.tsv',
+    'title.crew.tsv',
+    'title.episode.tsv',
+    'title.ratings.tsv',
+]
+
+DEFAULT_CHUNKSIZE = 1000000
+
+
+class ScanTask:
+    """Un loader expresado como consumidores de chunks por archivo + un cierre"""
+
+    def __init__(self, name, on_finish=None, key=None):
+        self.name = name
+        self.on_finish = on_finish
+        # Identificador estable para el journal de checkpoints
+        self.key = key or name
+        self.consumers = []
+        self.checkpointed = set()
+
+    def consume(self, file_name, on_chunk, usecols=None, checkpoint=True):
+        """Registra un callback para cada chunk de file_name (usecols=None → todas)
+
+        checkpoint=False para consumidores cuyo efecto no es durable (p.ej. tablas
+        temporales): al reanudar se vuelven a leer desde el inicio.
+        """
+        self.consumers.append((file_name, usecols, on_chunk))
+        if checkpoint:
+            self.checkpointed.add(id(on_chunk))
+        return self
+
+    def files(self):
+        return [file_name for file_name, _, _ in self.consumers]
+
+
+class TSVScanPlanner:
+    """Lee cada archivo TSV una sola vez y reparte cada chunk a todos sus consumidores"""
+
+    def __init__(self, reader, tsv_path, chunksizes=None, journal=None, metrics=None):
+        self.reader = reader
+        self.tsv_path = tsv_path
+        self.chunksizes = chunksizes or {}
+        self.journal = journal
+        self.metrics = metrics
+        self.tasks = []
+        # Claves de las tareas que no terminaron (error en un chunk o en el cierre)
+        self.failed = []
+
+    def register(self, *tasks):
+        for task in tasks:
+            if self.journal and self.journal.is_done(task.key):
+                print(f"  ⏭️  {task.name} ya completado (checkpoint)")
+                continue
+            self.tasks.append(task)
+        return self
+
+    def step(self, task):
+        """Atribuye a la tarea el tiempo y las filas del bloque (LoadMetrics)"""
+        return self.metrics.step(task.key) if self.metrics else nullcontext()
+
+    def start_chunk(self, task, file_name, on_chunk):
+        """Primer chunk a procesar según el journal (0 sin checkpoint)"""
+        if not self.journal or id(on_chunk) not in task.checkpointed:
+            return 0
+        return self.journal.file_progress(task.key, file_name)['chunks']
+
+    def file_order(self):
+        """Archivos a leer, en FILE_ORDER y luego en orden de registro"""
+        files = []
+        for task in self.tasks:
+            for file_name in task.files():
+                if file_name not in files:
+                    files.append(file_name)
+        known = [f for f in FILE_ORDER if f in files]
+        return known + [f for f in files if f not in known]
+
+    def columns_for(self, file_name):
+        """Unión de columnas pedidas por los consumidores (None → todas)"""
+        columns = []
+        for task in self.tasks:
+            for consumer_file, usecols, _ in task.consumers:
+                if consumer_file != file_name:
+                    continue
+                if usecols is None:
+                    return None
+                columns.extend(c for c in usecols if c not in columns)
+        return columns
+
+    def run(self):
+        order = self.file_order()
+        last_file = {
+            id(task): max(order.index(f) for f in task.files()) if task.files() else -1
+            for task in self.tasks
+        }
+        failed = set()
+        failed_tasks = set()
+
+        for task in self.tasks:
+            if last_file[id(task)] == -1:
+                self.finish(task)
+
+        for position, file_name in enumerate(order):
+            consumers = [
+                (task, on_chunk, self.start_chunk(task, file_name, on_chunk))
+                for task in self.tasks
+                for consumer_file, _, on_chunk in task.consumers
+                if consumer_file == file_name
+            ]
+            chunksize = self.chunksizes.get(file_name, DEFAULT_CHUNKSIZE)
+            # Chunks ya confirmados por todos los consumidores: no se parsean
+            skip_chunks = min((start for _, _, start in consumers), default=0)
+            read_params = {
+                'usecols': self.columns_for(file_name),
+                'chunksize': chunksize,
+            }
+            if skip_chunks:
+                read_params['skiprows'] = range(1, skip_chunks * chunksize + 1)
+                print(f"  ⏩ {file_name}: reanudando desde el chunk {skip_chunks}")
+            file_path = os.path.join(self.tsv_path, file_name)
+            chunk_iterator = self.reader(file_path, **read_params)
+
+            if chunk_iterator is not None and self.metrics:
+                keys = list(dict.fromkeys(task.key for task, _, _ in consumers))
+                self.metrics.add_file(file_name, file_path, keys)
+                chunk_iterator = self.metrics.timed_chunks(file_name, chunk_iterator, keys)
+
+            if chunk_iterator is not None:
+                try:
+                    for chunk_index, df_chunk in enumerate(chunk_iterator, skip_chunks):
+                        for task, on_chunk, start in consumers:
+                            if (id(task), id(on_chunk)) in failed or chunk_index < start:
+                                continue
+                            checkpointed = self.journal and id(on_chunk) in task.checkpointed
+                            try:
+                                if checkpointed:
+                                    self.journal.start_chunk(task.key, file_name, chunk_index)
+                                with self.step(task):
+                                    on_chunk(df_chunk)
+                                if checkpointed:
+                                    self.journal.finish_chunk()
+                            except Exception as e:
+                                print(f"⚠️  Error en {task.name} ({file_name}): {e}")
+                                failed.add((id(task), id(on_chunk)))
+                                failed_tasks.add(id(task))
+                                if checkpointed:
+                                    self.journal.position = None
+                except Exception as e:
+                    print(f"⚠️  Error leyendo {file_name}: {e}")
+                    failed_tasks.update(id(task) for task, _, _ in consumers)
+
+            for task in self.tasks:
+                if last_file[id(task)] == position:
+                    self.finish(task, completed=id(task) not in failed_tasks)
+
+    def finish(self, task, completed=True):
+        if task.on_finish is not None:
+            print(f"  → {task.name}")
+            try:
+                with self.step(task):
+                    task.on_finish()
+            except Exception as e:
+                print(f"⚠️  Error en {task.name}: {e}")
+                self.failed.append(task.key)
+                return
+        if not completed:
+            self.failed.append(task.key)
+        elif self.journal:
+            self.journal.mark_done(task.key)
@@ -0,0 +1,160 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import timedelta
+from multiprocessing.util import Finalize
+from load_metrics import LoadMetrics
+
+# Dependencias entre loaders: catálogos antes que relaciones,
+# ratings y conocido_por después de las tablas que actualizan
+LOADER_DEPENDENCIES = {
+    'load_professions': [],
+    'load_genres': [],
+    'load_title_types': [],
+    'load_attributes': [],
+    'load_personas': [],
+    'load_produccion': ['load_title_types'],
+    'load_top_profesiones': ['load_professions', 'load_personas'],
+    'load_genero_produccion': ['load_genres', 'load_produccion'],
+    'load_nombres_produccion': ['load_produccion'],
+    'load_nombres_titulos_atributos': ['load_attributes', 'load_nombres_produccion'],
+    'load_personas_produccion': ['load_professions', 'load_personas', 'load_produccion'],
+    'load_personajes': ['load_personas', 'load_produccion'],
+    'load_episodios': ['load_produccion'],
+    'update_ratings': ['load_produccion'],
+    'update_conocido_por': ['load_personas_produccion'],
+}
+
+PHASES = [
+    ('📦 FASE 1: CATÁLOGOS', ['load_professions', 'load_genres', 'load_title_types', 'load_attributes']),
+    ('👥 FASE 2: ENTIDADES PRINCIPALES', ['load_personas', 'load_produccion']),
+    ('🔗 FASE 3: RELACIONES', [
+        'load_top_profesiones', 'load_genero_produccion', 'load_nombres_produccion',
+        'load_nombres_titulos_atributos', 'load_personas_produccion', 'load_personajes',
+        'load_episodios',
+    ]),
+    ('🔄 FASE 4: ACTUALIZACIONES FINALES', ['update_ratings', 'update_conocido_por']),
+]
+
+# Loader del proceso worker (una conexión por worker)
+_worker_loader = None
+
+
+def init_worker(db_config, tsv_path, options):
+    """Crea el loader y la conexión del proceso worker"""
+    global _worker_loader
+    from imdb_loader import IMDBDataLoader
+
+    _worker_loader = IMDBDataLoader(db_config, tsv_path, **options)
+    _worker_loader.connect_db()
+    Finalize(_worker_loader, _worker_loader.disconnect_db, exitpriority=10)
+
+
+def run_loader(method_name, catalogs):
+    """Ejecuta un loader en el worker
+
+    Devuelve (inicio, fin, catálogos actualizados, métricas, pasos que no terminaron).
+    """
+    _worker_loader.set_catalog_state(catalogs)
+    _worker_loader.metrics = LoadMetrics()
+    _worker_loader.failed_steps = []
+    start = time.time()
+    getattr(_worker_loader, method_name)()
+    # La cola en memoria del worker no sobrevive al proceso: se reintenta aquí
+    with _worker_loader.metrics.step(method_name):
+        _worker_loader.retry_failed_batches()
+    return (start, time.time(), _worker_loader.catalog_state(), _worker_loader.metrics.snapshot(),
+            _worker_loader.failed_steps)
+
+
+class PhaseScheduler:
+    """Ejecuta los loaders en paralelo respetando LOADER_DEPENDENCIES
+
+    Un loader que falla no habilita a los que dependen de él: esos (y los que
+    dependen de ellos) se omiten. run() devuelve los fallidos y los omitidos.
+    """
+
+    def __init__(self, loader, workers):
+        self.loader = loader
+        self.workers = workers
+        self.timings = {}
+        self.failed = []
+        self.skipped = []
+
+    def skip_dependents(self, pending):
+        """Quita de pending los loaders que dependen de uno fallido u omitido"""
+        blocked = set(self.failed)
+        blocked.update(self.skipped)
+        changed = True
+        while changed:
+            changed = False
+            for method_name, deps in list(pending.items()):
+                missing = [d for d in deps if d in blocked]
+                if missing:
+                    del pending[method_name]
+                    self.skipped.append(method_name)
+                    blocked.add(method_name)
+                    changed = True
+                    print(f"  ⏭️  {method_name} omitido (depende de {', '.join(missing)})")
+
+    def run(self):
+        pending = dict(LOADER_DEPENDENCIES)
+        done = set()
+        running = {}
+        catalogs = self.loader.catalog_state()
+        origin = time.time()
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=init_worker,
+            initargs=(self.loader.db_config, self.loader.tsv_path, self.loader.worker_options())
+        ) as executor:
+            while pending or running:
+                self.skip_dependents(pending)
+                if not pending and not running:
+                    break
+                for method_name in [m for m, deps in pending.items() if all(d in done for d in deps)]:
+                    del pending[method_name]
+                    running[executor.submit(run_loader, method_name, catalogs)] = method_name
+                    print(f"  ▶️  {method_name}")
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    method_name = running.pop(future)
+                    try:
+                        start, end, state, metrics, failed_steps = future.result()
+                    except Exception as e:
+                        print(f"❌ Error en {method_name}: {e}")
+                        self.failed.append(method_name)
+                        continue
+                    
+                    self.loader.metrics.merge(metrics)
+                    self.timings[method_name] = (start, end)
+                    if failed_steps:
+                        print(f"❌ {method_name} incompleto ({timedelta(seconds=round(end - start))})")
+                        self.failed.append(method_name)
+                        continue
+                    
+                    for name, values in state.items():
+                        catalogs[name].update(values)
+                    print(f"  ✅ {method_name} ({timedelta(seconds=round(end - start))})")
+                    done.add(method_name)
+
+        self.loader.set_catalog_state(catalogs)
+        self.print_report(time.time() - origin)
+        return self.failed + self.skipped
+
+    def print_report(self, total):
+        """Reporte de tiempos por fase y por loader"""
+        print("\n⏱️  TIEMPOS POR FASE")
+        print("-" * 60)
+        for phase, methods in PHASES:
+            spans = [self.timings[m] for m in methods if m in self.timings]
+            if not spans:
+                continue
+            elapsed = max(end for _, end in spans) - min(start for start, _ in spans)
+            print(f"{phase}: {timedelta(seconds=round(elapsed))}")
+            for method_name in methods:
+                if method_name in self.timings:
+                    start, end = self.timings[method_name]
+                    print(f"   {method_name:<32} {timedelta(seconds=round(end - start))}")
+        print(f"Total (paralelo, {self.workers} workers): {timedelta(seconds=round(total))}")
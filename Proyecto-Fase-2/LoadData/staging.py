@@ -0,0 +1,139 @@
+import psycopg2
+from concurrent.futures import ThreadPoolExecutor
+from index_manager import LOAD_TABLES
+
+# Esquemas para la carga en staging: las tablas nuevas se cargan en STAGING_SCHEMA
+# y al intercambiarse las anteriores quedan en PREVIOUS_SCHEMA hasta borrarse
+STAGING_SCHEMA = 'imdb_staging'
+PREVIOUS_SCHEMA = 'imdb_previous'
+
+
+def wal_lsn(db_config):
+    """Posición actual del WAL (pg_lsn como texto)"""
+    connection = psycopg2.connect(**db_config)
+    cursor = connection.cursor()
+    cursor.execute("SELECT pg_current_wal_lsn()::text")
+    lsn = cursor.fetchone()[0]
+    cursor.close()
+    connection.close()
+    return lsn
+
+
+def wal_bytes_since(db_config, lsn):
+    """Bytes de WAL generados desde `lsn` (incluye cualquier otra actividad del servidor)"""
+    connection = psycopg2.connect(**db_config)
+    cursor = connection.cursor()
+    cursor.execute("SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), %s::pg_lsn)", (lsn,))
+    wal_bytes = int(cursor.fetchone()[0])
+    cursor.close()
+    connection.close()
+    return wal_bytes
+
+
+class StagingSwap:
+    """Copias UNLOGGED de las tablas para recargar sin tocar las tablas en uso
+
+    prepare() crea las copias en STAGING_SCHEMA, el loader escribe en ellas con
+    search_path = STAGING_SCHEMA, set_logged() las vuelve LOGGED y swap() las
+    mueve a public en una sola transacción.
+    """
+
+    def __init__(self, db_config, tables=None, workers=4):
+        self.db_config = db_config
+        self.tables = tables or LOAD_TABLES
+        self.workers = workers
+
+    def prepare(self):
+        """Crea (o recrea vacías) las copias UNLOGGED de cada tabla"""
+        print(f"\n🧪 Preparando tablas UNLOGGED en {STAGING_SCHEMA}...")
+        connection = psycopg2.connect(**self.db_config)
+        cursor = connection.cursor()
+
+        cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {STAGING_SCHEMA}")
+        for table in self.tables:
+            cursor.execute(f"DROP TABLE IF EXISTS {STAGING_SCHEMA}.{table} CASCADE")
+            # Defaults y CHECKs sin índices: los secundarios y las FKs los crea IndexManager
+            # al final; la PK/UNIQUE se agrega con el mismo nombre (la necesita ON CONFLICT)
+            cursor.execute(
+                f"CREATE UNLOGGED TABLE {STAGING_SCHEMA}.{table} "
+                f"(LIKE public.{table} INCLUDING ALL EXCLUDING INDEXES)"
+            )
+            for name, definition in self.unique_constraints(cursor, table):
+                cursor.execute(f"ALTER TABLE {STAGING_SCHEMA}.{table} ADD CONSTRAINT {name} {definition}")
+
+            cursor.execute("SELECT relreplident FROM pg_class WHERE oid = %s::regclass", (f"public.{table}",))
+            if cursor.fetchone()[0] == 'f':
+                cursor.execute(f"ALTER TABLE {STAGING_SCHEMA}.{table} REPLICA IDENTITY FULL")
+
+        connection.commit()
+        cursor.close()
+        connection.close()
+        print(f"  → {len(self.tables)} tablas creadas")
+
+    def unique_constraints(self, cursor, table):
+        """[(nombre, definición)] de la PK y los UNIQUE de public.table"""
+        cursor.execute("""
+            SELECT conname, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype IN ('p', 'u')
+            ORDER BY conname
+        """, (f"public.{table}",))
+        return cursor.fetchall()
+
+    def set_logged(self):
+        """Convierte las copias a LOGGED (una conexión por tabla, en paralelo)"""
+        print("\n📝 Convirtiendo tablas de staging a LOGGED...")
+
+        def set_table_logged(table):
+            connection = psycopg2.connect(**self.db_config)
+            cursor = connection.cursor()
+            cursor.execute(f"ALTER TABLE {STAGING_SCHEMA}.{table} SET LOGGED")
+            connection.commit()
+            cursor.close()
+            connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            list(executor.map(set_table_logged, self.tables))
+
+    def owned_sequences(self, cursor, schema, table):
+        """[(columna, secuencia)] de las secuencias SERIAL que pertenecen a la tabla"""
+        cursor.execute("""
+            SELECT a.attname, s.relname
+            FROM pg_depend d
+            JOIN pg_class s ON s.oid = d.objid AND s.relkind = 'S'
+            JOIN pg_attribute a ON a.attrelid = d.refobjid AND a.attnum = d.refobjsubid
+            WHERE d.refobjid = %s::regclass AND d.deptype IN ('a', 'i')
+        """, (f"{schema}.{table}",))
+        return cursor.fetchall()
+
+    def swap(self):
+        """Intercambia staging y public en una transacción y borra las tablas anteriores"""
+        print("\n🔀 Intercambiando tablas de staging...")
+        connection = psycopg2.connect(**self.db_config)
+        cursor = connection.cursor()
+
+        cursor.execute(f"DROP SCHEMA IF EXISTS {PREVIOUS_SCHEMA} CASCADE")
+        cursor.execute(f"CREATE SCHEMA {PREVIOUS_SCHEMA}")
+
+        sequences = {table: self.owned_sequences(cursor, 'public', table) for table in self.tables}
+        for table in self.tables:
+            cursor.execute(f"ALTER TABLE public.{table} SET SCHEMA {PREVIOUS_SCHEMA}")
+        for table in self.tables:
+            cursor.execute(f"ALTER TABLE {STAGING_SCHEMA}.{table} SET SCHEMA public")
+
+        # Las secuencias SERIAL se mueven con su tabla dueña; la tabla nueva usa la
+        # misma secuencia, así que pasa a ser su dueña antes de borrar la anterior
+        for table, owned in sequences.items():
+            for column, sequence in owned:
+                cursor.execute(f"ALTER SEQUENCE {PREVIOUS_SCHEMA}.{sequence} OWNED BY NONE")
+                cursor.execute(f"ALTER SEQUENCE {PREVIOUS_SCHEMA}.{sequence} SET SCHEMA public")
+                cursor.execute(f"ALTER SEQUENCE public.{sequence} OWNED BY public.{table}.{column}")
+
+        connection.commit()
+        print("✅ Tablas intercambiadas")
+
+        cursor.execute(f"DROP SCHEMA {PREVIOUS_SCHEMA} CASCADE")
+        cursor.execute(f"DROP SCHEMA IF EXISTS {STAGING_SCHEMA} CASCADE")
+        connection.commit()
+        cursor.close()
+        connection.close()
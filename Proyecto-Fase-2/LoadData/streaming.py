@@ -0,0 +1,125 @@
+import numpy as np
+
+# Utilidades para cargar en streaming con memoria acotada
+
+
+class IdBitmap:
+    """Conjunto de IDs numéricos no negativos como bitmap (1 bit por ID)
+
+    Reemplaza a set() de ints de Python: 40M de IDs de IMDB ocupan ~5 MB.
+    """
+
+    def __init__(self, capacity=1 << 20):
+        self.bits = np.zeros((capacity >> 3) + 1, dtype=np.uint8)
+
+    def _grow(self, max_id):
+        needed = (int(max_id) >> 3) + 1
+        if needed > len(self.bits):
+            size = max(needed, len(self.bits) * 2)
+            bits = np.zeros(size, dtype=np.uint8)
+            bits[:len(self.bits)] = self.bits
+            self.bits = bits
+
+    def contains(self, ids):
+        """Máscara booleana: qué IDs ya están en el conjunto"""
+        ids = np.asarray(ids, dtype=np.int64)
+        result = np.zeros(len(ids), dtype=bool)
+        in_range = (ids >= 0) & ((ids >> 3) < len(self.bits))
+        sel = ids[in_range]
+        result[in_range] = (self.bits[sel >> 3] >> (sel & 7).astype(np.uint8)) & 1 == 1
+        return result
+
+    def add(self, ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        ids = ids[ids >= 0]
+        if len(ids) == 0:
+            return
+        self._grow(ids.max())
+        np.bitwise_or.at(self.bits, ids >> 3, (1 << (ids & 7)).astype(np.uint8))
+
+    def add_new(self, ids):
+        """Agrega los IDs y devuelve solo los que no estaban (en orden, sin repetidos)"""
+        ids = np.asarray(ids, dtype=np.int64)
+        _, first = np.unique(ids, return_index=True)
+        ids = ids[np.sort(first)]
+        new_ids = ids[~self.contains(ids)]
+        self.add(new_ids)
+        return new_ids
+
+    def __len__(self):
+        return int(np.unpackbits(self.bits).sum())
+
+
+class RatingsIndex:
+    """Votos y rating por ID de título para unirlos a las filas de produccion
+
+    Los IDs quedan en un arreglo int64 ordenado con votos (int64, -1 = sin dato)
+    y rating (float64, NaN = sin dato) paralelos: ~20 bytes por título con rating,
+    en lugar de un arreglo denso del tamaño del mayor tconst.
+    """
+
+    def __init__(self):
+        self.parts = []
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.votes = np.zeros(0, dtype=np.int64)
+        self.ratings = np.zeros(0, dtype=np.float64)
+
+    def add(self, ids, votes, ratings):
+        self.parts.append((
+            np.asarray(ids, dtype=np.int64),
+            np.asarray(votes, dtype=np.int64),
+            np.asarray(ratings, dtype=np.float64),
+        ))
+
+    def freeze(self):
+        """Ordena por ID; si un título se repite queda su última fila (como el UPDATE por batches)"""
+        if not self.parts:
+            return self
+        ids, votes, ratings = (np.concatenate(arrays) for arrays in zip(*self.parts))
+        self.parts = []
+        order = np.argsort(ids, kind='stable')
+        ids = ids[order]
+        last = np.append(ids[1:] != ids[:-1], True)
+        self.ids = ids[last]
+        self.votes = votes[order][last]
+        self.ratings = ratings[order][last]
+        return self
+
+    def lookup(self, ids):
+        """(votos, rating) de cada ID; -1 y NaN para los títulos sin rating"""
+        ids = np.asarray(ids, dtype=np.int64)
+        votes = np.full(len(ids), -1, dtype=np.int64)
+        ratings = np.full(len(ids), np.nan, dtype=np.float64)
+        if len(self.ids) == 0:
+            return votes, ratings
+        positions = np.minimum(np.searchsorted(self.ids, ids), len(self.ids) - 1)
+        found = self.ids[positions] == ids
+        votes[found] = self.votes[positions[found]]
+        ratings[found] = self.ratings[positions[found]]
+        return votes, ratings
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class RowSink:
+    """Destino de filas para insert_fast: en streaming inserta cada chunk al llegar,
+    si no acumula todo y lo inserta en close()"""
+
+    def __init__(self, loader, query, batch_size=10000, streaming=True):
+        self.loader = loader
+        self.query = query
+        self.batch_size = batch_size
+        self.streaming = streaming
+        self.pending = []
+
+    def add(self, rows):
+        if self.streaming:
+            self.loader.insert_fast(self.query, rows, batch_size=self.batch_size)
+        else:
+            self.pending.extend(rows)
+
+    def close(self):
+        if self.pending:
+            self.loader.insert_fast(self.query, self.pending, batch_size=self.batch_size)
+            self.pending = []
@@ -0,0 +1,361 @@
+import gzip
+import json
+import os
+import zlib
+import numpy as np
+import pandas as pd
+
+# Generador de TSV con la forma de los dumps de IMDB (mismas columnas, \N como
+# nulo, listas con ',' y '\x02') para medir el loader sin descargar los dumps.
+# Con scale=1.0 las cantidades de filas son parecidas a las de IMDB (2024); las
+# distribuciones son aproximadas pero conservan el sesgo: pocas personas y
+# títulos concentran la mayoría de las relaciones.
+
+NULL = '\\N'
+
+# Filas con scale=1.0
+FULL_TITLES = 11_000_000
+FULL_PERSONS = 14_000_000
+
+# Filas promedio por título en los archivos de relaciones
+AKAS_PER_TITLE = 4.7
+PRINCIPALS_PER_TITLE = 8.3
+RATED_SHARE = 0.14
+# Personas de title.principals que no están en name.basics
+MISSING_PERSON_SHARE = 0.005
+
+# Títulos (o personas) por bloque de generación
+BLOCK_SIZE = 200_000
+
+MARKER_FILE = 'synthetic.json'
+
+TITLE_TYPES = {
+    'tvEpisode': 0.78, 'short': 0.09, 'movie': 0.065, 'video': 0.026, 'tvSeries': 0.024,
+    'tvMovie': 0.013, 'tvMiniSeries': 0.005, 'tvSpecial': 0.004, 'videoGame': 0.004,
+    'tvShort': 0.001, 'tvPilot': 0.0001,
+}
+SERIES_TYPES = ['tvSeries', 'tvMiniSeries']
+
+GENRES = [
+    'Drama', 'Comedy', 'Documentary', 'Talk-Show', 'Reality-TV', 'Romance', 'Family', 'News',
+    'Animation', 'Crime', 'Action', 'Adventure', 'Music', 'Game-Show', 'Horror', 'Thriller',
+    'Mystery', 'Fantasy', 'Sport', 'Biography', 'History', 'Sci-Fi', 'Musical', 'War',
+    'Western', 'Adult', 'Film-Noir', 'Short',
+]
+
+PROFESSIONS = [
+    'actor', 'actress', 'miscellaneous', 'producer', 'writer', 'director', 'camera_department',
+    'cinematographer', 'editor', 'composer', 'art_department', 'sound_department',
+    'assistant_director', 'music_department', 'visual_effects', 'make_up_department',
+    'animation_department', 'casting_department', 'costume_department', 'editorial_department',
+    'location_management', 'production_manager', 'special_effects', 'stunts', 'transportation_department',
+    'script_department', 'set_decorator', 'production_designer', 'casting_director', 'costume_designer',
+    'talent_agent', 'publicist', 'executive', 'legal', 'manager', 'choreographer', 'archive_footage',
+]
+
+CATEGORIES = {
+    'actor': 0.27, 'actress': 0.20, 'self': 0.13, 'writer': 0.10, 'director': 0.08,
+    'producer': 0.06, 'archive_footage': 0.02, 'editor': 0.03, 'composer': 0.03,
+    'cinematographer': 0.03, 'production_designer': 0.01, 'casting_director': 0.01,
+    'archive_sound': 0.001,
+}
+ACTING_CATEGORIES = ['actor', 'actress', 'self']
+
+JOBS = ['producer', 'executive producer', 'director of photography', 'screenplay', 'story', 'novel']
+
+REGIONS = [
+    'US', 'GB', 'FR', 'DE', 'JP', 'ES', 'IT', 'IN', 'CA', 'BR', 'MX', 'RU', 'AU', 'XWW', 'SE',
+    'PT', 'GR', 'FI', 'PL', 'TR', 'HU', 'AR', 'NL', 'KR', 'DK', 'UA', 'CZ', 'RO', 'BG', 'NO',
+    'BE', 'AT', 'CN', 'TW', 'HK', 'IL', 'CO', 'CL', 'PE', 'XEU', 'VE', 'PH', 'ID', 'TH',
+]
+LANGUAGES = ['en', 'ja', 'es', 'fr', 'de', 'hi', 'ru', 'it', 'pt', 'tr', 'sv', 'cmn', 'ko', 'ar', 'qbn']
+
+AKA_TYPES = {
+    NULL: 0.60, 'imdbDisplay': 0.20, 'original': 0.10, 'alternative': 0.04, 'working': 0.02,
+    'festival': 0.01, 'dvd': 0.01, 'tv': 0.01, 'video': 0.005, 'alternative\x02dvd': 0.005,
+}
+AKA_ATTRIBUTES = {
+    NULL: 0.95, 'literal title': 0.01, 'new title': 0.008, 'short title': 0.008,
+    'working title': 0.006, 'complete title': 0.005, 'transliterated title': 0.005,
+    'original subtitled version': 0.004, 'new title\x02short title': 0.004,
+}
+
+
+def zipf_weights(count, exponent=1.0):
+    """Pesos decrecientes (el primer valor es el más frecuente)"""
+    weights = 1.0 / np.arange(1, count + 1) ** exponent
+    return weights / weights.sum()
+
+
+def choose(rng, values, size, weights=None):
+    """Muestra `size` valores (dict valor → peso, o lista con pesos opcionales)"""
+    if isinstance(values, dict):
+        weights = np.array(list(values.values()), dtype=float)
+        values = list(values)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float) / np.sum(weights)
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=size, p=weights)]
+
+
+def skewed_ids(rng, count, size, power=2.5):
+    """IDs 1..count con sesgo hacia los primeros (títulos/personas populares)"""
+    return 1 + np.floor(count * rng.random(size) ** power).astype(np.int64)
+
+
+def imdb_ids(prefix, ids):
+    return prefix + pd.Series(ids).astype(str).str.zfill(7)
+
+
+def join_lists(columns, sep=','):
+    """Une columnas de valores (None = vacío) en listas; sin valores → \\N"""
+    joined = pd.Series([''] * len(columns[0]), dtype=object)
+    for column in columns:
+        column = pd.Series(column, dtype=object)
+        present = column.notna()
+        joined = joined.where(~present, joined.where(joined == '', joined + sep) + column.fillna(''))
+    return joined.where(joined != '', NULL)
+
+
+def unique_picks(rng, values, size, max_items, weights, count_weights):
+    """Hasta max_items valores distintos por fila, ordenados por su posición en `values`"""
+    counts = rng.choice(max_items + 1, size=size, p=count_weights)
+    picks = rng.choice(len(values), size=(size, max_items), p=weights)
+    picks = np.sort(picks, axis=1)
+    # Repetidos y posiciones sobre el número de elementos de la fila se descartan
+    keep = np.arange(max_items) < counts[:, None]
+    keep[:, 1:] &= picks[:, 1:] != picks[:, :-1]
+    names = np.asarray(values, dtype=object)
+    return [np.where(keep[:, i], names[picks[:, i]], None) for i in range(max_items)]
+
+
+def years(rng, size, null_share, newest=2025, spread=18.0, oldest=1874):
+    values = np.clip(newest - np.floor(rng.exponential(spread, size)).astype(int), oldest, newest)
+    return np.where(rng.random(size) < null_share, NULL, values.astype(str))
+
+
+class SyntheticIMDB:
+    """Genera los siete TSV de IMDB en out_dir para un factor de escala"""
+
+    def __init__(self, out_dir, scale=0.001, seed=42, compress=False):
+        self.out_dir = out_dir
+        self.scale = scale
+        self.seed = seed
+        self.compress = compress
+        self.titles = max(100, int(FULL_TITLES * scale))
+        self.persons = max(100, int(FULL_PERSONS * scale))
+        self.rows = {}
+
+        rng = self.rng('title_types')
+        self.type_codes = rng.choice(len(TITLE_TYPES), size=self.titles, p=self.type_weights())
+        self.type_names = np.array(list(TITLE_TYPES), dtype=object)
+        series_codes = [list(TITLE_TYPES).index(t) for t in SERIES_TYPES]
+        self.series_ids = np.flatnonzero(np.isin(self.type_codes, series_codes)) + 1
+
+    def type_weights(self):
+        weights = np.array(list(TITLE_TYPES.values()))
+        return weights / weights.sum()
+
+    def rng(self, *key):
+        """Generador determinista por archivo y bloque"""
+        return np.random.default_rng([self.seed] + [zlib.crc32(str(k).encode('utf-8')) for k in key])
+
+    def is_current(self):
+        """True si out_dir ya tiene los archivos de esta escala y semilla"""
+        try:
+            with open(os.path.join(self.out_dir, MARKER_FILE), encoding='utf-8') as f:
+                marker = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return marker.get('scale') == self.scale and marker.get('seed') == self.seed \
+            and marker.get('compress') == self.compress
+
+    def generate(self):
+        """Escribe todos los archivos y devuelve {archivo: filas}"""
+        os.makedirs(self.out_dir, exist_ok=True)
+        print(f"🧬 Generando IMDB sintético (escala {self.scale}, {self.titles:,} títulos, "
+              f"{self.persons:,} personas) en {self.out_dir}")
+
+        self.write('name.basics.tsv', [
+            'nconst', 'primaryName', 'birthYear', 'deathYear', 'primaryProfession', 'knownForTitles'
+        ], self.name_basics, self.persons)
+        self.write('title.basics.tsv', [
+            'tconst', 'titleType', 'primaryTitle', 'originalTitle', 'isAdult', 'startYear',
+            'endYear', 'runtimeMinutes', 'genres'
+        ], self.title_basics, self.titles)
+        self.write('title.akas.tsv', [
+            'titleId', 'ordering', 'title', 'region', 'language', 'types', 'attributes', 'isOriginalTitle'
+        ], self.title_akas, self.titles)
+        self.write('title.principals.tsv', [
+            'tconst', 'ordering', 'nconst', 'category', 'job', 'characters'
+        ], self.title_principals, self.titles)
+        self.write('title.crew.tsv', ['tconst', 'directors', 'writers'], self.title_crew, self.titles)
+        self.write('title.episode.tsv', [
+            'tconst', 'parentTconst', 'seasonNumber', 'episodeNumber'
+        ], self.title_episode, self.titles)
+        self.write('title.ratings.tsv', ['tconst', 'averageRating', 'numVotes'], self.title_ratings, self.titles)
+
+        with open(os.path.join(self.out_dir, MARKER_FILE), 'w', encoding='utf-8') as f:
+            json.dump({'scale': self.scale, 'seed': self.seed, 'compress': self.compress, 'rows': self.rows},
+                      f, indent=2)
+        return self.rows
+
+    def write(self, file_name, header, block_rows, count):
+        """Escribe el archivo por bloques de BLOCK_SIZE IDs"""
+        path = os.path.join(self.out_dir, file_name + ('.gz' if self.compress else ''))
+        opener = gzip.open(path, 'wt', encoding='utf-8', compresslevel=1) if self.compress \
+            else open(path, 'w', encoding='utf-8', newline='\n')
+        rows = 0
+        with opener as f:
+            f.write('\t'.join(header) + '\n')
+            for start in range(1, count + 1, BLOCK_SIZE):
+                ids = np.arange(start, min(start + BLOCK_SIZE, count + 1), dtype=np.int64)
+                columns = block_rows(self.rng(file_name, start), ids)
+                if not len(columns[0]):
+                    continue
+                lines = pd.Series(columns[0], dtype=object).str.cat(
+                    [pd.Series(c, dtype=object) for c in columns[1:]], sep='\t'
+                )
+                f.write('\n'.join(lines.tolist()) + '\n')
+                rows += len(lines)
+        self.rows[file_name] = rows
+        print(f"  → {file_name}: {rows:,} filas")
+
+    # ==========================================
+    # ARCHIVOS
+    # ==========================================
+
+    def name_basics(self, rng, ids):
+        size = len(ids)
+        birth = years(rng, size, 0.93, newest=2010, spread=35.0)
+        has_birth = birth != NULL
+        death_years = np.minimum(
+            np.where(has_birth, birth, '0').astype(int) + rng.integers(40, 95, size), 2025
+        )
+        death = np.where(has_birth & (rng.random(size) < 0.3), death_years.astype(str), NULL)
+
+        professions = join_lists(unique_picks(
+            rng, PROFESSIONS, size, 3, zipf_weights(len(PROFESSIONS), 1.2), [0.1, 0.55, 0.25, 0.1]
+        ))
+        known_count = rng.choice(5, size=size, p=[0.15, 0.35, 0.2, 0.1, 0.2])
+        known = [
+            np.where(known_count > i, imdb_ids('tt', skewed_ids(rng, self.titles, size)), None)
+            for i in range(4)
+        ]
+
+        return [
+            imdb_ids('nm', ids), 'Person ' + pd.Series(ids).astype(str), birth, death,
+            professions, join_lists(known),
+        ]
+
+    def title_basics(self, rng, ids):
+        size = len(ids)
+        types = self.type_names[self.type_codes[ids - 1]]
+        start = years(rng, size, 0.12)
+        is_series = np.isin(types, SERIES_TYPES)
+        has_start = start != NULL
+        end_years = np.where(has_start, start, '0').astype(int) + rng.geometric(0.3, size)
+        end = np.where(is_series & has_start & (rng.random(size) < 0.5), np.minimum(end_years, 2025).astype(str), NULL)
+
+        runtime = np.where(
+            types == 'movie', rng.normal(95, 20, size),
+            np.where(types == 'short', rng.uniform(1, 30, size), rng.normal(30, 12, size))
+        )
+        runtime = np.where(rng.random(size) < 0.68, NULL, np.maximum(1, runtime).astype(int).astype(str))
+
+        genres = join_lists(unique_picks(
+            rng, GENRES, size, 3, zipf_weights(len(GENRES), 0.9), [0.05, 0.45, 0.3, 0.2]
+        ))
+        title = 'Title ' + pd.Series(ids).astype(str)
+
+        return [
+            imdb_ids('tt', ids), types, title, title,
+            np.where(rng.random(size) < 0.015, '1', '0'), start, end, runtime, genres,
+        ]
+
+    def per_title(self, rng, ids, mean, cap):
+        """(IDs repetidos, ordering) con un número de filas por título de media `mean`"""
+        counts = np.minimum(rng.geometric(1.0 / mean, len(ids)), cap)
+        repeated = np.repeat(ids, counts)
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        ordering = np.arange(len(repeated)) - starts + 1
+        return repeated, ordering
+
+    def title_akas(self, rng, ids):
+        title_ids, ordering = self.per_title(rng, ids, AKAS_PER_TITLE, 250)
+        size = len(title_ids)
+        types = choose(rng, AKA_TYPES, size)
+        original = types == 'original'
+        region = np.where(
+            original | (rng.random(size) < 0.05), NULL,
+            choose(rng, REGIONS, size, zipf_weights(len(REGIONS), 1.1))
+        )
+        language = np.where(
+            rng.random(size) < 0.65, NULL, choose(rng, LANGUAGES, size, zipf_weights(len(LANGUAGES), 1.0))
+        )
+
+        return [
+            imdb_ids('tt', title_ids), ordering.astype(str),
+            'Title ' + pd.Series(title_ids).astype(str) + ' (' + pd.Series(ordering).astype(str) + ')',
+            region, language, types, choose(rng, AKA_ATTRIBUTES, size), np.where(original, '1', '0'),
+        ]
+
+    def title_principals(self, rng, ids):
+        title_ids, ordering = self.per_title(rng, ids, PRINCIPALS_PER_TITLE, 75)
+        size = len(title_ids)
+        extra = max(1, int(self.persons * MISSING_PERSON_SHARE))
+        person_ids = np.where(
+            rng.random(size) < MISSING_PERSON_SHARE,
+            self.persons + rng.integers(1, extra + 1, size),
+            skewed_ids(rng, self.persons, size, power=2.0)
+        )
+        category = choose(rng, CATEGORIES, size)
+        job = np.where(
+            np.isin(category, ACTING_CATEGORIES) | (rng.random(size) < 0.8), NULL, choose(rng, JOBS, size)
+        )
+
+        character = 'Character ' + pd.Series(rng.integers(1, 5000, size)).astype(str)
+        second = 'Character ' + pd.Series(rng.integers(1, 5000, size)).astype(str)
+        characters = np.where(
+            rng.random(size) < 0.08,
+            '["' + character + '","' + second + '"]',
+            '["' + character + '"]'
+        )
+        characters = np.where(np.isin(category, ACTING_CATEGORIES), characters, NULL)
+
+        return [
+            imdb_ids('tt', title_ids), ordering.astype(str), imdb_ids('nm', person_ids),
+            category, job, characters,
+        ]
+
+    def title_crew(self, rng, ids):
+        size = len(ids)
+        directors_count = rng.choice(3, size=size, p=[0.3, 0.6, 0.1])
+        writers_count = rng.choice(4, size=size, p=[0.45, 0.35, 0.15, 0.05])
+        directors = [
+            np.where(directors_count > i, imdb_ids('nm', skewed_ids(rng, self.persons, size)), None)
+            for i in range(2)
+        ]
+        writers = [
+            np.where(writers_count > i, imdb_ids('nm', skewed_ids(rng, self.persons, size)), None)
+            for i in range(3)
+        ]
+        return [imdb_ids('tt', ids), join_lists(directors), join_lists(writers)]
+
+    def title_episode(self, rng, ids):
+        episode_code = list(TITLE_TYPES).index('tvEpisode')
+        ids = ids[self.type_codes[ids - 1] == episode_code]
+        size = len(ids)
+        if not len(self.series_ids):
+            return [[]]
+        # Las series populares (primeras en series_ids) tienen más episodios
+        parents = self.series_ids[np.floor(len(self.series_ids) * rng.random(size) ** 2.0).astype(int)]
+        season = np.where(rng.random(size) < 0.2, NULL, rng.geometric(0.3, size).astype(str))
+        episode = np.where(rng.random(size) < 0.2, NULL, rng.geometric(0.05, size).astype(str))
+        return [imdb_ids('tt', ids), imdb_ids('tt', parents), season, episode]
+
+    def title_ratings(self, rng, ids):
+        ids = ids[rng.random(len(ids)) < RATED_SHARE]
+        size = len(ids)
+        rating = np.clip(np.round(rng.normal(6.6, 1.3, size), 1), 1.0, 10.0)
+        votes = np.maximum(5, rng.lognormal(4.0, 1.8, size)).astype(np.int64)
+        return [imdb_ids('tt', ids), pd.Series(rating).map('{:.1f}'.format), votes.astype(str)]
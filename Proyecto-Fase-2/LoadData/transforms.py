@@ -0,0 +1,104 @@
+import pandas as pd
+
+# Transformaciones columnares equivalentes a los helpers por fila de IMDBDataLoader
+# (extract_id, year_to_date, minutes_to_int, format_text, parse_characters)
+
+INT_PATTERN = r'\s*[+-]?\d+\s*'
+
+
+def parse_ints(series):
+    """Equivalente vectorizado de int(valor), NA si no es un entero válido"""
+    if pd.api.types.is_integer_dtype(series.dtype):
+        # Columnas ya enteras (cache columnar de TSVCache)
+        return series.astype('Int64')
+    s = series.astype(object).where(series.notna(), None).astype('string')
+    valid = s.str.fullmatch(INT_PATTERN).fillna(False).astype(bool)
+    result = pd.Series(pd.NA, index=series.index, dtype='Int64')
+    if valid.any():
+        result[valid] = pd.to_numeric(s[valid].str.strip()).astype('Int64')
+    return result
+
+
+def extract_ids(series):
+    """Equivalente vectorizado de extract_id (nm0000001 → 1)"""
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return series.astype('Int64')
+    return parse_ints(series.astype('string').str.slice(2))
+
+
+def valid_ids(ids):
+    """Máscara de IDs que pasan el `if id:` de los loaders (no nulos y distintos de 0)"""
+    return (ids.notna() & ids.ne(0)).fillna(False).astype(bool)
+
+
+def years_to_dates(series, is_end=False):
+    """Equivalente vectorizado de year_to_date"""
+    years = parse_ints(series)
+    suffix = '-12-31' if is_end else '-01-01'
+    dates = years.astype('string').str.zfill(4) + suffix
+    return dates.astype(object).where(years.notna(), None)
+
+
+def minutes_to_ints(series):
+    """Equivalente vectorizado de minutes_to_int"""
+    return parse_ints(series)
+
+
+def format_texts(series):
+    """Equivalente vectorizado de format_text"""
+    s = series.astype('string')
+    formatted = s.str.replace('_', ' ', regex=False).str.capitalize()
+    empty = s.isna() | (s == '') | (s == '\\N')
+    return formatted.astype(object).where(~empty.fillna(True).astype(bool), None)
+
+
+def truncate_texts(series, length):
+    """Texto recortado a `length` caracteres (NA se conserva)"""
+    return series.astype('string').str.slice(0, length)
+
+
+def explode_list(series, sep=','):
+    """Divide una columna de listas y devuelve un DataFrame (valor, ordinal)
+
+    El índice conserva la fila original. El ordinal cuenta desde 1 e incluye los
+    elementos vacíos, igual que enumerate(valor.split(sep), 1); los elementos
+    vacíos se descartan después de numerar.
+    """
+    s = series.astype('string')
+    s = s[s.notna() & (s != '\\N')]
+    items = s.str.split(sep, regex=False).explode()
+    ordinal = items.groupby(level=0).cumcount() + 1
+    items = items.str.strip()
+    keep = (items.notna() & (items != '')).astype(bool)
+    return pd.DataFrame({'value': items[keep], 'ordinal': ordinal[keep]})
+
+
+def split_characters(series):
+    """Equivalente vectorizado de parse_characters (una fila por personaje)"""
+    s = series.astype('string')
+    s = s[s.notna() & (s != '') & (s != '\\N')]
+    is_list = (s.str.startswith('[') & s.str.endswith(']')).astype(bool)
+
+    content = (
+        s[is_list].str.slice(1, -1)
+        .str.replace('","', '\t', regex=False)
+        .str.replace('"', '', regex=False)
+    )
+    items = content.str.split('\t', regex=False).explode().str.strip()
+    items = items[(items.notna() & (items != '')).astype(bool)]
+
+    chars = pd.concat([items, s[~is_list]]).sort_index(kind='stable')
+    return chars[(chars != '\\N').astype(bool)]
+
+
+def to_records(*columns):
+    """Convierte columnas alineadas a una lista de tuplas con tipos nativos (NA → None)"""
+    lists = []
+    for col in columns:
+        if isinstance(col, pd.Series):
+            values = col.astype(object).where(col.notna(), None).tolist()
+        else:
+            values = list(col)
+        lists.append(values)
+    return list(zip(*lists))
+
@@ -0,0 +1,269 @@
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from transforms import extract_ids, parse_ints
+
+# Cache columnar de los TSV de IMDB: cada columna se guarda en archivos binarios
+# que se leen con np.memmap en lugar de volver a parsear el TSV
+
+# Columnas tconst/nconst → int64 (mismo resultado que extract_ids)
+ID_COLUMNS = {'tconst', 'nconst', 'titleId', 'parentTconst'}
+
+# Enteros que se guardan como int64 solo si str(int) reproduce el texto original
+INT_COLUMNS = {
+    'ordering', 'startYear', 'endYear', 'birthYear', 'deathYear',
+    'runtimeMinutes', 'seasonNumber', 'episodeNumber', 'numVotes',
+}
+
+# Columnas de pocos valores distintos → códigos int32 + categorías
+CATEGORY_COLUMNS = {
+    'titleType', 'genres', 'primaryProfession', 'region', 'language', 'category',
+    'types', 'attributes', 'isAdult', 'isOriginalTitle', 'averageRating',
+}
+
+CACHE_VERSION = 1
+
+
+def column_kind(column, string_columns=()):
+    if column in string_columns:
+        return 'str'
+    if column in ID_COLUMNS:
+        return 'id'
+    if column in INT_COLUMNS:
+        return 'int'
+    if column in CATEGORY_COLUMNS:
+        return 'category'
+    return 'str'
+
+
+class LossyColumn(Exception):
+    """Un valor de una columna INT_COLUMNS no se puede guardar como entero sin perder el texto"""
+
+    def __init__(self, column):
+        super().__init__(f"columna {column} no es entera")
+        self.column = column
+
+
+class CacheWriter:
+    """Escribe un TSV chunk por chunk en un directorio temporal del cache"""
+
+    def __init__(self, directory, columns, string_columns=()):
+        self.directory = directory
+        self.kinds = {c: column_kind(c, string_columns) for c in columns}
+        self.rows = 0
+        self.categories = {c: {} for c, kind in self.kinds.items() if kind == 'category'}
+        self.blob_sizes = {c: 0 for c, kind in self.kinds.items() if kind == 'str'}
+        self.files = {}
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+
+        for column, kind in self.kinds.items():
+            if kind == 'str':
+                self.write(column, 'offsets', np.zeros(1, dtype=np.int64))
+
+    def write(self, column, part, values):
+        key = (column, part)
+        if key not in self.files:
+            self.files[key] = open(os.path.join(self.directory, f"{column}.{part}.bin"), 'wb')
+        self.files[key].write(np.ascontiguousarray(values).tobytes())
+
+    def add(self, df):
+        for column, kind in self.kinds.items():
+            values = df[column]
+            missing = values.isna().to_numpy()
+
+            if kind == 'id':
+                ids = extract_ids(values)
+                self.write(column, 'values', ids.fillna(0).to_numpy(dtype=np.int64))
+                self.write(column, 'mask', ids.isna().to_numpy())
+
+            elif kind == 'int':
+                ints = parse_ints(values)
+                present = ~missing
+                lossless = (ints.isna().to_numpy() == missing).all() and (
+                    ints[present].astype('string') == values[present].astype('string')
+                ).all()
+                if not lossless:
+                    raise LossyColumn(column)
+                self.write(column, 'values', ints.fillna(0).to_numpy(dtype=np.int64))
+                self.write(column, 'mask', missing)
+
+            elif kind == 'category':
+                mapping = self.categories[column]
+                for value in values[~missing].unique().tolist():
+                    mapping.setdefault(value, len(mapping))
+                codes = values.map(mapping).fillna(-1).to_numpy(dtype=np.int32)
+                self.write(column, 'codes', codes)
+
+            else:
+                encoded = [v.encode('utf-8') if isinstance(v, str) else b'' for v in values.tolist()]
+                lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+                offsets = self.blob_sizes[column] + np.cumsum(lengths)
+                self.blob_sizes[column] = int(offsets[-1]) if len(offsets) else self.blob_sizes[column]
+                self.write(column, 'blob', np.frombuffer(b''.join(encoded), dtype=np.uint8))
+                self.write(column, 'offsets', offsets)
+                self.write(column, 'mask', missing)
+
+        self.rows += len(df)
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        self.files = {}
+
+    def finish(self, target):
+        """Cierra los archivos, escribe meta.json y publica el directorio de forma atómica"""
+        self.close()
+        meta = {
+            'version': CACHE_VERSION,
+            'rows': self.rows,
+            'columns': list(self.kinds),
+            'kinds': self.kinds,
+            'categories': {c: list(mapping) for c, mapping in self.categories.items()},
+        }
+        with open(os.path.join(self.directory, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        try:
+            os.rename(self.directory, target)
+        except OSError:
+            # Otro worker terminó primero el mismo archivo
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def abort(self):
+        self.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class CachedTSV:
+    """Lectura por chunks de un TSV ya convertido (columnas en np.memmap)"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.rows = self.meta['rows']
+        self.maps = {}
+
+    def part(self, column, name, dtype):
+        key = (column, name)
+        if key not in self.maps:
+            path = os.path.join(self.directory, f"{column}.{name}.bin")
+            if os.path.getsize(path) == 0:
+                self.maps[key] = np.zeros(0, dtype=dtype)
+            else:
+                self.maps[key] = np.memmap(path, dtype=dtype, mode='r')
+        return self.maps[key]
+
+    def column(self, column, start, end):
+        kind = self.meta['kinds'][column]
+
+        if kind in ('id', 'int'):
+            values = np.array(self.part(column, 'values', np.int64)[start:end])
+            mask = np.array(self.part(column, 'mask', np.bool_)[start:end])
+            return pd.arrays.IntegerArray(values, mask)
+
+        if kind == 'category':
+            # Categorical (código -1 = NA): CatalogMap.lookup mapea cada categoría una sola vez
+            codes = np.array(self.part(column, 'codes', np.int32)[start:end])
+            return pd.Categorical.from_codes(codes, categories=self.meta['categories'][column])
+
+        offsets = self.part(column, 'offsets', np.int64)[start:end + 1]
+        mask = self.part(column, 'mask', np.bool_)[start:end]
+        base = int(offsets[0]) if len(offsets) else 0
+        segment = self.part(column, 'blob', np.uint8)[base:int(offsets[-1]) if len(offsets) else 0].tobytes()
+        bounds = (offsets - base).tolist()
+        values = np.array(
+            [segment[a:b].decode('utf-8') for a, b in zip(bounds[:-1], bounds[1:])] or [],
+            dtype=object
+        )
+        values[mask] = np.nan
+        return values
+
+    def frame(self, start, end, usecols=None):
+        columns = usecols or self.meta['columns']
+        return pd.DataFrame(
+            {c: self.column(c, start, end) for c in columns},
+            index=pd.RangeIndex(start, end)
+        )
+
+    def chunks(self, chunksize, start=0, usecols=None):
+        for chunk_start in range(start, self.rows, chunksize):
+            yield self.frame(chunk_start, min(chunk_start + chunksize, self.rows), usecols)
+
+
+class TSVCache:
+    """Cache en disco de TSV parseados, por ruta, tamaño y mtime del archivo"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def entry(self, file_path):
+        stat = os.stat(file_path)
+        key = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}|{CACHE_VERSION}"
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.directory, f"{os.path.basename(file_path)}-{digest}")
+
+    def string_columns_path(self, file_path):
+        return os.path.join(self.directory, f"{os.path.basename(file_path)}.string_columns.json")
+
+    def string_columns(self, file_path):
+        """Columnas de INT_COLUMNS que en este archivo no son enteras"""
+        try:
+            with open(self.string_columns_path(file_path), encoding='utf-8') as f:
+                return set(json.load(f))
+        except (OSError, ValueError):
+            return set()
+
+    def open(self, file_path):
+        """CachedTSV si el archivo ya está en cache, None si no"""
+        entry = self.entry(file_path)
+        if not os.path.exists(os.path.join(entry, 'meta.json')):
+            return None
+        return CachedTSV(entry)
+
+    def remove_stale(self, file_path):
+        """Borra versiones anteriores del mismo archivo (otro tamaño o mtime)"""
+        prefix = f"{os.path.basename(file_path)}-"
+        current = os.path.basename(self.entry(file_path))
+        for name in os.listdir(self.directory):
+            if name.startswith(prefix) and name != current and '.tmp' not in name:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def writer(self, file_path, columns):
+        tmp_dir = f"{self.entry(file_path)}.tmp{os.getpid()}"
+        return CacheWriter(tmp_dir, columns, self.string_columns(file_path))
+
+    def build_through(self, file_path, chunks, usecols=None):
+        """Devuelve los chunks de read_csv (con usecols) mientras los guarda en cache
+
+        Si una columna entera resulta no serlo se descarta el cache de esta lectura
+        y se recuerda para construirlo como texto la próxima vez.
+        """
+        writer = None
+        completed = False
+        try:
+            for chunk in chunks:
+                if writer is None:
+                    writer = self.writer(file_path, list(chunk.columns))
+                if writer:
+                    try:
+                        writer.add(chunk)
+                    except LossyColumn as e:
+                        writer.abort()
+                        writer = False
+                        columns = self.string_columns(file_path) | {e.column}
+                        with open(self.string_columns_path(file_path), 'w', encoding='utf-8') as f:
+                            json.dump(sorted(columns), f)
+                yield chunk[usecols] if usecols else chunk
+            completed = True
+        finally:
+            if writer:
+                if completed:
+                    self.remove_stale(file_path)
+                    writer.finish(self.entry(file_path))
+                else:
+                    writer.abort()
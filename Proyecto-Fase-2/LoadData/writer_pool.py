@@ -0,0 +1,114 @@
+import queue
+import threading
+
+# Pool de conexiones de escritura para insert_fast: N hilos, cada uno con su
+# conexión, escriben los batches mientras el hilo principal sigue leyendo y
+# transformando chunks. Cada hilo tiene una cola acotada: si se llena,
+# insert_fast espera en lugar de acumular batches en memoria.
+#
+# Las filas se reparten por rangos de la primera columna (la clave primaria o
+# su prefijo: id_persona, id_titulo, id_produccion...) y cada rango va siempre
+# al mismo hilo. Dos conexiones nunca escriben la misma clave, así que no se
+# bloquean entre sí en ON CONFLICT y los upserts de una clave se aplican en orden.
+#
+# Los INSERT sin clave de conflicto (personajes, con id SERIAL) van enteros a un
+# solo hilo: el orden de los batches, y por lo tanto los IDs generados, es el
+# mismo que con una sola conexión.
+
+# Ancho de cada rango de IDs: el rango k va al hilo k % conexiones
+PARTITION_SPAN = 10000
+# Batches en espera por hilo antes de que submit() bloquee
+QUEUE_BATCHES = 2
+
+
+class WriterPool:
+    """Hilos de escritura con una conexión cada uno, alimentados por colas acotadas"""
+
+    def __init__(self, connect, write, connections, partition_span=PARTITION_SPAN, queue_batches=QUEUE_BATCHES):
+        # connect() → conexión configurada; write(conexión, query, target, filas) escribe y confirma
+        self.connect = connect
+        self.write = write
+        self.partition_span = partition_span
+        self.queues = [queue.Queue(maxsize=queue_batches) for _ in range(connections)]
+
+        self.lock = threading.Lock()
+        # Filas confirmadas por paso de LoadMetrics y batches que fallaron dos veces
+        self.inserted = {}
+        self.failed = []
+
+        self.threads = [
+            threading.Thread(target=self.run, args=(jobs,), name=f"writer-{n}", daemon=True)
+            for n, jobs in enumerate(self.queues)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def partition(self, batch):
+        """{hilo: filas} según el rango de la primera columna de cada fila"""
+        parts = {}
+        for row in batch:
+            try:
+                index = int(row[0]) // self.partition_span % len(self.queues)
+            except (TypeError, ValueError, IndexError):
+                index = 0
+            parts.setdefault(index, []).append(row)
+        return parts
+
+    def submit(self, step, query, target, batch, ordered=False):
+        """Encola las filas del batch en el hilo de cada rango (bloquea si la cola está llena)
+
+        Con ordered=True el batch completo va al primer hilo, en orden de llegada.
+        """
+        parts = {0: batch} if ordered else self.partition(batch)
+        for index, rows in parts.items():
+            self.queues[index].put((step, query, target, rows))
+
+    def run(self, jobs):
+        connection = None
+        while True:
+            job = jobs.get()
+            if job is None:
+                if connection is not None:
+                    connection.close()
+                jobs.task_done()
+                return
+
+            step, query, target, rows = job
+            try:
+                # Un reintento con conexión nueva; si vuelve a fallar se devuelve en flush()
+                for attempt in range(2):
+                    try:
+                        if connection is None or connection.closed:
+                            connection = self.connect()
+                        self.write(connection, query, target, rows)
+                        with self.lock:
+                            self.inserted[step] = self.inserted.get(step, 0) + len(rows)
+                        break
+                    except Exception as e:
+                        if connection is not None:
+                            try:
+                                connection.rollback()
+                                connection.close()
+                            except Exception:
+                                pass
+                        connection = None
+                        if attempt:
+                            with self.lock:
+                                self.failed.append((step, query, rows, e))
+            finally:
+                jobs.task_done()
+
+    def flush(self):
+        """Espera los batches en cola; devuelve ({paso: filas insertadas}, [(paso, query, filas, error)])"""
+        for jobs in self.queues:
+            jobs.join()
+        with self.lock:
+            inserted, self.inserted = self.inserted, {}
+            failed, self.failed = self.failed, []
+        return inserted, failed
+
+    def close(self):
+        for jobs in self.queues:
+            jobs.put(None)
+        for thread in self.threads:
+            thread.join()
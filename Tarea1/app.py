@@ -8,12 +8,42 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Dimensiones que se crean en bloque: tabla, columna id, caché y columnas del INSERT
+DIMENSION_TABLES = {
+    'category': ('category', 'id_category', 'categories_cache', ('name',)),
+    'country': ('country', 'id_country', 'countries_cache', ('name',)),
+    'director': ('director', 'id_director', 'directors_cache', ('name',)),
+    'actor': ('actor', 'id_actor', 'actors_cache', ('name',)),
+    'rating': ('show_rating', 'id_rating', 'ratings_cache', ('name', 'description')),
+}
+
+# INSERT de show_tv (una fila con execute, varias con executemany)
+SHOW_QUERY = """
+INSERT INTO show_tv (show_id, title, date_added, release_year, duration, 
+                   description, id_category, id_country, id_director, 
+                   id_show_type, id_rating)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
 class NetflixDataNormalizer:
-    def __init__(self, db_config):
+    def __init__(self, db_config, two_pass=True, dimension_batch_size=1000,
+                 bulk_shows=True, show_batch_size=500, actor_batch_size=5000):
         self.db_config = db_config
         self.connection = None
         self.cursor = None
         
+        # Si es True, process_csv crea primero todas las dimensiones faltantes en bloque
+        # y el recorrido de filas solo consulta las cachés
+        self.two_pass = two_pass
+        # Filas por INSERT multi-fila al crear dimensiones
+        self.dimension_batch_size = dimension_batch_size
+        
+        # Si es True, show_tv y show_actor se escriben con INSERTs multi-fila por batch
+        # en lugar de un INSERT por show y por actor
+        self.bulk_shows = bulk_shows
+        self.show_batch_size = show_batch_size
+        self.actor_batch_size = actor_batch_size
+        
         # Cachés para evitar consultas repetidas
         self.categories_cache = {}
         self.countries_cache = {}
@@ -125,6 +155,62 @@ class NetflixDataNormalizer:
             logger.error(f"Error cargando cache: {e}")
             raise
 
+    # Recolecta los valores distintos de cada dimensión (mismo criterio que insert_show)
+    def collect_dimension_values(self, df):
+        values = {dimension: set() for dimension in DIMENSION_TABLES}
+        
+        # Director, país y categoría: solo el primero de la lista, como en insert_show
+        for dimension, column in (('director', 'director'), ('country', 'country'), ('category', 'listed_in')):
+            for value in df[column].dropna().unique():
+                items = self.clean_and_split_string(value)
+                if items:
+                    values[dimension].add(items[0])
+        
+        for value in df['cast'].dropna().unique():
+            values['actor'].update(self.clean_and_split_string(value))
+        
+        for value in df['rating'].dropna().unique():
+            if str(value).strip():
+                values['rating'].add(str(value).strip())
+        
+        return values
+
+    # Vuelve a cargar la caché de una dimensión con un solo SELECT
+    def refresh_dimension_cache(self, dimension):
+        table, id_column, cache_name, _ = DIMENSION_TABLES[dimension]
+        self.cursor.execute(f"SELECT {id_column}, name FROM {table}")
+        setattr(self, cache_name, {row[1]: row[0] for row in self.cursor.fetchall()})
+
+    # Primera pasada: inserta en bloque los valores que no están en caché
+    def create_missing_dimensions(self, df):
+        try:
+            for dimension, names in self.collect_dimension_values(df).items():
+                table, _, cache_name, columns = DIMENSION_TABLES[dimension]
+                cache = getattr(self, cache_name)
+                missing = sorted(name for name in names if name not in cache)
+                if not missing:
+                    continue
+                
+                if dimension == 'rating':
+                    rows = [(name, f"Rating {name}") for name in missing]
+                else:
+                    rows = [(name,) for name in missing]
+                
+                # executemany convierte el INSERT en uno multi-fila por batch; IGNORE
+                # descarta los nombres que la collation considera repetidos
+                placeholders = ', '.join(['%s'] * len(columns))
+                query = f"INSERT IGNORE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+                for i in range(0, len(rows), self.dimension_batch_size):
+                    self.cursor.executemany(query, rows[i:i + self.dimension_batch_size])
+                self.connection.commit()
+                
+                self.refresh_dimension_cache(dimension)
+                logger.info(f"{table}: {len(missing)} registros nuevos, {len(getattr(self, cache_name))} en caché")
+        except Error as e:
+            # Lo que no se haya creado aquí se crea fila por fila en la segunda pasada
+            self.connection.rollback()
+            logger.error(f"Error creando dimensiones en bloque: {e}")
+
     # Limpia y divide strings multivaluados
     def clean_and_split_string(self, value, separator=','):
         if pd.isna(value) or value == '':
@@ -257,65 +343,63 @@ class NetflixDataNormalizer:
                 logger.warning(f"No se pudo parsear la fecha: {date_str}")
                 return None
 
+    # Arma la fila de show_tv (None si el tipo de show no existe)
+    def build_show_record(self, row):
+        # Obtener IDs de las entidades relacionadas
+        show_type_id = self.show_types_cache.get(row['type'])
+        if not show_type_id:
+            logger.error(f"Tipo de show no encontrado: {row['type']}")
+            return None
+
+        # Obtener o crear rating
+        rating_id = self.get_or_create_rating(row['rating']) if pd.notna(row['rating']) else None
+        
+        # Obtener o crear director (solo el primero si hay múltiples)
+        directors = self.clean_and_split_string(row['director'])
+        director_id = None
+        if directors:
+            director_id = self.get_or_create_director(directors[0])
+        
+        # Obtener o crear país (solo el primero si hay múltiples)
+        countries = self.clean_and_split_string(row['country'])
+        country_id = None
+        if countries:
+            country_id = self.get_or_create_country(countries[0])
+        
+        # Obtener o crear categoría (solo la primera si hay múltiples)
+        categories = self.clean_and_split_string(row['listed_in'])
+        category_id = None
+        if categories:
+            category_id = self.get_or_create_category(categories[0])
+        
+        # Parsear fecha
+        date_added = self.parse_date(row['date_added'])
+        
+        # Parsear año de lanzamiento
+        release_year = int(row['release_year']) if pd.notna(row['release_year']) else None
+
+        return (
+            row['show_id'],
+            row['title'],
+            date_added,
+            release_year,
+            row['duration'] if pd.notna(row['duration']) else None,
+            row['description'] if pd.notna(row['description']) else None,
+            category_id,
+            country_id,
+            director_id,
+            show_type_id,
+            rating_id
+        )
+
     # Inserta un show y sus relaciones
     def insert_show(self, row):
         try:
-            # Obtener IDs de las entidades relacionadas
-            show_type_id = self.show_types_cache.get(row['type'])
-            if not show_type_id:
-                logger.error(f"Tipo de show no encontrado: {row['type']}")
+            show_data = self.build_show_record(row)
+            if not show_data:
                 return None
-
-            # Obtener o crear rating
-            rating_id = self.get_or_create_rating(row['rating']) if pd.notna(row['rating']) else None
-            
-            # Obtener o crear director (solo el primero si hay múltiples)
-            directors = self.clean_and_split_string(row['director'])
-            director_id = None
-            if directors:
-                director_id = self.get_or_create_director(directors[0])
-            
-            # Obtener o crear país (solo el primero si hay múltiples)
-            countries = self.clean_and_split_string(row['country'])
-            country_id = None
-            if countries:
-                country_id = self.get_or_create_country(countries[0])
-            
-            # Obtener o crear categoría (solo la primera si hay múltiples)
-            categories = self.clean_and_split_string(row['listed_in'])
-            category_id = None
-            if categories:
-                category_id = self.get_or_create_category(categories[0])
-            
-            # Parsear fecha
-            date_added = self.parse_date(row['date_added'])
             
-            # Parsear año de lanzamiento
-            release_year = int(row['release_year']) if pd.notna(row['release_year']) else None
-
-            # Insertar show_tv principal
-            show_query = """
-INSERT INTO show_tv (show_id, title, date_added, release_year, duration, 
-                   description, id_category, id_country, id_director, 
-                   id_show_type, id_rating)
-VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-"""
-            
-            show_data = (
-                row['show_id'],
-                row['title'],
-                date_added,
-                release_year,
-                row['duration'] if pd.notna(row['duration']) else None,
-                row['description'] if pd.notna(row['description']) else None,
-                category_id,
-                country_id,
-                director_id,
-                show_type_id,
-                rating_id
-            )
-            
-            self.cursor.execute(show_query, show_data)
+            self.cursor.execute(SHOW_QUERY, show_data)
             show_id = self.cursor.lastrowid
             
             logger.debug(f"Show insertado: {row['title']} (ID: {show_id})")
@@ -342,6 +426,99 @@ VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                 except Error as e:
                     logger.warning(f"Error insertando relación actor: {e}")
 
+    # IDs de los actores del cast de un show (crea los que falten)
+    def cast_actor_ids(self, row):
+        actor_ids = []
+        for actor_name in self.clean_and_split_string(row['cast']):
+            actor_id = self.get_or_create_actor(actor_name)
+            if actor_id:
+                actor_ids.append(actor_id)
+        return actor_ids
+
+    # Inserta los shows uno por uno y confirma; devuelve (exitosos, fallidos)
+    def insert_shows_one_by_one(self, rows):
+        successful_inserts = 0
+        failed_inserts = 0
+        for row in rows:
+            if self.insert_show(row):
+                successful_inserts += 1
+            else:
+                failed_inserts += 1
+        self.connection.commit()
+        return successful_inserts, failed_inserts
+
+    # Escribe show_tv y show_actor por batches; devuelve (exitosos, fallidos)
+    def insert_shows_bulk(self, df):
+        successful_inserts = 0
+        failed_inserts = 0
+        rows = df.to_dict('records')
+        
+        for start in range(0, len(rows), self.show_batch_size):
+            batch = rows[start:start + self.show_batch_size]
+            records = []
+            for row in batch:
+                try:
+                    show_data = self.build_show_record(row)
+                    actor_ids = self.cast_actor_ids(row) if show_data else []
+                except Exception as e:
+                    logger.error(f"Error procesando show {row['title']}: {e}")
+                    show_data = None
+                if show_data:
+                    records.append((row, show_data, actor_ids))
+                else:
+                    failed_inserts += 1
+            # Las dimensiones y actores creados al armar las filas se confirman antes
+            # del batch: un rollback del batch no deja IDs inexistentes en las cachés
+            self.connection.commit()
+            if not records:
+                continue
+            
+            missing = []
+            try:
+                # executemany envía un solo INSERT multi-fila para todo el batch
+                self.cursor.executemany(SHOW_QUERY, [show_data for _, show_data, _ in records])
+                
+                # Las claves de show_tv se leen en bloque por show_id
+                show_ids = [show_data[0] for _, show_data, _ in records]
+                placeholders = ', '.join(['%s'] * len(show_ids))
+                self.cursor.execute(
+                    f"SELECT show_id, id_show FROM show_tv WHERE show_id IN ({placeholders})", show_ids
+                )
+                keys = dict(self.cursor.fetchall())
+                
+                actor_records = []
+                for row, show_data, actor_ids in records:
+                    show_key = keys.get(show_data[0])
+                    if show_key is None:
+                        missing.append(row)
+                    else:
+                        actor_records.extend((show_key, actor_id) for actor_id in actor_ids)
+                for i in range(0, len(actor_records), self.actor_batch_size):
+                    self.cursor.executemany(
+                        "INSERT IGNORE INTO show_actor (id_show, id_actor) VALUES (%s, %s)",
+                        actor_records[i:i + self.actor_batch_size]
+                    )
+                
+                self.connection.commit()
+                successful_inserts += len(records) - len(missing)
+            except Error as e:
+                # Un error invalida todo el batch: se repite fila por fila para aislar la fallida
+                self.connection.rollback()
+                logger.warning(f"Error en batch de shows {start + 1}-{start + len(batch)}, "
+                               f"reintentando fila por fila: {e}")
+                missing = [row for row, _, _ in records]
+            
+            if missing:
+                if len(missing) < len(records):
+                    logger.warning(f"{len(missing)} shows sin clave en show_tv, reintentando fila por fila")
+                successful, failed = self.insert_shows_one_by_one(missing)
+                successful_inserts += successful
+                failed_inserts += failed
+            
+            logger.info(f"Procesados {start + len(batch)} registros...")
+        
+        return successful_inserts, failed_inserts
+
     # Procesa el archivo CSV completo
     def process_csv(self, csv_file_path):
         try:
@@ -360,26 +537,33 @@ VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             # Cargar cache
             self.load_cache_data()
             
+            # Crear dimensiones faltantes en bloque
+            if self.two_pass:
+                self.create_missing_dimensions(df)
+            
             # Procesar cada fila
             successful_inserts = 0
             failed_inserts = 0
             
-            for index, row in df.iterrows():
-                try:
-                    if self.insert_show(row):
-                        successful_inserts += 1
-                    else:
-                        failed_inserts += 1
+            if self.bulk_shows:
+                successful_inserts, failed_inserts = self.insert_shows_bulk(df)
+            else:
+                for index, row in df.iterrows():
+                    try:
+                        if self.insert_show(row):
+                            successful_inserts += 1
+                        else:
+                            failed_inserts += 1
                     
-                    # Commit cada 50 registros
-                    if (index + 1) % 50 == 0:
-                        self.connection.commit()
-                        logger.info(f"Procesados {index + 1} registros...")
+                        # Commit cada 50 registros
+                        if (index + 1) % 50 == 0:
+                            self.connection.commit()
+                            logger.info(f"Procesados {index + 1} registros...")
                         
-                except Exception as e:
-                    logger.error(f"Error procesando fila {index}: {e}")
-                    failed_inserts += 1
-                    continue
+                    except Exception as e:
+                        logger.error(f"Error procesando fila {index}: {e}")
+                        failed_inserts += 1
+                        continue
             
             # Commit final
             self.connection.commit()